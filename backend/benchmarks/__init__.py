@@ -0,0 +1,4 @@
+"""
+Performance benchmarks for the hotel revenue backend
+Run modules from the backend directory, e.g. `python -m benchmarks.forecast_output`
+"""
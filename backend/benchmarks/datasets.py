@@ -0,0 +1,52 @@
+"""
+Dataset helpers shared by the benchmarks
+"""
+
+import pandas as pd
+
+from utils.data_loader import load_data, add_calendar_features
+from utils.synthetic_data import generate_hotel_data
+
+# Dataset sources selectable from the benchmark command lines
+SOURCES = ('bundled', 'synthetic')
+
+# Hotels and calendar span of the bundled CSV, matched by synthetic data at 1x
+BASE_HOTELS = 3
+BASE_YEARS = 10
+
+
+def scale_dataset(df: pd.DataFrame, factor: int) -> pd.DataFrame:
+    """
+    Replicate a dataset `factor` times as distinct hotels
+
+    Every copy keeps the original dates, channels and segments, so the
+    per-row work scales linearly while the calendar span stays the same.
+    """
+    if factor <= 1:
+        return df
+    copies = []
+    for copy_index in range(factor):
+        copy = df.copy()
+        copy['Hotel_ID'] = copy['Hotel_ID'].astype(str) + f"_{copy_index}"
+        copies.append(copy)
+    scaled = pd.concat(copies, ignore_index=True)
+    scaled['Hotel_ID'] = scaled['Hotel_ID'].astype('category')
+    return scaled
+
+
+def load_scaled(factor: int) -> pd.DataFrame:
+    """Load the bundled dataset scaled by `factor`"""
+    return scale_dataset(load_data(), factor)
+
+
+def generate_scaled(factor: int, seed: int = 42) -> pd.DataFrame:
+    """Synthetic dataset with `factor` times the bundled data's hotels"""
+    data = generate_hotel_data(hotels=BASE_HOTELS * max(factor, 1), years=BASE_YEARS, seed=seed)
+    return add_calendar_features(data)
+
+
+def load_dataset(factor: int, source: str = 'bundled') -> pd.DataFrame:
+    """Dataset at `factor` scale from the bundled CSV or the synthetic generator"""
+    if source not in SOURCES:
+        raise ValueError(f"Unknown dataset source: {source}. Use one of {', '.join(SOURCES)}")
+    return generate_scaled(factor) if source == 'synthetic' else load_scaled(factor)
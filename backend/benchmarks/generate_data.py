@@ -0,0 +1,39 @@
+"""
+Write a synthetic hotel revenue dataset for benchmarking
+
+Streams the data one block of hotels at a time, so datasets far larger
+than memory can be produced. CSV output matches the bundled file's format
+and can be loaded by pointing utils.data_loader.DATA_PATH at it.
+
+Usage (from the backend directory):
+    python -m benchmarks.generate_data data/synthetic_100x.csv --hotels 300
+    python -m benchmarks.generate_data /tmp/synthetic --hotels 3000 --format parquet
+"""
+
+import argparse
+import time
+
+from utils.synthetic_data import write_hotel_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path', help='Output CSV file, or directory for parquet parts')
+    parser.add_argument('--hotels', type=int, default=300)
+    parser.add_argument('--years', type=float, default=10)
+    parser.add_argument('--start-date', default='2016-01-01')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--format', dest='file_format', choices=['csv', 'parquet'], default='csv')
+    parser.add_argument('--block-hotels', type=int, default=256, help='Hotels generated per chunk')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = write_hotel_data(
+        args.path, hotels=args.hotels, years=args.years, file_format=args.file_format,
+        start_date=args.start_date, seed=args.seed, block_hotels=args.block_hotels
+    )
+    print(f"Wrote {rows:,} rows to {args.path} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Import-time benchmark for the API and its services
+
+Each module is imported in a fresh interpreter so nothing is shared between
+samples. The heavy forecasting libraries are measured separately for
+reference: they are no longer paid at import time, only on first use or
+during the background warmup.
+
+Usage (from the backend directory):
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --repeat 10
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+MODULES = [
+    'main',
+    'services.revenue_service',
+    'services.dashboard_service',
+    'services.insight_service',
+    'services.forecast_service',
+]
+
+# Imported lazily by services.forecast_service, measured for comparison
+LAZY_LIBRARIES = ['prophet', 'sklearn.linear_model']
+
+_TIMER = (
+    "import time; start = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def measure(module: str, repeat: int) -> List[float]:
+    """Import `module` in `repeat` fresh interpreters, returning seconds per run"""
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', _TIMER.format(module=module)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(float(output.strip().splitlines()[-1]))
+    return samples
+
+
+def run(repeat: int) -> Dict[str, Dict[str, float]]:
+    """Measure every module and lazy library"""
+    results = {}
+    for module in MODULES + LAZY_LIBRARIES:
+        samples = measure(module, repeat)
+        results[module] = {
+            'median_ms': statistics.median(samples) * 1000,
+            'min_ms': min(samples) * 1000,
+            'max_ms': max(samples) * 1000
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'module':<30} {'median ms':>10} {'min ms':>9} {'max ms':>9}")
+    for module, stats in run(args.repeat).items():
+        label = f"{module} (lazy)" if module in LAZY_LIBRARIES else module
+        print(f"{label:<30} {stats['median_ms']:>10.1f} {stats['min_ms']:>9.1f} {stats['max_ms']:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
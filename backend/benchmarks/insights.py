@@ -0,0 +1,62 @@
+"""
+Benchmark for business insight generation at increasing data sizes
+
+Measures InsightService.generate_all_insights (the work behind
+/api/insights) on the bundled dataset replicated 1x, 10x and 100x. "cold"
+includes building the shared aggregates; "warm" reuses them, as repeated
+requests against the same dataset version do.
+
+Usage (from the backend directory):
+    python -m benchmarks.insights
+    python -m benchmarks.insights --scales 1 100 --repeat 3
+    python -m benchmarks.insights --source synthetic --scales 1 10 100 1000
+"""
+
+import argparse
+import logging
+import statistics
+import time
+from typing import Any, Dict, List
+
+from benchmarks.datasets import SOURCES, load_dataset
+from services.insight_service import InsightService
+
+
+def run(scales: List[int], repeat: int, source: str = 'bundled') -> List[Dict[str, Any]]:
+    """Time cold and warm insight generation for each scale"""
+    rows = []
+    for scale in scales:
+        data = load_dataset(scale, source)
+        cold, warm = [], []
+        for _ in range(repeat):
+            service = InsightService(data)
+            start = time.perf_counter()
+            service.generate_all_insights()
+            cold.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            service.generate_all_insights()
+            warm.append(time.perf_counter() - start)
+        rows.append({
+            'scale': scale,
+            'rows': len(data),
+            'cold_ms': statistics.median(cold) * 1000,
+            'warm_ms': statistics.median(warm) * 1000
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--source', choices=SOURCES, default='bundled')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(f"{'scale':>6} {'rows':>10} {'cold ms':>9} {'warm ms':>9}")
+    for row in run(args.scales, args.repeat, args.source):
+        print(f"{row['scale']:>6} {row['rows']:>10} {row['cold_ms']:>9.1f} {row['warm_ms']:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
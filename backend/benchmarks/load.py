@@ -0,0 +1,368 @@
+"""
+In-process HTTP load harness for the FastAPI app
+
+Replays realistic dashboard traffic against `main.app` with a number of
+concurrent virtual users. Each user repeatedly performs a "page load": the
+set of requests a frontend page issues together (fired concurrently, like a
+browser), with filters and granularity drawn from representative mixes.
+
+Two transports are supported:
+    asgi     - httpx.ASGITransport, the app runs in the harness's event loop
+    uvicorn  - a real uvicorn server in a background thread on a local port
+
+The report gives throughput, page-load latency and per-route p50/p95/p99.
+An event-loop lag monitor runs in the app's loop: a ticker that sleeps for a
+few milliseconds and records how late it wakes up. Any stall longer than
+--block-threshold-ms means a handler ran blocking code on the loop; stalls
+are attributed to the routes in flight at the time (exact with --users 1).
+
+Usage (from the backend directory):
+    python -m benchmarks.load
+    python -m benchmarks.load --mix mixed --users 8 --duration 20
+    python -m benchmarks.load --transport uvicorn --users 16 --output load.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import socket
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+from benchmarks.suite import FILTER_MIXES
+
+# (path, query params) pairs issued together by one page load
+Request = Tuple[str, Dict[str, Any]]
+PageLoad = Callable[[random.Random], List[Request]]
+
+DEFAULT_BLOCK_THRESHOLD_MS = 50.0
+LAG_TICK_SECONDS = 0.005
+
+
+def _filters(rng: random.Random) -> Dict[str, Any]:
+    return dict(FILTER_MIXES[rng.choice(list(FILTER_MIXES))] or {})
+
+
+def dashboard_page(rng: random.Random) -> List[Request]:
+    """The dashboard page: KPI row plus every chart, sharing one filter set"""
+    filters = _filters(rng)
+    timed = {**filters, 'granularity': rng.choice(['day', 'week', 'month'])}
+    return [
+        ('/api/dashboard/summary', filters),
+        ('/api/dashboard/revenue-over-time', timed),
+        ('/api/dashboard/bookings-by-channel', filters),
+        ('/api/dashboard/bookings-by-segment', filters),
+        ('/api/dashboard/occupancy-over-time', timed),
+        ('/api/dashboard/adr-over-time', timed),
+        ('/api/dashboard/cancellations-over-time', timed),
+        ('/api/dashboard/revenue-by-hotel', filters),
+    ]
+
+
+def analytics_page(rng: random.Random) -> List[Request]:
+    """The analytics page backed by the original revenue endpoints"""
+    filters = _filters(rng)
+    return [
+        (path, filters) for path in (
+            '/api/kpi', '/api/revenue-trend', '/api/occupancy-trend', '/api/revenue-by-hotel',
+            '/api/revenue-by-channel', '/api/market-segment', '/api/cancellations-by-channel',
+        )
+    ]
+
+
+def insights_page(rng: random.Random) -> List[Request]:
+    filters = _filters(rng)
+    return [('/api/insights', filters), ('/api/anomalies', filters)]
+
+
+def forecast_page(rng: random.Random) -> List[Request]:
+    days_ahead = rng.choice([7, 30, 90])
+    return [
+        ('/api/revenue-forecast', {'days_ahead': days_ahead}),
+        ('/api/occupancy-forecast', {'days_ahead': days_ahead}),
+    ]
+
+
+def filter_options_page(rng: random.Random) -> List[Request]:
+    return [('/api/filters/options', {})]
+
+
+# Mix name -> {page load: relative weight}
+TRAFFIC_MIXES: Dict[str, Dict[PageLoad, float]] = {
+    'dashboard': {dashboard_page: 0.9, filter_options_page: 0.1},
+    'analytics': {analytics_page: 1.0},
+    'mixed': {
+        dashboard_page: 0.55,
+        analytics_page: 0.2,
+        insights_page: 0.1,
+        forecast_page: 0.05,
+        filter_options_page: 0.1,
+    },
+}
+
+
+class LoopLagMonitor:
+    """Samples how late a periodic timer fires in the event loop it runs on"""
+
+    def __init__(self, tick: float = LAG_TICK_SECONDS):
+        self.tick = tick
+        self.samples: List[Tuple[float, float]] = []  # (wake time, lag seconds)
+        self._stopped = False
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while not self._stopped:
+            expected = loop.time() + self.tick
+            await asyncio.sleep(self.tick)
+            now = loop.time()
+            self.samples.append((time.perf_counter(), max(now - expected, 0.0)))
+
+    def stop(self):
+        self._stopped = True
+
+
+class UvicornThread:
+    """Runs the app under uvicorn in a background thread on a free local port"""
+
+    def __init__(self, app):
+        import uvicorn
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            self.port = sock.getsockname()[1]
+        self.server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=self.port, log_level='warning'))
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_until_complete, args=(self.server.serve(),),
+                                       name='uvicorn-load', daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        deadline = time.monotonic() + 30
+        while not self.server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError('uvicorn did not start within 30s')
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+
+def _percentiles(values_ms: List[float]) -> Dict[str, float]:
+    values = np.asarray(values_ms)
+    if values.size == 0:
+        return {'p50_ms': None, 'p95_ms': None, 'p99_ms': None, 'max_ms': None}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        'p50_ms': round(float(p50), 2),
+        'p95_ms': round(float(p95), 2),
+        'p99_ms': round(float(p99), 2),
+        'max_ms': round(float(values.max()), 2),
+    }
+
+
+async def _virtual_user(client: httpx.AsyncClient, pages: List[PageLoad], weights: List[float],
+                        rng: random.Random, deadline: float,
+                        requests: List[Dict[str, Any]], page_loads: List[float]):
+    async def timed_get(path: str, params: Dict[str, Any]):
+        start = time.perf_counter()
+        try:
+            response = await client.get(path, params=params)
+            status = response.status_code
+        except httpx.HTTPError:
+            status = None
+        requests.append({'route': path, 'status': status, 'start': start, 'end': time.perf_counter()})
+
+    while time.perf_counter() < deadline:
+        page = rng.choices(pages, weights)[0]
+        start = time.perf_counter()
+        await asyncio.gather(*(timed_get(path, params) for path, params in page(rng)))
+        page_loads.append(time.perf_counter() - start)
+
+
+async def _prime(client: httpx.AsyncClient, mix: Dict[PageLoad, float]):
+    """Issue every distinct request of the mix once so caches and data are loaded"""
+    seen = set()
+    for page in mix:
+        for seed in range(len(FILTER_MIXES) * 3):
+            for path, params in page(random.Random(seed)):
+                key = (path, tuple(sorted(params.items())))
+                if key not in seen:
+                    seen.add(key)
+                    await client.get(path, params=params)
+
+
+def _report(requests: List[Dict[str, Any]], page_loads: List[float], lag: List[Tuple[float, float]],
+            elapsed: float, block_threshold_ms: float) -> Dict[str, Any]:
+    threshold = block_threshold_ms / 1000
+    stalls = [(at, value) for at, value in lag if value > threshold]
+
+    by_route: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for request in requests:
+        by_route[request['route']].append(request)
+
+    routes = {}
+    for route, entries in sorted(by_route.items()):
+        # A stall is charged to a route when one of its requests overlapped the stalled interval
+        starts = np.array([entry['start'] for entry in entries])
+        ends = np.array([entry['end'] for entry in entries])
+        route_stalls = [
+            value for at, value in stalls
+            if np.any((starts < at) & (ends > at - value))
+        ]
+        routes[route] = {
+            'requests': len(entries),
+            'errors': sum(1 for entry in entries if entry['status'] is None or entry['status'] >= 400),
+            'throughput_rps': round(len(entries) / elapsed, 2),
+            **_percentiles([(entry['end'] - entry['start']) * 1000 for entry in entries]),
+            'loop_stalls': len(route_stalls),
+            'max_loop_stall_ms': round(max(route_stalls) * 1000, 2) if route_stalls else 0.0,
+            'blocks_event_loop': bool(route_stalls),
+        }
+
+    lag_ms = [value * 1000 for _, value in lag]
+    return {
+        'duration_s': round(elapsed, 2),
+        'requests': len(requests),
+        'errors': sum(route['errors'] for route in routes.values()),
+        'throughput_rps': round(len(requests) / elapsed, 2),
+        'page_loads': len(page_loads),
+        'page_loads_per_s': round(len(page_loads) / elapsed, 2),
+        'page_load_latency': _percentiles([value * 1000 for value in page_loads]),
+        'event_loop': {
+            'block_threshold_ms': block_threshold_ms,
+            'stalls': len(stalls),
+            'stalled_s': round(sum(value for _, value in stalls), 3),
+            'lag': _percentiles(lag_ms),
+        },
+        'routes': routes,
+    }
+
+
+async def _run_with_client(client: httpx.AsyncClient, monitor_loop: Optional[asyncio.AbstractEventLoop],
+                           mix_name: str, users: int, duration: float, seed: int,
+                           prime: bool, block_threshold_ms: float) -> Dict[str, Any]:
+    mix = TRAFFIC_MIXES[mix_name]
+    if prime:
+        await _prime(client, mix)
+
+    monitor = LoopLagMonitor()
+    if monitor_loop is None:
+        monitor_task = asyncio.create_task(monitor.run())
+    else:
+        monitor_task = asyncio.run_coroutine_threadsafe(monitor.run(), monitor_loop)
+
+    requests: List[Dict[str, Any]] = []
+    page_loads: List[float] = []
+    pages, weights = list(mix), list(mix.values())
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(
+        _virtual_user(client, pages, weights, random.Random(seed + user), deadline, requests, page_loads)
+        for user in range(users)
+    ))
+    elapsed = time.perf_counter() - start
+
+    monitor.stop()
+    if monitor_loop is None:
+        await monitor_task
+    else:
+        await asyncio.wrap_future(monitor_task)
+    return _report(requests, page_loads, monitor.samples, elapsed, block_threshold_ms)
+
+
+def run(mix: str = 'dashboard', users: int = 4, duration: float = 10.0, transport: str = 'asgi',
+        seed: int = 42, prime: bool = True,
+        block_threshold_ms: float = DEFAULT_BLOCK_THRESHOLD_MS) -> Dict[str, Any]:
+    """
+    Drive the app with a traffic mix and return the load report
+
+    Args:
+        mix: Key of TRAFFIC_MIXES
+        users: Concurrent virtual users
+        duration: Measured seconds (after priming)
+        transport: 'asgi' (in-process) or 'uvicorn' (real server on localhost)
+        seed: Seed for the per-user request streams
+        prime: Issue every distinct request once before measuring
+        block_threshold_ms: Loop lag above which a stall is reported
+    """
+    if mix not in TRAFFIC_MIXES:
+        raise ValueError(f"Unknown traffic mix: {mix}. Available: {', '.join(TRAFFIC_MIXES)}")
+    from main import app
+
+    options = dict(mix_name=mix, users=users, duration=duration, seed=seed,
+                   prime=prime, block_threshold_ms=block_threshold_ms)
+    timeout = httpx.Timeout(120.0)
+
+    if transport == 'asgi':
+        async def main():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app),
+                                         base_url='http://load-harness', timeout=timeout) as client:
+                return await _run_with_client(client, None, **options)
+        report = asyncio.run(main())
+    elif transport == 'uvicorn':
+        with UvicornThread(app) as server:
+            async def main():
+                limits = httpx.Limits(max_connections=users * 8)
+                async with httpx.AsyncClient(base_url=server.base_url, timeout=timeout, limits=limits) as client:
+                    return await _run_with_client(client, server.loop, **options)
+            report = asyncio.run(main())
+    else:
+        raise ValueError(f"Unknown transport: {transport}. Use 'asgi' or 'uvicorn'")
+
+    return {'mix': mix, 'users': users, 'transport': transport, 'seed': seed, **report}
+
+
+def _print_report(report: Dict[str, Any]):
+    loop = report['event_loop']
+    page = report['page_load_latency']
+    print(f"{report['transport']} | mix={report['mix']} users={report['users']} duration={report['duration_s']}s")
+    print(f"{report['requests']} requests ({report['errors']} errors), {report['throughput_rps']} req/s, "
+          f"{report['page_loads_per_s']} page loads/s "
+          f"(p50 {page['p50_ms']} ms, p95 {page['p95_ms']} ms, p99 {page['p99_ms']} ms)")
+    print(f"event loop: {loop['stalls']} stalls > {loop['block_threshold_ms']:.0f} ms, "
+          f"{loop['stalled_s']}s stalled, lag p99 {loop['lag']['p99_ms']} ms, max {loop['lag']['max_ms']} ms")
+    print()
+    print(f"{'route':<42} {'reqs':>6} {'err':>4} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8} "
+          f"{'stalls':>7} {'max stall':>10}")
+    for route, stats in report['routes'].items():
+        flag = '  BLOCKS LOOP' if stats['blocks_event_loop'] else ''
+        print(f"{route:<42} {stats['requests']:>6} {stats['errors']:>4} {stats['throughput_rps']:>7.1f} "
+              f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f} "
+              f"{stats['loop_stalls']:>7} {stats['max_loop_stall_ms']:>10.1f}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mix', choices=list(TRAFFIC_MIXES), default='dashboard')
+    parser.add_argument('--users', type=int, default=4, help='Concurrent virtual users')
+    parser.add_argument('--duration', type=float, default=10.0, help='Measured seconds')
+    parser.add_argument('--transport', choices=['asgi', 'uvicorn'], default='asgi')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-prime', action='store_true', help='Measure cold caches too')
+    parser.add_argument('--block-threshold-ms', type=float, default=DEFAULT_BLOCK_THRESHOLD_MS)
+    parser.add_argument('--output', help='Also write the report as JSON')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    report = run(args.mix, args.users, args.duration, args.transport, args.seed,
+                 prime=not args.no_prime, block_threshold_ms=args.block_threshold_ms)
+    _print_report(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,367 @@
+"""
+Performance regression gate against a committed benchmark baseline
+
+Runs the benchmark suite (benchmarks.suite) with the baseline's settings,
+or reads an existing results file, and compares every (case, filter mix,
+scale) measurement with the baseline. Latencies are compared by median:
+the ratio current/baseline gets a bootstrap confidence interval from the
+raw samples, and a case counts as regressed only when
+
+    - its median is more than --threshold slower,
+    - the whole confidence interval lies above 1 (the slowdown is not noise),
+    - and the absolute slowdown exceeds --min-delta-ms.
+
+Machines are noisy between runs, so baselines pool the samples of several
+suite runs (--runs), and cases flagged as regressed are measured again
+(--retries) and fail only if the regression reproduces in every retry.
+Cases of 10-30 ms move by up to ten milliseconds between runs of the same
+build on a shared machine, so an absolute slowdown below --min-delta-ms
+(10 ms) never fails the gate however large the ratio. Both reports record
+the time of a fixed reference workload (suite.calibrate), which is shown in
+the report; --normalize divides current latencies by the ratio of the two
+when comparing across machines of different speed. It is only a coarse
+correction (the reference does not track every workload), so baselines are
+best refreshed with --update-baseline on the machine that runs the gate.
+
+On CI, record the baseline on the CI runners rather than relying on the
+committed one (recorded on a developer machine): run --update-baseline on
+the target branch, keep the file as a build artifact, and point the gate at
+it with --baseline or BENCHMARK_BASELINE. The baseline is written with one
+result per line so refreshing the committed file gives a readable diff.
+
+Exits with status 1 when any tracked case regressed or is missing from
+the current run (renamed, removed or crashed), after printing a report.
+Cases that are meant to be gone are listed with --allow-missing until the
+baseline is refreshed.
+
+Usage (from the backend directory):
+    python -m benchmarks.regression
+    python -m benchmarks.regression --current bench.json --threshold 0.3
+    python -m benchmarks.regression --allow-missing get_dashboard_data
+    python -m benchmarks.regression --update-baseline --scales 1 --repeat 15
+    BENCHMARK_BASELINE=ci-baseline.json python -m benchmarks.regression --update-baseline
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from benchmarks import suite
+
+BASELINE_PATH = os.getenv('BENCHMARK_BASELINE') or os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+DEFAULT_THRESHOLD = 0.25
+# Run-to-run noise of the 10-30 ms cases on a shared machine (up to ~1.5x)
+DEFAULT_MIN_DELTA_MS = 10.0
+DEFAULT_CONFIDENCE = 0.95
+BOOTSTRAP_RESAMPLES = 2000
+
+# Suite settings used when creating a baseline without explicit options
+BASELINE_SCALES = [1]
+BASELINE_REPEAT = 15
+BASELINE_RUNS = 3
+
+# Times a regressed case is re-measured before the gate fails
+DEFAULT_RETRIES = 2
+
+
+def _key(result: Dict[str, Any]) -> Tuple[str, str, int]:
+    return result['case'], result['filters'], result['scale']
+
+
+def median_ratio_ci(baseline: List[float], current: List[float], confidence: float = DEFAULT_CONFIDENCE,
+                    resamples: int = BOOTSTRAP_RESAMPLES, seed: int = 0) -> Tuple[float, float, float]:
+    """
+    Ratio of medians (current / baseline) with a percentile bootstrap interval
+
+    Returns:
+        (ratio, lower bound, upper bound)
+    """
+    base = np.asarray(baseline, dtype=float)
+    cur = np.asarray(current, dtype=float)
+    ratio = float(np.median(cur) / np.median(base))
+
+    rng = np.random.default_rng(seed)
+    base_medians = np.median(rng.choice(base, size=(resamples, len(base))), axis=1)
+    cur_medians = np.median(rng.choice(cur, size=(resamples, len(cur))), axis=1)
+    ratios = cur_medians / base_medians
+    tail = (1 - confidence) / 2 * 100
+    lower, upper = np.percentile(ratios, [tail, 100 - tail])
+    return ratio, float(lower), float(upper)
+
+
+def speed_factor(baseline: Dict[str, Any], current: Dict[str, Any]) -> float:
+    """How much slower the current machine ran the reference workload (1.0 if unknown)"""
+    base_cal = baseline.get('meta', {}).get('calibration_ms')
+    cur_cal = current.get('meta', {}).get('calibration_ms')
+    return cur_cal / base_cal if base_cal and cur_cal else 1.0
+
+
+def verdict(comparisons: List[Dict[str, Any]]) -> Tuple[Dict[str, int], bool]:
+    """Count comparisons per status; the gate passes with none regressed or missing"""
+    counts: Dict[str, int] = {}
+    for entry in comparisons:
+        counts[entry['status']] = counts.get(entry['status'], 0) + 1
+    return counts, counts.get('regressed', 0) == 0 and counts.get('missing', 0) == 0
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD,
+            min_delta_ms: float = DEFAULT_MIN_DELTA_MS, confidence: float = DEFAULT_CONFIDENCE,
+            normalize: bool = False, allow_missing: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Compare two suite reports
+
+    Args:
+        baseline: Baseline suite report
+        current: Suite report to check
+        threshold: Relative median slowdown tolerated (0.25 = 25%)
+        min_delta_ms: Absolute median change ignored as noise
+        confidence: Confidence level of the bootstrap interval
+        normalize: Scale current latencies by the machine speed factor
+        allow_missing: Baseline case names that may be absent from the
+            current report without failing the gate
+
+    Returns:
+        Per-case comparisons with a status ('regressed', 'improved',
+        'unchanged', 'missing', 'skipped' for allowed missing cases, or
+        'new') and the overall verdict
+    """
+    allowed = set(allow_missing or [])
+    factor = speed_factor(baseline, current) if normalize else 1.0
+    base_results = {_key(result): result for result in baseline['results']}
+    cur_results = {_key(result): result for result in current['results']}
+
+    comparisons = []
+    for key, base in base_results.items():
+        case, filters, scale = key
+        entry = {'case': case, 'filters': filters, 'scale': scale, 'group': base['group'],
+                 'baseline_p50_ms': base['p50_ms']}
+        cur = cur_results.get(key)
+        if cur is None:
+            comparisons.append({**entry, 'status': 'skipped' if case in allowed else 'missing'})
+            continue
+
+        cur_samples = [value / factor for value in cur['samples_ms']]
+        ratio, lower, upper = median_ratio_ci(base['samples_ms'], cur_samples, confidence)
+        cur_p50 = float(np.median(cur_samples))
+        delta = cur_p50 - base['p50_ms']
+        if ratio > 1 + threshold and lower > 1 and delta > min_delta_ms:
+            status = 'regressed'
+        elif ratio < 1 / (1 + threshold) and upper < 1 and -delta > min_delta_ms:
+            status = 'improved'
+        else:
+            status = 'unchanged'
+        comparisons.append({
+            **entry,
+            'current_p50_ms': round(cur_p50, 3),
+            'delta_ms': round(delta, 3),
+            'ratio': round(ratio, 3),
+            'ci_low': round(lower, 3),
+            'ci_high': round(upper, 3),
+            'status': status,
+        })
+
+    for key, cur in cur_results.items():
+        if key not in base_results:
+            case, filters, scale = key
+            comparisons.append({'case': case, 'filters': filters, 'scale': scale, 'group': cur['group'],
+                                'current_p50_ms': cur['p50_ms'], 'status': 'new'})
+
+    counts, passed = verdict(comparisons)
+    return {
+        'threshold': threshold,
+        'min_delta_ms': min_delta_ms,
+        'confidence': confidence,
+        'speed_factor': round(factor, 3),
+        'baseline_meta': baseline.get('meta', {}),
+        'current_meta': current.get('meta', {}),
+        'counts': counts,
+        'passed': passed,
+        'comparisons': comparisons,
+    }
+
+
+def format_report(comparison: Dict[str, Any], show_all: bool = False) -> str:
+    """Readable table of regressions and improvements (every case with show_all)"""
+    base_meta, cur_meta = comparison['baseline_meta'], comparison['current_meta']
+    lines = [
+        f"Baseline: commit {base_meta.get('commit')} ({base_meta.get('created_at')}, {base_meta.get('platform')})",
+        f"Current:  commit {cur_meta.get('commit')} ({cur_meta.get('created_at')}, {cur_meta.get('platform')})",
+        f"Regression = median more than {comparison['threshold']:.0%} slower with the "
+        f"{comparison['confidence']:.0%} CI above 1x and at least {comparison['min_delta_ms']} ms",
+        f"Reference workload: baseline {base_meta.get('calibration_ms')} ms, "
+        f"current {cur_meta.get('calibration_ms')} ms"
+        + (f" (current latencies divided by {comparison['speed_factor']:.2f})"
+           if comparison['speed_factor'] != 1.0 else ""),
+        "",
+    ]
+
+    order = {'regressed': 0, 'missing': 1, 'improved': 2, 'skipped': 3, 'new': 4, 'unchanged': 5}
+    shown = [
+        entry for entry in comparison['comparisons']
+        if show_all or entry['status'] in ('regressed', 'missing', 'improved', 'skipped')
+    ]
+    shown.sort(key=lambda entry: (order[entry['status']], -entry.get('ratio', 0)))
+    if shown:
+        lines.append(f"{'status':<10} {'scale':>5}  {'case':<44} {'filters':<16} "
+                     f"{'baseline':>10} {'current':>10} {'ratio':>7}  {'CI':<15}")
+        for entry in shown:
+            base_ms = f"{entry['baseline_p50_ms']:.1f}ms" if 'baseline_p50_ms' in entry else '-'
+            cur_ms = f"{entry['current_p50_ms']:.1f}ms" if 'current_p50_ms' in entry else '-'
+            ratio = f"{entry['ratio']:.2f}x" if 'ratio' in entry else '-'
+            interval = f"[{entry['ci_low']:.2f}, {entry['ci_high']:.2f}]" if 'ci_low' in entry else ''
+            lines.append(f"{entry['status']:<10} {entry['scale']:>4}x  {entry['case']:<44} {entry['filters']:<16} "
+                         f"{base_ms:>10} {cur_ms:>10} {ratio:>7}  {interval:<15}")
+        lines.append("")
+
+    counts = ', '.join(f"{count} {status}" for status, count in sorted(comparison['counts'].items()))
+    lines.append(f"{'PASSED' if comparison['passed'] else 'FAILED'}: {counts}")
+    return "\n".join(lines)
+
+
+def merge_runs(reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Pool the samples of several suite reports into one report"""
+    merged: Dict[Tuple[str, str, int], Dict[str, Any]] = {}
+    samples: Dict[Tuple[str, str, int], List[float]] = {}
+    for report in reports:
+        for result in report['results']:
+            key = _key(result)
+            if key not in merged:
+                merged[key] = dict(result)
+                samples[key] = []
+            samples[key] += result['samples_ms']
+            merged[key]['peak_memory_mb'] = max(merged[key]['peak_memory_mb'], result['peak_memory_mb'])
+
+    results = [
+        {**result, **suite._summarize([value / 1000 for value in samples[key]])}
+        for key, result in merged.items()
+    ]
+    calibrations = [report['meta']['calibration_ms'] for report in reports if report['meta'].get('calibration_ms')]
+    meta = {
+        **reports[0]['meta'],
+        'runs': len(reports),
+        'calibration_ms': round(float(np.mean(calibrations)), 3) if calibrations else None,
+    }
+    return {'meta': meta, 'results': results}
+
+
+def run_like(baseline: Dict[str, Any], cases: Optional[List[str]] = None,
+             progress=lambda line: None) -> Dict[str, Any]:
+    """Run the suite with the baseline's scales, repeat count and seed, for all or some of its cases"""
+    meta = baseline['meta']
+    cases = cases or sorted({result['case'] for result in baseline['results']})
+    include_forecast = any(
+        result['group'] == 'forecast' and result['case'] in cases for result in baseline['results']
+    )
+    return suite.run(meta['scales'], meta['repeat'], seed=meta['seed'], only=cases,
+                     include_forecast=include_forecast, progress=progress)
+
+
+def check(baseline: Dict[str, Any], current: Dict[str, Any], retries: int = DEFAULT_RETRIES,
+          progress=lambda line: None, **options) -> Dict[str, Any]:
+    """
+    Compare a report with the baseline, re-measuring regressed cases
+
+    A case stays regressed only if it also regresses in every retry; the
+    comparison from the last measurement is reported.
+    """
+    comparison = compare(baseline, current, **options)
+    for attempt in range(retries):
+        regressed = sorted({entry['case'] for entry in comparison['comparisons'] if entry['status'] == 'regressed'})
+        if not regressed:
+            break
+        progress(f"Re-measuring {len(regressed)} regressed cases (retry {attempt + 1})")
+        retried = compare(baseline, run_like(baseline, regressed, progress), **options)
+        outcome = {
+            (entry['case'], entry['filters'], entry['scale']): entry
+            for entry in retried['comparisons'] if entry['status'] not in ('missing', 'skipped')
+        }
+        comparisons = []
+        for entry in comparison['comparisons']:
+            key = (entry['case'], entry['filters'], entry['scale'])
+            if entry['status'] == 'regressed' and key in outcome:
+                entry = {**outcome[key], 'retries': attempt + 1}
+                if entry['status'] != 'regressed':
+                    entry['status'] = 'unchanged'
+            comparisons.append(entry)
+        counts, passed = verdict(comparisons)
+        comparison = {**comparison, 'comparisons': comparisons, 'counts': counts, 'passed': passed}
+    return comparison
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_baseline(report: Dict[str, Any], path: str):
+    """Write a suite report as a baseline, one result per line"""
+    results = ',\n  '.join(json.dumps(result) for result in report['results'])
+    with open(path, 'w') as f:
+        f.write(f'{{\n "meta": {json.dumps(report["meta"])},\n "results": [\n  {results}\n ]\n}}\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='Baseline suite report')
+    parser.add_argument('--current', help='Compare this suite report instead of running the suite')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Relative median slowdown tolerated (default 0.25)')
+    parser.add_argument('--min-delta-ms', type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help='Absolute median slowdown ignored as noise (default 10)')
+    parser.add_argument('--confidence', type=float, default=DEFAULT_CONFIDENCE)
+    parser.add_argument('--normalize', action='store_true',
+                        help='Scale current latencies by the reference workload speed ratio')
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+                        help='Re-measure regressed cases this many times before failing')
+    parser.add_argument('--allow-missing', nargs='+', default=[], metavar='CASE',
+                        help='Baseline cases that may be absent without failing the gate')
+    parser.add_argument('--report', help='Also write the comparison as JSON')
+    parser.add_argument('--all', action='store_true', help='List unchanged cases too')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Run the suite and write its report as the new baseline')
+    parser.add_argument('--scales', type=int, nargs='+', default=BASELINE_SCALES,
+                        help='Scales for --update-baseline')
+    parser.add_argument('--repeat', type=int, default=BASELINE_REPEAT, help='Repeat count for --update-baseline')
+    parser.add_argument('--runs', type=int, default=BASELINE_RUNS,
+                        help='Suite runs pooled into a new baseline')
+    parser.add_argument('--skip-forecast', action='store_true', help='Leave forecast cases out of a new baseline')
+    parser.add_argument('--verbose', action='store_true', help='Print suite progress')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    progress = print if args.verbose else (lambda line: None)
+
+    if args.update_baseline:
+        report = merge_runs([
+            suite.run(args.scales, args.repeat, include_forecast=not args.skip_forecast, progress=progress)
+            for _ in range(args.runs)
+        ])
+        write_baseline(report, args.baseline)
+        print(f"Wrote baseline with {len(report['results'])} results to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        parser.error(f"Baseline {args.baseline} not found; create it with --update-baseline")
+    baseline = _load(args.baseline)
+    current = _load(args.current) if args.current else run_like(baseline, progress=progress)
+
+    # Retries need a live suite run, so they are skipped when comparing a results file
+    comparison = check(
+        baseline, current, retries=0 if args.current else args.retries, progress=progress,
+        threshold=args.threshold, min_delta_ms=args.min_delta_ms, confidence=args.confidence,
+        normalize=args.normalize, allow_missing=args.allow_missing,
+    )
+    print(format_report(comparison, show_all=args.all))
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(comparison, f, indent=2)
+    sys.exit(0 if comparison['passed'] else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,360 @@
+"""
+Benchmark suite for every service function at increasing data scales
+
+Each scale is a synthetic dataset (utils.synthetic_data) with `scale` times
+the bundled data's hotels over the same ten years. It is written once to a
+CSV in the bundled format and the services are pointed at it through
+utils.data_loader.DATA_PATH, so they run exactly as they do behind the API,
+including their own caches. Service cases are called directly (no HTTP);
+route cases go through the app in-process, adding validation, JSON
+encoding and middleware. Both run across a representative mix of dashboard
+filters.
+
+For each case the suite records a latency distribution over --repeat calls
+and, in a separate traced call, the peak Python/NumPy memory allocated
+(tracemalloc; the CmdStan process behind Prophet is not included). Results
+are written as JSON so runs can be compared between commits.
+
+Usage (from the backend directory):
+    python -m benchmarks.suite
+    python -m benchmarks.suite --scales 1 10 100 --repeat 10 --output bench.json
+    python -m benchmarks.suite --only dashboard apply_filters --skip-forecast
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import utils.data_loader as data_loader
+from benchmarks.datasets import BASE_HOTELS, BASE_YEARS
+from utils.dataset_epoch import dataset_epochs
+from utils.result_cache import result_cache
+from utils.synthetic_data import write_hotel_data
+from services import (
+    anomaly_service, dashboard_service, forecast_service, insight_service, revenue_service
+)
+
+DEFAULT_SCALES = [1, 10, 100]
+DEFAULT_REPEAT = 5
+
+# Forecast fits take seconds, so their cases are capped at this many samples
+FORECAST_MAX_REPEAT = 3
+
+# Routes benchmarked end to end, with optional fixed query parameters
+ROUTES = [
+    ('/api/kpi', {}),
+    ('/api/revenue-trend', {}),
+    ('/api/dashboard/summary', {}),
+    ('/api/dashboard/revenue-over-time', {'granularity': 'month'}),
+    ('/api/dashboard/bookings-by-channel', {}),
+    ('/api/insights', {}),
+    ('/api/anomalies', {}),
+]
+
+# Representative dashboard filter mixes; hotel IDs exist at every scale
+FILTER_MIXES: Dict[str, Optional[Dict[str, Any]]] = {
+    'none': None,
+    'hotel': {'hotel_id': 'H101'},
+    'year': {'start_date': '2024-01-01', 'end_date': '2024-12-31'},
+    'channel_segment': {'booking_channel': 'OTA,Website', 'market_segment': 'Corporate'},
+    'combined': {
+        'hotel_id': 'H101,H102,H103',
+        'start_date': '2023-01-01',
+        'booking_channel': 'OTA',
+    },
+}
+
+
+def _case(group: str, name: str, func: Callable, *args,
+          filtered: bool = True, reset: Optional[Callable] = None, **kwargs) -> Dict[str, Any]:
+    """Benchmark case definition; filtered cases receive each filter mix as first argument"""
+    return {
+        'group': group, 'name': name, 'func': func, 'args': args, 'kwargs': kwargs,
+        'filtered': filtered, 'reset': reset,
+    }
+
+
+_client = None
+
+def _route_call(path: str, params: Dict[str, Any]) -> Callable:
+    """Case function issuing a GET through the app in-process (no startup warmup)"""
+    def call(filters: Optional[Dict[str, Any]]):
+        global _client
+        if _client is None:
+            from fastapi.testclient import TestClient
+            import main
+            _client = TestClient(main.app)
+        response = _client.get(path, params={**params, **(filters or {})})
+        response.raise_for_status()
+        return response
+    return call
+
+
+def _reset_insights():
+    insight_service.insight_cache.clear()
+    result_cache.clear('insights')
+
+
+def _reset_local_insights():
+    insight_service.insight_cache.clear()
+
+
+def _reset_forecasts():
+    forecast_service.clear_forecast_cache()
+
+
+def build_cases(include_forecast: bool = True) -> List[Dict[str, Any]]:
+    """All benchmark cases, grouped by service"""
+    cases = [
+        _case('revenue', name, getattr(revenue_service, name))
+        for name in (
+            'get_kpis', 'get_revenue_trend', 'get_occupancy_trend', 'get_revenue_by_hotel',
+            'get_revenue_by_channel', 'get_market_segment_share', 'get_scatter_data',
+            'get_cancellations_by_channel',
+        )
+    ]
+    cases += [
+        _case('dashboard', name, getattr(dashboard_service, name))
+        for name in (
+            'get_summary', 'get_bookings_by_channel', 'get_bookings_by_segment',
+            'get_revenue_by_hotel_dashboard',
+        )
+    ]
+    cases += [
+        _case('dashboard', f"{name}[{granularity}]", getattr(dashboard_service, name), granularity)
+        for name in (
+            'get_revenue_over_time', 'get_occupancy_over_time', 'get_adr_over_time',
+            'get_cancellations_over_time',
+        )
+        for granularity in ('day', 'week', 'month')
+    ]
+    cases += [
+        _case('dashboard', 'get_filter_options', dashboard_service.get_filter_options, filtered=False),
+        _case('apply_filters', 'apply_filters',
+              lambda filters: data_loader.apply_filters(revenue_service.get_cached_data(), filters or {})),
+        _case('anomaly', 'get_anomalies', anomaly_service.get_anomalies),
+        _case('insight', 'get_insight_report[uncached]', insight_service.get_insight_report, reset=_reset_insights),
+        _case('insight', 'get_insight_report[shared]', insight_service.get_insight_report,
+              reset=_reset_local_insights),
+        _case('insight', 'get_insight_report[cached]', insight_service.get_insight_report),
+    ]
+    cases += [
+        _case('route', f"GET {path}" + ''.join(f"[{value}]" for value in params.values()),
+              _route_call(path, params))
+        for path, params in ROUTES
+    ]
+    if include_forecast:
+        cases += [
+            _case('forecast', 'generate_forecast[cold]', forecast_service.generate_forecast,
+                  'Revenue_INR', 30, filtered=False, reset=_reset_forecasts),
+            _case('forecast', 'generate_forecast[cached]', forecast_service.generate_forecast,
+                  'Revenue_INR', 30, filtered=False),
+            _case('forecast', 'generate_multi_forecast[cached]', forecast_service.generate_multi_forecast,
+                  30, filtered=False),
+        ]
+    return cases
+
+
+def dataset_path(scale: int, seed: int, directory: str) -> str:
+    """Write (once) and return the synthetic CSV for a scale"""
+    path = os.path.join(directory, f"hotel_revenue_{scale}x_seed{seed}.csv")
+    if not os.path.exists(path):
+        partial = f"{path}.partial"
+        write_hotel_data(partial, hotels=BASE_HOTELS * scale, years=BASE_YEARS, seed=seed)
+        os.replace(partial, path)
+    return path
+
+
+def use_dataset(path: str) -> pd.DataFrame:
+    """Point every service at a dataset file and drop their cached state"""
+    data_loader.DATA_PATH = path
+    result = dataset_epochs.refresh(wait=True)
+    if result['status'] == 'failed':
+        raise RuntimeError(f"Could not load {path}: {result['error']}")
+    forecast_service.clear_forecast_cache()
+    return revenue_service.get_cached_data()
+
+
+def _summarize(samples: List[float]) -> Dict[str, float]:
+    """Latency distribution in milliseconds"""
+    ms = np.asarray(samples) * 1000
+    return {
+        'samples_ms': [round(float(value), 3) for value in ms],
+        'min_ms': round(float(ms.min()), 3),
+        'p50_ms': round(float(np.percentile(ms, 50)), 3),
+        'p95_ms': round(float(np.percentile(ms, 95)), 3),
+        'max_ms': round(float(ms.max()), 3),
+        'mean_ms': round(float(ms.mean()), 3),
+        'stdev_ms': round(statistics.pstdev(ms.tolist()), 3),
+    }
+
+
+def _call(case: Dict[str, Any], filters: Optional[Dict[str, Any]]):
+    args = ((filters,) if case['filtered'] else ()) + case['args']
+    return case['func'](*args, **case['kwargs'])
+
+
+def measure(case: Dict[str, Any], filters: Optional[Dict[str, Any]], repeat: int) -> Dict[str, Any]:
+    """Latency over `repeat` calls, then one traced call for peak memory"""
+    if case['reset'] is None:
+        _call(case, filters)  # prime caches so every sample sees the same state
+
+    samples = []
+    for _ in range(repeat):
+        if case['reset']:
+            case['reset']()
+        start = time.perf_counter()
+        _call(case, filters)
+        samples.append(time.perf_counter() - start)
+
+    if case['reset']:
+        case['reset']()
+    tracemalloc.start()
+    try:
+        _call(case, filters)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {**_summarize(samples), 'peak_memory_mb': round(peak / 2**20, 3)}
+
+
+def calibrate(repeat: int = 15) -> float:
+    """
+    Median time (ms) of a fixed pandas/NumPy reference workload
+
+    Recorded with every run so comparisons between runs can factor out
+    differences in machine speed.
+    """
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        'key': rng.integers(0, 1000, size=200_000),
+        'value': rng.normal(size=200_000),
+    })
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        frame.groupby('key')['value'].sum()
+        np.sort(frame['value'].to_numpy())
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples) * 1000)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scales: List[int], repeat: int, seed: int = 42, data_dir: Optional[str] = None,
+        only: Optional[List[str]] = None, include_forecast: bool = True,
+        progress: Callable[[str], None] = lambda line: None) -> Dict[str, Any]:
+    """
+    Run the suite
+
+    Args:
+        scales: Dataset scales (multiples of the bundled data's hotel count)
+        repeat: Timed calls per case and filter mix
+        seed: Synthetic data seed
+        data_dir: Where generated datasets are kept between runs
+        only: Restrict to these case groups or names
+        include_forecast: Whether to run the (slow) forecast cases
+        progress: Called with one line per finished measurement
+
+    Returns:
+        JSON-serializable report with environment metadata and results
+    """
+    data_dir = data_dir or os.path.join(tempfile.gettempdir(), 'hotel_revenue_benchmarks')
+    os.makedirs(data_dir, exist_ok=True)
+    cases = [
+        case for case in build_cases(include_forecast)
+        if not only or case['group'] in only or case['name'] in only
+    ]
+    original_path = data_loader.DATA_PATH
+    calibration_start = calibrate()
+
+    results = []
+    try:
+        for scale in scales:
+            start = time.perf_counter()
+            data = use_dataset(dataset_path(scale, seed, data_dir))
+            progress(f"scale {scale}x: {len(data):,} rows ready in {time.perf_counter() - start:.1f}s")
+
+            for case in cases:
+                mixes = FILTER_MIXES if case['filtered'] else {'none': None}
+                case_repeat = min(repeat, FORECAST_MAX_REPEAT) if case['group'] == 'forecast' else repeat
+                for mix, filters in mixes.items():
+                    stats = measure(case, filters, case_repeat)
+                    results.append({
+                        'group': case['group'],
+                        'case': case['name'],
+                        'filters': mix,
+                        'scale': scale,
+                        'rows': len(data),
+                        **stats,
+                    })
+                    progress(
+                        f"{scale:>5}x {case['name']:<42} {mix:<16} "
+                        f"p50 {stats['p50_ms']:>9.1f} ms  p95 {stats['p95_ms']:>9.1f} ms  "
+                        f"peak {stats['peak_memory_mb']:>8.1f} MB"
+                    )
+    finally:
+        use_dataset(original_path)
+    calibration_end = calibrate()
+
+    return {
+        'meta': {
+            'created_at': datetime.now().strftime('%Y-%m-%dT%H:%M:%S'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'scales': scales,
+            'repeat': repeat,
+            'seed': seed,
+            'filter_mixes': FILTER_MIXES,
+            'calibration_ms': round((calibration_start + calibration_end) / 2, 3),
+        },
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--data-dir', help='Directory for generated datasets (reused between runs)')
+    parser.add_argument('--only', nargs='+', help='Case groups or names to run, e.g. dashboard get_kpis')
+    parser.add_argument('--skip-forecast', action='store_true', help='Skip the Prophet forecast cases')
+    parser.add_argument('--output', default='benchmark_results.json', help='JSON report path')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    report = run(
+        args.scales, args.repeat, seed=args.seed, data_dir=args.data_dir, only=args.only,
+        include_forecast=not args.skip_forecast, progress=print
+    )
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(report['results'])} results to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,25 +1,38 @@
-from fastapi import FastAPI, HTTPException, Depends, Query, Request
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
 import logging
+import threading
+import time
 from typing import Optional, Dict, Any
 from datetime import date, datetime
 
 from services import revenue_service
 from services import forecast_service
 from services import insight_service
+from services import insight_rules
 from services import dashboard_service
+from services import anomaly_service
+from services import memory_service
+from utils.timing import ServerTimingMiddleware, TimedRoute, stage
+from utils import profiling, telemetry
+from utils.logging_config import configure_logging
+from utils.memory import estimate_size
+from utils.result_cache import result_cache
+from utils.data_loader import normalize_filters
+from utils.dataset_epoch import dataset_epochs
 from models.schemas import (
     KPIResponse, RevenueTrendResponse, OccupancyTrendResponse,
     RevenueByHotelResponse, RevenueByChannelResponse, MarketSegmentResponse,
     ScatterDataResponse, CancellationByChannelResponse, HealthResponse,
     AnalyticsFilters, FilteredResponse, ValidationError,
-    ForecastResponse, CacheStatus, InsightsResponse
+    ForecastResponse, MultiForecastResponse, CacheStatus, InsightsResponse
 )
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+# Setup logging: queued output, sampled hot-path events (see utils/logging_config.py)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
@@ -28,9 +41,21 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Time the endpoint and response encoding of every route declared below
+app.router.route_class = TimedRoute
+
 # Add gzip compression for better performance
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
+# Per-request stage timings as Server-Timing headers (see utils/timing.py)
+app.add_middleware(ServerTimingMiddleware)
+
+# Request counts and latency histograms for /metrics
+app.add_middleware(telemetry.RequestMetricsMiddleware)
+
+# cProfile for requests selected by the X-Profile header or sampling (see utils/profiling.py)
+app.add_middleware(profiling.RequestProfilerMiddleware)
+
 # CORS configuration - more secure for production
 origins = [
     "http://localhost:3000",  # frontend development
@@ -73,11 +98,57 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         headers=_CORS_HEADERS,
     )
 
+# ── Background warmup ───────────────────────────────────────────────────────
+# Services load data and heavy libraries lazily. Warmup runs them once in a
+# background thread at startup so the first real request does not pay for it,
+# while `/` stays responsive and `/ready` reports progress.
+_readiness: Dict[str, Any] = {
+    "ready": False,
+    "started_at": None,
+    "completed_at": None,
+    "stages": {},
+    "error": None,
+}
+
+def _warmup():
+    """Load the dataset, insight data and forecasting libraries"""
+    _readiness["started_at"] = datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ')
+    stages = [
+        ("dataset", revenue_service.get_cached_data),
+        ("insights", insight_service.get_insight_service),
+        ("forecasting", forecast_service.warmup),
+    ]
+    for name, func in stages:
+        start = time.perf_counter()
+        try:
+            func()
+            _readiness["stages"][name] = {
+                "status": "ok",
+                "seconds": round(time.perf_counter() - start, 3)
+            }
+        except Exception as e:
+            logger.error(f"Warmup stage {name} failed: {str(e)}")
+            _readiness["stages"][name] = {
+                "status": "failed",
+                "seconds": round(time.perf_counter() - start, 3),
+                "error": str(e)
+            }
+            _readiness["error"] = f"{name}: {str(e)}"
+    _readiness["completed_at"] = datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ')
+    _readiness["ready"] = _readiness["error"] is None
+    logger.info(f"Warmup finished, ready={_readiness['ready']}")
+
+@app.on_event("startup")
+async def start_warmup():
+    """Start warmup without blocking server startup"""
+    threading.Thread(target=_warmup, name="warmup", daemon=True).start()
+
 # Add error handling wrapper
 async def handle_service_error(func, *args, **kwargs):
     """Wrapper to handle service errors consistently"""
     try:
-        return func(*args, **kwargs)
+        with stage("service"):
+            return func(*args, **kwargs)
     except ValueError as e:
         logger.error(f"Validation error in {func.__name__}: {str(e)}")
         raise HTTPException(
@@ -124,6 +195,69 @@ async def root():
         "status": "healthy"
     }
 
+@app.get("/ready", response_model=Dict[str, Any])
+async def ready():
+    """Readiness probe: 200 once data and libraries are loaded, 503 until then"""
+    return JSONResponse(
+        status_code=200 if _readiness["ready"] else 503,
+        content=_readiness,
+    )
+
+# Dataset memory is measured once per loaded DataFrame: (id, bytes)
+_dataset_memory: Dict[str, int] = {}
+
+def collect_service_metrics():
+    """Cache counters and dataset size, read from the services at scrape time"""
+    caches = {
+        "forecast": forecast_service.forecast_cache,
+        "insights": insight_service.insight_cache,
+    }
+    shared_cache = result_cache.status()
+    families = [
+        ("hotel_cache_hits_total", "counter", "Cache hits",
+         [({"cache": name}, cache.hits) for name, cache in caches.items()]),
+        ("hotel_cache_misses_total", "counter", "Cache misses",
+         [({"cache": name}, cache.misses) for name, cache in caches.items()]),
+        ("hotel_cache_evictions_total", "counter", "Cache evictions",
+         [({"cache": name}, cache.evictions) for name, cache in caches.items()]),
+        ("hotel_cache_entries", "gauge", "Entries currently cached",
+         [({"cache": name}, len(cache.cache)) for name, cache in caches.items()]),
+        ("hotel_forecast_cache_stale_hits_total", "counter", "Forecast cache hits served stale while refreshing",
+         [({}, forecast_service.forecast_cache.stale_hits)]),
+        ("hotel_forecast_cache_bytes", "gauge", "Estimated size of the cached forecast models",
+         [({}, forecast_service.forecast_cache.total_bytes)]),
+        ("hotel_result_cache_operations_total", "counter",
+         "Cross-worker result cache lookups and computations in this worker",
+         [({"outcome": outcome}, shared_cache[outcome])
+          for outcome in ("hits", "misses", "computed", "waited", "lock_timeouts", "errors")]),
+        ("hotel_dataset_version", "gauge", "Number of the current dataset epoch (increments on refresh)",
+         [({}, insight_service.dataset_version())]),
+        ("hotel_dataset_refreshes_total", "counter", "Dataset refreshes by outcome",
+         [({"outcome": outcome}, count) for outcome, count in dataset_epochs.refreshes.items()]),
+    ]
+
+    # Only report the dataset once something loaded it; never load it for a scrape
+    epoch = dataset_epochs.peek()
+    if epoch is not None:
+        df = epoch.data
+        if _dataset_memory.get("id") != id(df):
+            _dataset_memory.update(id=id(df), bytes=estimate_size(df))
+        families += [
+            ("hotel_dataset_rows", "gauge", "Rows in the loaded dataset", [({}, len(df))]),
+            ("hotel_dataset_memory_bytes", "gauge", "Memory used by the loaded dataset",
+             [({}, _dataset_memory["bytes"])]),
+            ("hotel_dataset_epoch_age_seconds", "gauge", "Seconds since the current dataset epoch was loaded",
+             [({}, round((datetime.now() - epoch.loaded_at).total_seconds(), 1))]),
+        ]
+    return families
+
+telemetry.registry.register_collector(collect_service_metrics)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Operational metrics in the Prometheus text format"""
+    return Response(content=telemetry.registry.render(), media_type=telemetry.CONTENT_TYPE)
+
 # KPI API
 @app.get("/api/kpi", response_model=Dict[str, Any], tags=["analytics"])
 async def kpi(
@@ -340,6 +474,22 @@ async def occupancy_forecast(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@app.get("/api/multi-forecast", response_model=MultiForecastResponse, tags=["forecasting"])
+async def multi_forecast(
+    days_ahead: Optional[int] = Query(30, description="Number of days to forecast (1-365)", ge=1, le=365),
+    targets: Optional[str] = Query(None, description="Targets to forecast (comma-separated: revenue, occupancy, adr, revpar, cancellations)")
+):
+    """Generate aligned forecasts for several targets in one request"""
+    try:
+        validated_days = forecast_service.validate_forecast_parameters(days_ahead)
+        validated_targets = forecast_service.validate_forecast_targets(targets)
+        result = await handle_service_error(
+            forecast_service.generate_multi_forecast, validated_days, validated_targets
+        )
+        return result
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 # Forecast management endpoints
 @app.post("/api/forecast/clear-cache", response_model=Dict[str, str], tags=["forecasting"])
 async def clear_forecast_cache():
@@ -370,8 +520,7 @@ async def get_forecast_cache_status():
 async def data_info():
     """Get information about the loaded dataset for debugging"""
     try:
-        from utils.data_loader import load_data
-        df = load_data()
+        df = revenue_service.get_cached_data()
         
         return {
             "total_rows": len(df),
@@ -392,40 +541,67 @@ async def data_info():
         }
 
 @app.get("/api/insights", response_model=InsightsResponse, tags=["analytics"])
-async def get_business_insights():
-    """Generate automatic business insights from hotel revenue data"""
+async def get_business_insights(
+    hotel_id: Optional[str] = Query(None, description="Filter by hotel ID (comma-separated)"),
+    start_date: Optional[date] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="End date (YYYY-MM-DD)"),
+    booking_channel: Optional[str] = Query(None, description="Filter by booking channel (comma-separated)"),
+    market_segment: Optional[str] = Query(None, description="Filter by market segment (comma-separated)")
+):
+    """Generate automatic business insights from hotel revenue data, optionally filtered"""
+    filters = create_filters_dict(hotel_id, start_date, end_date, booking_channel, market_segment)
+    # Only bad filters are the client's fault; any later ValueError is a server error
     try:
-        logger.info("Generating business insights")
-        
-        # Generate insights
-        insights = insight_service.get_insights()
+        normalize_filters(filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid filter parameters: {str(e)}")
+    
+    try:
+        logger.info("Generating business insights for filters: %s", filters, extra={"event": "insights_requested"})
         
-        # Get data period info
-        try:
-            data = insight_service.insight_service.data
-            data_period = None
-            if data is not None and not data.empty:
-                min_date = data['Date'].min().strftime('%Y-%m-%d')
-                max_date = data['Date'].max().strftime('%Y-%m-%d')
-                data_period = f"{min_date} to {max_date}"
-        except Exception as period_error:
-            logger.warning(f"Could not determine data period: {str(period_error)}")
-            data_period = None
+        # Generate insights (cached per dataset version and filter set)
+        report = insight_service.get_insight_report(filters)
+        insights = report['insights']
         
         response = InsightsResponse(
             insights=insights,
             generated_at=datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ'),
             total_insights=len(insights),
-            data_period=data_period
+            data_period=report['data_period'],
+            metadata=report['metadata']
         )
         
-        logger.info(f"Generated {len(insights)} business insights successfully")
+        logger.info("Generated %d business insights successfully", len(insights),
+                    extra={"event": "insights_served"})
         return response
         
     except Exception as e:
         logger.error(f"Error generating insights: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to generate insights: {str(e)}")
 
+@app.get("/api/anomalies", response_model=Dict[str, Any], tags=["analytics"])
+async def get_anomalies(
+    hotel_id: Optional[str] = Query(None, description="Filter by hotel ID (comma-separated)"),
+    start_date: Optional[date] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="End date (YYYY-MM-DD)"),
+    booking_channel: Optional[str] = Query(None, description="Filter by booking channel (comma-separated)"),
+    market_segment: Optional[str] = Query(None, description="Filter by market segment (comma-separated)"),
+    metrics: Optional[str] = Query(None, description="Comma-separated metrics: revenue, occupancy, adr, cancellations"),
+    window: int = Query(anomaly_service.DEFAULT_WINDOW_DAYS, ge=7, le=365, description="Trailing baseline window in days"),
+    lookback_days: int = Query(anomaly_service.DEFAULT_LOOKBACK_DAYS, ge=1, le=365, description="Recent days to scan"),
+    threshold: float = Query(anomaly_service.DEFAULT_THRESHOLD, gt=0, description="Minimum absolute robust z-score"),
+    top_n: int = Query(20, ge=1, le=500, description="Maximum anomalies returned")
+):
+    """Detect recent per-hotel anomalies using rolling robust z-scores"""
+    filters = create_filters_dict(hotel_id, start_date, end_date, booking_channel, market_segment)
+    try:
+        metric_list = anomaly_service.validate_anomaly_metrics(metrics)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await handle_service_error(
+        anomaly_service.get_anomalies, filters, metric_list, window, lookback_days, threshold, top_n
+    )
+
 # ─────────────────────────────────────────────────────────────────────────────
 # NEW DASHBOARD ENDPOINTS
 # ─────────────────────────────────────────────────────────────────────────────
@@ -448,7 +624,12 @@ async def dashboard_summary(
     booking_channel: Optional[str] = Query(None),
     market_segment: Optional[str] = Query(None),
 ):
-    """Enhanced KPI summary — total revenue, bookings, ADR, RevPAR, occupancy, cancellation rate."""
+    """
+    Enhanced KPI summary — total revenue, bookings, ADR, RevPAR, occupancy, cancellation rate.
+
+    Ratios are computed from totals; cancellation_rate is cancellations / (rooms sold +
+    cancellations) in percent (it used to divide by rooms sold only).
+    """
     filters = _dashboard_filters(hotel_id, start_date, end_date, booking_channel, market_segment)
     return await handle_service_error(dashboard_service.get_summary, filters)
 
@@ -536,7 +717,7 @@ async def dashboard_cancellations_over_time(
     booking_channel: Optional[str] = Query(None),
     market_segment: Optional[str] = Query(None),
 ):
-    """Cancellation count and rate over time."""
+    """Cancellation count and rate over time (rate = cancellations / (rooms sold + cancellations), in percent)."""
     filters = _dashboard_filters(hotel_id, start_date, end_date, booking_channel, market_segment)
     return await handle_service_error(
         dashboard_service.get_cancellations_over_time, filters, granularity
@@ -565,12 +746,81 @@ async def get_filter_options():
     return await handle_service_error(dashboard_service.get_filter_options)
 
 
-@app.post("/api/insights/refresh", tags=["analytics"])
+@app.get("/api/insights/rules", response_model=Dict[str, Any], tags=["analytics"])
+async def get_insight_rules_status():
+    """Status of the declarative insight rules file (reloaded automatically on change)"""
+    try:
+        return insight_rules.rule_set.status()
+    except Exception as e:
+        logger.error(f"Error getting insight rules status: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get insight rules status: {str(e)}")
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Allow only callers presenting ADMIN_TOKEN in X-Admin-Token"""
+    if not profiling.is_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+@app.post("/api/insights/refresh", tags=["analytics"], dependencies=[Depends(require_admin)])
 async def refresh_insights():
-    """Refresh insights data (useful after data updates)"""
+    """Refresh insights data (useful after data updates); the dataset is rebuilt in the background"""
     try:
-        insight_service.refresh_insights()
-        return {"message": "Insights data refreshed successfully"}
+        return {"message": "Dataset refresh started", **insight_service.refresh_insights(wait=False)}
     except Exception as e:
         logger.error(f"Error refreshing insights: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/dataset/refresh", response_model=Dict[str, Any], tags=["analytics"],
+          dependencies=[Depends(require_admin)])
+async def refresh_dataset(
+    wait: bool = Query(False, description="Respond once the new epoch is swapped in")
+):
+    """
+    Reload and validate the dataset and rebuild its aggregates in the background,
+    then swap it in atomically. Requests keep being served from the current epoch
+    meanwhile; an unchanged dataset is not swapped.
+    """
+    if wait:
+        return await run_in_threadpool(dataset_epochs.refresh, True)
+    return dataset_epochs.refresh()
+
+@app.get("/api/dataset/epoch", response_model=Dict[str, Any], tags=["analytics"])
+async def dataset_epoch_status():
+    """Current dataset epoch, refresh counters and the outcome of the last refresh"""
+    return dataset_epochs.status()
+
+
+# ── Admin: request profiles ─────────────────────────────────────────────────
+@app.get("/api/admin/profiles", response_model=Dict[str, Any], tags=["admin"],
+         dependencies=[Depends(require_admin)])
+async def list_profiles():
+    """Stored request profiles, newest first"""
+    return {
+        "status": profiling.profiling_status(),
+        "profiles": profiling.profile_store.list(),
+    }
+
+@app.get("/api/admin/profiles/{profile_id}", response_model=Dict[str, Any], tags=["admin"],
+         dependencies=[Depends(require_admin)])
+async def get_profile(
+    profile_id: str,
+    sort: str = Query("cumulative", description="cumulative, tottime or calls"),
+    limit: int = Query(40, ge=1, le=500, description="Number of functions to return"),
+    text: bool = Query(False, description="Include the pstats text report"),
+):
+    """Top-N function table of one stored profile"""
+    try:
+        profile = profiling.profile_store.get(profile_id, sort=sort, limit=limit, text=text)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return profile
+
+# ── Admin: memory ───────────────────────────────────────────────────────────
+@app.get("/api/admin/memory", response_model=Dict[str, Any], tags=["admin"],
+         dependencies=[Depends(require_admin)])
+async def memory_report(
+    enforce: bool = Query(False, description="Run the memory budget check (and eviction) first")
+):
+    """Deep memory usage of datasets and caches, process RSS and the memory budget"""
+    return await handle_service_error(memory_service.get_memory_report, enforce)
@@ -125,11 +125,48 @@ class ForecastResponse(BaseModel):
     forecast: List[ForecastItem] = Field(..., description="Forecast data points")
     metadata: ForecastMetadata = Field(..., description="Forecast metadata")
 
+class MultiForecastMetadata(BaseModel):
+    """Metadata shared by all targets of a multi-target forecast"""
+    targets: List[str] = Field(..., description="Targets included in the response")
+    forecast_period_days: int = Field(..., description="Number of days forecasted")
+    last_historical_date: str = Field(..., description="Last date in historical data")
+    forecast_start_date: Optional[str] = Field(None, description="First forecast date")
+    forecast_end_date: Optional[str] = Field(None, description="Last forecast date")
+    models_trained: int = Field(..., description="Number of models trained for this request")
+    generated_at: str = Field(..., description="When the response was generated")
+
+class MultiForecastResponse(BaseModel):
+    """Aligned forecasts for several targets"""
+    forecasts: Dict[str, ForecastResponse] = Field(..., description="Forecast per target (revenue, occupancy, adr, revpar, cancellations)")
+    metadata: MultiForecastMetadata = Field(..., description="Shared forecast metadata")
+
+class CacheEntryStatus(BaseModel):
+    """Status of a single forecast cache entry"""
+    key: str = Field(..., description="Cache entry key")
+    age_seconds: float = Field(..., description="Seconds since the entry was cached")
+    size_bytes: int = Field(..., description="Estimated memory footprint in bytes")
+    hits: int = Field(..., description="Number of times the entry was served")
+    refresh_count: int = Field(..., description="Number of times the entry was rebuilt")
+    stale: bool = Field(..., description="Whether the entry is past its maximum age")
+    refreshing: bool = Field(..., description="Whether a background refresh is running")
+    fit_mode: Optional[str] = Field(None, description="How the model was fitted (full or incremental)")
+    shared: bool = Field(False, description="Whether the entry was fitted by another worker (no model held here)")
+
 class CacheStatus(BaseModel):
     """Forecast cache status"""
     cached_entries: int = Field(..., description="Number of cached entries")
     cache_keys: List[str] = Field(..., description="Cache entry keys")
     max_age_hours: int = Field(..., description="Maximum cache age in hours")
+    max_entries: int = Field(..., description="Maximum number of cached entries")
+    max_memory_bytes: int = Field(..., description="Maximum total cache size in bytes")
+    total_bytes: int = Field(..., description="Estimated total cache size in bytes")
+    hits: int = Field(..., description="Fresh cache hits")
+    misses: int = Field(..., description="Cache misses")
+    stale_hits: int = Field(..., description="Expired entries served while refreshing")
+    evictions: int = Field(..., description="Entries evicted by the LRU bounds")
+    refreshes: int = Field(..., description="Entries rebuilt in place")
+    entries: List[CacheEntryStatus] = Field(..., description="Per-entry status")
+    shared: Optional[Dict[str, Any]] = Field(None, description="Cross-worker result cache status")
 
 class HealthResponse(BaseModel):
     """Health check response"""
@@ -137,12 +174,31 @@ class HealthResponse(BaseModel):
     version: str = Field(..., description="API version")
     status: str = Field(..., description="Health status")
 
+class AnalyzerRun(BaseModel):
+    """Timing and outcome of a single insight analyzer"""
+    name: str = Field(..., description="Analyzer name")
+    status: str = Field(..., description="ok, error, or skipped (budget exceeded)")
+    duration_ms: Optional[float] = Field(None, description="Analyzer wall time in milliseconds")
+    budget_ms: float = Field(..., description="Analyzer time budget in milliseconds")
+    queued_ms: Optional[float] = Field(None, description="Time spent waiting for a free analyzer thread in milliseconds")
+    insights: int = Field(..., description="Number of insights produced")
+    aggregates_cached: bool = Field(..., description="Whether shared aggregates were already built")
+    cache: str = Field(..., description="hit if served from the insight cache, shared if taken from the cross-worker result cache, else miss")
+
+class InsightsMetadata(BaseModel):
+    """Insight generation metadata"""
+    cache: str = Field(..., description="hit if served from the insight cache, shared if taken from the cross-worker result cache, else miss")
+    total_ms: float = Field(..., description="Total generation time in milliseconds when computed")
+    analyzers: List[AnalyzerRun] = Field(..., description="Per-analyzer timings")
+    complete: bool = Field(True, description="False if an analyzer was skipped or failed; such reports are not cached")
+
 class InsightsResponse(BaseModel):
     """Business insights response schema"""
     insights: List[str] = Field(..., description="List of business insights")
     generated_at: str = Field(..., description="Timestamp when insights were generated")
     total_insights: int = Field(..., description="Total number of insights")
     data_period: Optional[str] = Field(None, description="Data period analyzed")
+    metadata: Optional[InsightsMetadata] = Field(None, description="Analyzer timings and cache status")
     
     class Config:
         json_schema_extra = {
@@ -0,0 +1,278 @@
+"""
+Anomaly detection service: rolling robust z-scores for every hotel at once.
+
+Each metric is pivoted into a day × hotel matrix. For every recent day the
+value is compared with the median and MAD of the preceding window, computed
+as whole-matrix NumPy operations over sliding windows (no per-hotel loops).
+Hotel-days are built from the additive metric components (utils.metrics),
+so ratio metrics match the KPIs and dashboard.
+"""
+
+import logging
+import warnings
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from utils.data_loader import apply_filters, get_filter_metadata
+from utils.metrics import RATIO_METRICS, compute_metric, sum_components
+from services.revenue_service import get_cached_data
+
+logger = logging.getLogger(__name__)
+
+# Metric key -> additive component or ratio KPI of utils.metrics
+ANOMALY_METRICS = {
+    "revenue": "revenue",
+    "occupancy": "occupancy",
+    "adr": "adr",
+    "cancellations": "cancellations",
+}
+
+DEFAULT_WINDOW_DAYS = 28
+DEFAULT_LOOKBACK_DAYS = 7
+# Modified z-score cut-off commonly used with median/MAD (Iglewicz & Hoaglin)
+DEFAULT_THRESHOLD = 3.5
+# Scales MAD to be comparable with a standard deviation for normal data
+MAD_SCALE = 1.4826
+# Upper bound on window × hotels × days values materialised per chunk
+_MAX_CHUNK_VALUES = 4_000_000
+
+
+def daily_components(df: pd.DataFrame, days: Optional[int] = None) -> pd.DataFrame:
+    """
+    Additive metric components summed per day and hotel
+
+    Args:
+        df: Hotel revenue rows
+        days: Only keep the last `days` calendar days (all when omitted)
+    """
+    if days is not None:
+        df = df[df["Date"] > df["Date"].max() - pd.Timedelta(days=days)]
+    return sum_components(df, by=["Date", "Hotel_ID"])
+
+
+def metric_matrix(components: pd.DataFrame, metric: str) -> pd.DataFrame:
+    """
+    Pivot one metric of daily_components() into a day × hotel matrix
+    covering every calendar day
+
+    Args:
+        components: Output of daily_components
+        metric: Key of ANOMALY_METRICS
+    """
+    name = ANOMALY_METRICS[metric]
+    values = compute_metric(components, name) if name in RATIO_METRICS else components[name]
+    matrix = values.unstack("Hotel_ID")
+    full_range = pd.date_range(matrix.index.min(), matrix.index.max(), freq="D")
+    return matrix.reindex(full_range)
+
+
+def build_daily_matrix(df: pd.DataFrame, metric: str, days: Optional[int] = None) -> pd.DataFrame:
+    """
+    Pivot one metric into a day × hotel matrix covering every calendar day
+
+    Args:
+        df: Hotel revenue rows
+        metric: Key of ANOMALY_METRICS
+        days: Only keep the last `days` calendar days (all when omitted)
+    """
+    return metric_matrix(daily_components(df, days), metric)
+
+
+def robust_zscores(values: np.ndarray, window: int, lookback: int) -> tuple:
+    """
+    Rolling robust z-scores for the last `lookback` rows of a day × hotel matrix.
+
+    Each day is scored against the `window` days before it (the day itself is
+    excluded), using median and MAD so a single spike cannot mask another.
+
+    Returns:
+        Tuple of (z_scores, medians), each shaped (lookback, hotels). Days
+        without a usable baseline (too few points or zero MAD) are NaN.
+    """
+    days, hotels = values.shape
+    lookback = min(lookback, max(days - window, 0))
+    z_scores = np.full((lookback, hotels), np.nan)
+    medians = np.full((lookback, hotels), np.nan)
+    if lookback == 0 or hotels == 0:
+        return z_scores, medians
+
+    # Rows [days - lookback - window, days - 1) hold every needed baseline window
+    history = values[days - lookback - window: days - 1]
+    current = values[days - lookback:]
+    chunk = max(1, _MAX_CHUNK_VALUES // max(window * hotels, 1))
+
+    for start in range(0, lookback, chunk):
+        stop = min(start + chunk, lookback)
+        # (stop - start, hotels, window) view over the trailing windows
+        windows = sliding_window_view(history[start: stop - 1 + window], window, axis=0)
+        enough = np.sum(~np.isnan(windows), axis=-1) >= window // 2
+        with np.errstate(all="ignore"), warnings.catch_warnings():
+            # All-NaN windows (gaps in filtered data) are expected here
+            warnings.simplefilter("ignore", RuntimeWarning)
+            median = np.nanmedian(windows, axis=-1)
+            mad = np.nanmedian(np.abs(windows - median[..., None]), axis=-1) * MAD_SCALE
+            z = (current[start:stop] - median) / mad
+        z[~enough | (mad == 0) | ~np.isfinite(z)] = np.nan
+        z_scores[start:stop] = z
+        medians[start:stop] = median
+
+    return z_scores, medians
+
+
+def detect_anomalies(
+    df: pd.DataFrame,
+    metrics: Optional[List[str]] = None,
+    window: int = DEFAULT_WINDOW_DAYS,
+    lookback: int = DEFAULT_LOOKBACK_DAYS,
+    threshold: float = DEFAULT_THRESHOLD,
+    top_n: int = 20,
+) -> List[Dict[str, Any]]:
+    """
+    Find the strongest recent anomalies across all hotels and metrics.
+
+    Args:
+        df: Hotel revenue rows (already filtered if needed)
+        metrics: Keys of ANOMALY_METRICS to scan (all when omitted)
+        window: Trailing baseline window in days
+        lookback: Number of most recent days to score
+        threshold: Minimum absolute robust z-score to report
+        top_n: Maximum number of anomalies returned
+
+    Returns:
+        Anomaly records sorted by absolute z-score, strongest first
+    """
+    if df.empty:
+        return []
+
+    # Only the scored days and their baseline windows are needed, summed once
+    # per hotel-day for all metrics
+    components = daily_components(df, days=window + lookback)
+    return score_anomalies(components, metrics, window, lookback, threshold, top_n)
+
+
+def score_anomalies(
+    components: pd.DataFrame,
+    metrics: Optional[List[str]] = None,
+    window: int = DEFAULT_WINDOW_DAYS,
+    lookback: int = DEFAULT_LOOKBACK_DAYS,
+    threshold: float = DEFAULT_THRESHOLD,
+    top_n: int = 20,
+) -> List[Dict[str, Any]]:
+    """
+    detect_anomalies() over hotel-day components that are already summed.
+
+    Cost depends only on the number of hotels and days in `components`,
+    not on the rows they were summed from.
+
+    Args:
+        components: daily_components() covering at least window + lookback days
+        metrics, window, lookback, threshold, top_n: As for detect_anomalies
+
+    Returns:
+        Anomaly records sorted by absolute z-score, strongest first
+    """
+    if components.empty:
+        return []
+
+    frames = []
+    for metric in metrics or list(ANOMALY_METRICS):
+        matrix = metric_matrix(components, metric)
+        z_scores, medians = robust_zscores(matrix.to_numpy(dtype=float), window, lookback)
+        if z_scores.size == 0:
+            continue
+
+        dates = matrix.index[len(matrix) - len(z_scores):]
+        values = matrix.to_numpy(dtype=float)[len(matrix) - len(z_scores):]
+        flagged_days, flagged_hotels = np.nonzero(np.abs(np.nan_to_num(z_scores)) >= threshold)
+        if len(flagged_days) == 0:
+            continue
+
+        z = z_scores[flagged_days, flagged_hotels]
+        frames.append(pd.DataFrame({
+            "hotel_id": matrix.columns.astype(str).to_numpy()[flagged_hotels],
+            "date": dates[flagged_days].strftime("%Y-%m-%d"),
+            "metric": metric,
+            "value": values[flagged_days, flagged_hotels].round(4),
+            "baseline_median": medians[flagged_days, flagged_hotels].round(4),
+            "z_score": z.round(2),
+            "direction": np.where(z > 0, "spike", "drop"),
+        }))
+
+    if not frames:
+        return []
+
+    anomalies = pd.concat(frames, ignore_index=True)
+    order = np.argsort(-np.abs(anomalies["z_score"].to_numpy()), kind="stable")
+    return anomalies.iloc[order[:top_n]].to_dict(orient="records")
+
+
+def describe_anomaly(anomaly: Dict[str, Any], window: int = DEFAULT_WINDOW_DAYS) -> str:
+    """One-sentence insight describing an anomaly record."""
+    metric = anomaly["metric"]
+    if metric == "occupancy":
+        value = f"{anomaly['value'] * 100:.1f}%"
+        baseline = f"{anomaly['baseline_median'] * 100:.1f}%"
+    elif metric == "cancellations":
+        value = f"{anomaly['value']:,.0f}"
+        baseline = f"{anomaly['baseline_median']:,.0f}"
+    else:
+        value = f"₹{anomaly['value']:,.0f}"
+        baseline = f"₹{anomaly['baseline_median']:,.0f}"
+
+    label = {"adr": "ADR"}.get(metric, metric)
+    verb = "spiked" if anomaly["direction"] == "spike" else "dropped"
+    return (
+        f"{anomaly['hotel_id']} {label} {verb} to {value} on {anomaly['date']}, "
+        f"{abs(anomaly['z_score']):.1f} robust z-scores from its {window}-day median of {baseline}."
+    )
+
+
+def get_anomalies(
+    filters: Optional[Dict[str, Any]] = None,
+    metrics: Optional[List[str]] = None,
+    window: int = DEFAULT_WINDOW_DAYS,
+    lookback: int = DEFAULT_LOOKBACK_DAYS,
+    threshold: float = DEFAULT_THRESHOLD,
+    top_n: int = 20,
+) -> Dict[str, Any]:
+    """Top recent anomalies for the (optionally filtered) portfolio."""
+    try:
+        df = get_cached_data()
+        original_count = len(df)
+        if filters:
+            df = apply_filters(df, filters)
+
+        anomalies = detect_anomalies(df, metrics, window, lookback, threshold, top_n)
+        return {
+            "data": anomalies,
+            "insights": [describe_anomaly(anomaly, window) for anomaly in anomalies],
+            "parameters": {
+                "metrics": metrics or list(ANOMALY_METRICS),
+                "window_days": window,
+                "lookback_days": lookback,
+                "threshold": threshold,
+                "top_n": top_n,
+            },
+            "filters_applied": filters or {},
+            "metadata": get_filter_metadata(df, original_count),
+        }
+    except Exception as e:
+        logger.error(f"Error in get_anomalies: {e}")
+        raise
+
+
+def validate_anomaly_metrics(metrics: Optional[str]) -> Optional[List[str]]:
+    """Validate a comma-separated metric list; None means all metrics."""
+    if not metrics:
+        return None
+    names = list(dict.fromkeys(m.strip().lower() for m in metrics.split(",") if m.strip()))
+    unknown = [name for name in names if name not in ANOMALY_METRICS]
+    if unknown:
+        raise ValueError(
+            f"Unknown anomaly metrics: {', '.join(unknown)}. "
+            f"Available: {', '.join(ANOMALY_METRICS)}"
+        )
+    return names
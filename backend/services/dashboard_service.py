@@ -4,16 +4,20 @@ All monetary values returned with 2 decimal places; all dates in ISO-8601.
 """
 
 import math
+import numpy as np
 import pandas as pd
 import logging
 from typing import Dict, Any, Optional
 
 from utils.data_loader import apply_filters, get_filter_metadata
+from utils.metrics import metric_components, sum_components, compute_metric
+from utils.timing import timed
 from services.revenue_service import get_cached_data
 
 logger = logging.getLogger(__name__)
 
 
+@timed("sanitize")
 def _sanitize_df(df: pd.DataFrame) -> pd.DataFrame:
     """Replace NaN / ±Inf in numeric columns with 0 before JSON serialisation."""
     num_cols = df.select_dtypes(include="number").columns
@@ -35,14 +39,40 @@ _MONTH_RULE = "ME" if (_pd_major, _pd_minor) >= (2, 2) else "M"
 _GRANULARITY_RULES = {"day": "D", "week": "W", "month": _MONTH_RULE}
 
 
+@timed("aggregate")
 def _resample(df: pd.DataFrame, granularity: str, agg: Dict[str, str]) -> pd.DataFrame:
     """Resample a date-indexed DataFrame. Empty periods get 0 (never NaN)."""
+    if granularity == "month" and "Year_Month" in df.columns:
+        return _resample_monthly(df, agg)
     rule = _GRANULARITY_RULES.get(granularity, "D")
     resampled = df.resample(rule).agg(agg).reset_index()
     resampled["Date"] = resampled["Date"].dt.strftime("%Y-%m-%d")
     return _sanitize_df(resampled)
 
 
+def _resample_monthly(df: pd.DataFrame, agg: Dict[str, str]) -> pd.DataFrame:
+    """Monthly buckets from the precomputed Year_Month key, labelled by month end like resample."""
+    grouped = df.groupby("Year_Month").agg(agg)
+    months = range(grouped.index.min(), grouped.index.max() + 1)
+    grouped = grouped.reindex(months, fill_value=0)
+    years, month_index = np.divmod(grouped.index.to_numpy(), 12)
+    month_end = pd.to_datetime(
+        {"year": years, "month": month_index + 1, "day": 1}
+    ) + pd.offsets.MonthEnd(0)
+    resampled = grouped.reset_index(drop=True)
+    resampled.insert(0, "Date", month_end.dt.strftime("%Y-%m-%d"))
+    return _sanitize_df(resampled)
+
+
+def _indexed_components(df: pd.DataFrame) -> pd.DataFrame:
+    """Additive metric components indexed by Date, ready for _resample."""
+    components = metric_components(df)
+    if "Year_Month" in df.columns:
+        components["Year_Month"] = df["Year_Month"]
+    components.index = pd.DatetimeIndex(df["Date"], name="Date")
+    return components
+
+
 def _build_empty(filters, original_count: int, df: pd.DataFrame):
     return {
         "data": [],
@@ -77,21 +107,21 @@ def get_summary(filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
                 "metadata": get_filter_metadata(df, original_count),
             }
 
-        total_rooms_sold = int(df["Rooms_Sold"].sum())
-        total_cancellations = int(df["Cancellation_Count"].sum())
-        cancellation_rate = (
-            round((total_cancellations / total_rooms_sold) * 100, 2)
-            if total_rooms_sold > 0
-            else 0.0
-        )
+        totals = sum_components(df)
+        total_rooms_sold = int(totals["rooms_sold"])
+        total_cancellations = int(totals["cancellations"])
+
+        def kpi(metric: str, scale: float = 1.0, digits: int = 2) -> float:
+            value = compute_metric(totals, metric)
+            return round(float(value) * scale, digits) if np.isfinite(value) else 0.0
 
         return {
-            "total_revenue": round(float(df["Revenue_INR"].sum()), 2),
+            "total_revenue": round(float(totals["revenue"]), 2),
             "total_bookings": total_rooms_sold,
-            "avg_adr": round(float(df["ADR_INR"].mean()), 2),
-            "avg_revpar": round(float(df["RevPAR_INR"].mean()), 2),
-            "avg_occupancy": round(float(df["Occupancy_Rate"].mean()), 4),
-            "cancellation_rate": cancellation_rate,
+            "avg_adr": kpi("adr"),
+            "avg_revpar": kpi("revpar"),
+            "avg_occupancy": kpi("occupancy", digits=4),
+            "cancellation_rate": kpi("cancellation_rate", scale=100),
             "total_cancellations": total_cancellations,
             "total_rooms_sold": total_rooms_sold,
             "filters_applied": filters or {},
@@ -118,12 +148,12 @@ def get_revenue_over_time(
         if df.empty:
             return _build_empty(filters, original_count, df)
 
-        indexed = df.set_index("Date")
         result = _resample(
-            indexed, granularity, {"Revenue_INR": "sum", "ADR_INR": "mean"}
+            _indexed_components(df), granularity, {"revenue": "sum", "rooms_sold": "sum"}
         )
-        result["Revenue_INR"] = result["Revenue_INR"].round(2)
-        result["ADR_INR"] = result["ADR_INR"].round(2)
+        result["Revenue_INR"] = result["revenue"].round(2)
+        result["ADR_INR"] = compute_metric(result, "adr").round(2)
+        result = result[["Date", "Revenue_INR", "ADR_INR"]]
 
         return {
             "data": _safe_records(result),
@@ -149,13 +179,14 @@ def get_bookings_by_channel(filters: Optional[Dict[str, Any]] = None) -> Dict[st
         if df.empty:
             return _build_empty(filters, original_count, df)
 
+        components = sum_components(df, by="Booking_Channel")
         grouped = (
-            df.groupby("Booking_Channel", as_index=False)
-            .agg(
-                bookings=("Rooms_Sold", "sum"),
-                revenue=("Revenue_INR", "sum"),
-                cancellations=("Cancellation_Count", "sum"),
-            )
+            pd.DataFrame({
+                "Booking_Channel": components.index.astype(str),
+                "bookings": components["rooms_sold"].to_numpy(),
+                "revenue": components["revenue"].to_numpy(),
+                "cancellations": components["cancellations"].to_numpy(),
+            })
             .sort_values("bookings", ascending=False)
         )
         total = grouped["bookings"].sum()
@@ -187,14 +218,15 @@ def get_bookings_by_segment(filters: Optional[Dict[str, Any]] = None) -> Dict[st
         if df.empty:
             return _build_empty(filters, original_count, df)
 
+        components = sum_components(df, by="Market_Segment")
         grouped = (
-            df.groupby("Market_Segment", as_index=False)
-            .agg(
-                bookings=("Rooms_Sold", "sum"),
-                revenue=("Revenue_INR", "sum"),
-                cancellations=("Cancellation_Count", "sum"),
-                avg_adr=("ADR_INR", "mean"),
-            )
+            pd.DataFrame({
+                "Market_Segment": components.index.astype(str),
+                "bookings": components["rooms_sold"].to_numpy(),
+                "revenue": components["revenue"].to_numpy(),
+                "cancellations": components["cancellations"].to_numpy(),
+                "avg_adr": compute_metric(components, "adr").to_numpy(),
+            })
             .sort_values("bookings", ascending=False)
         )
         total = grouped["bookings"].sum()
@@ -230,9 +262,11 @@ def get_occupancy_over_time(
         if df.empty:
             return _build_empty(filters, original_count, df)
 
-        indexed = df.set_index("Date")
-        result = _resample(indexed, granularity, {"Occupancy_Rate": "mean"})
-        result["Occupancy_Rate"] = (result["Occupancy_Rate"] * 100).round(2)  # 0-100
+        result = _resample(
+            _indexed_components(df), granularity, {"rooms_sold": "sum", "rooms_available": "sum"}
+        )
+        result["Occupancy_Rate"] = (compute_metric(result, "occupancy") * 100).round(2)  # 0-100
+        result = result[["Date", "Occupancy_Rate"]]
 
         return {
             "data": _safe_records(result),
@@ -261,9 +295,11 @@ def get_adr_over_time(
         if df.empty:
             return _build_empty(filters, original_count, df)
 
-        indexed = df.set_index("Date")
-        result = _resample(indexed, granularity, {"ADR_INR": "mean"})
-        result["ADR_INR"] = result["ADR_INR"].round(2)
+        result = _resample(
+            _indexed_components(df), granularity, {"revenue": "sum", "rooms_sold": "sum"}
+        )
+        result["ADR_INR"] = compute_metric(result, "adr").round(2)
+        result = result[["Date", "ADR_INR"]]
 
         return {
             "data": _safe_records(result),
@@ -292,20 +328,18 @@ def get_cancellations_over_time(
         if df.empty:
             return _build_empty(filters, original_count, df)
 
-        indexed = df.set_index("Date")
         result = _resample(
-            indexed,
+            _indexed_components(df),
             granularity,
-            {"Cancellation_Count": "sum", "Rooms_Sold": "sum"},
+            {"cancellations": "sum", "gross_bookings": "sum"},
         )
         # Compute cancellation rate for the period
         result["cancellation_rate"] = (
-            (result["Cancellation_Count"] / result["Rooms_Sold"] * 100)
+            (compute_metric(result, "cancellation_rate") * 100)
             .fillna(0)
             .round(2)
         )
-        result.rename(columns={"Cancellation_Count": "cancellations"}, inplace=True)
-        result.drop(columns=["Rooms_Sold"], inplace=True)
+        result.drop(columns=["gross_bookings"], inplace=True)
 
         return {
             "data": _safe_records(result),
@@ -331,14 +365,15 @@ def get_revenue_by_hotel_dashboard(filters: Optional[Dict[str, Any]] = None, top
         if df.empty:
             return _build_empty(filters, original_count, df)
 
+        components = sum_components(df, by="Hotel_ID")
         grouped = (
-            df.groupby("Hotel_ID", as_index=False)
-            .agg(
-                revenue=("Revenue_INR", "sum"),
-                bookings=("Rooms_Sold", "sum"),
-                avg_adr=("ADR_INR", "mean"),
-                avg_occupancy=("Occupancy_Rate", "mean"),
-            )
+            pd.DataFrame({
+                "Hotel_ID": components.index.astype(str),
+                "revenue": components["revenue"].to_numpy(),
+                "bookings": components["rooms_sold"].to_numpy(),
+                "avg_adr": compute_metric(components, "adr").to_numpy(),
+                "avg_occupancy": compute_metric(components, "occupancy").to_numpy(),
+            })
             .nlargest(top_n, "revenue")
         )
         grouped["revenue"] = grouped["revenue"].round(2)
@@ -1,111 +1,382 @@
 """
 Forecasting service for hotel revenue analytics
 Uses Facebook Prophet with Linear Regression fallback
+
+Prophet and scikit-learn are imported on first use so that importing this
+module (and booting the API) stays fast.
 """
 
 import pandas as pd
 import numpy as np
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable, TYPE_CHECKING
 from datetime import datetime, timedelta, date
 from functools import lru_cache
-import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import json
+import threading
 
-# Try importing Prophet, fallback to sklearn if not available
-try:
-    from prophet import Prophet
-    PROPHET_AVAILABLE = True
-except ImportError:
-    PROPHET_AVAILABLE = False
-    logging.warning("Prophet not available, will use Linear Regression fallback")
-
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import mean_absolute_error, r2_score
+from utils.data_loader import data_fingerprint
+from utils.dataset_epoch import current_epoch
+from utils.memory import estimate_size, memory_budget
+from utils.metrics import RATIO_METRICS, compute_metric, sum_components
+from utils.result_cache import result_cache
+from utils.telemetry import FORECAST_TRAINING_DURATION
 
-from utils.data_loader import load_data
+if TYPE_CHECKING:
+    from prophet import Prophet
+    from sklearn.linear_model import LinearRegression
+    from sklearn.preprocessing import StandardScaler
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+_prophet_class = None
+_prophet_checked = False
+_import_lock = threading.Lock()
+
+def _get_prophet():
+    """Import Prophet on first use; returns None when it is not installed"""
+    global _prophet_class, _prophet_checked
+    with _import_lock:
+        if not _prophet_checked:
+            # Try importing Prophet, fallback to sklearn if not available
+            try:
+                from prophet import Prophet
+                _prophet_class = Prophet
+            except ImportError:
+                logger.warning("Prophet not available, will use Linear Regression fallback")
+            _prophet_checked = True
+    return _prophet_class
+
+def is_prophet_available() -> bool:
+    """Check whether Prophet can be used, importing it if needed"""
+    return _get_prophet() is not None
+
+def warmup():
+    """Import the forecasting libraries ahead of the first forecast request"""
+    is_prophet_available()
+    import sklearn.linear_model  # noqa: F401
+    import sklearn.preprocessing  # noqa: F401
+    import sklearn.metrics  # noqa: F401
+
 class ForecastCache:
-    """Simple in-memory cache for forecast models and results"""
+    """Thread-safe, size-bounded LRU cache for fitted forecast models
+
+    One entry is kept per dataset and target. The entry holds the fitted model
+    together with the longest forecast produced from it, so any shorter
+    horizon is served by slicing and a longer one by predicting further from
+    the stored model.
+
+    Expired entries are served stale while a single background refresh
+    rebuilds them. The least recently used entries are evicted once either
+    the entry or the memory bound is exceeded.
+    """
     
-    def __init__(self, max_age_hours: int = 24):
-        self.cache = {}
+    def __init__(self, max_age_hours: int = 24, max_entries: int = 64,
+                 max_memory_mb: float = 256):
+        self.cache = OrderedDict()
         self.max_age_hours = max_age_hours
+        self.max_entries = max_entries
+        self.max_memory_bytes = int(max_memory_mb * 1024 * 1024)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self.refreshes = 0
+        self._refreshing = set()
+        self._lock = threading.RLock()
     
-    def _generate_key(self, data_hash: str, forecast_type: str, days: int) -> str:
-        """Generate cache key based on data hash and parameters"""
-        return f"{forecast_type}_{days}_{data_hash}"
+    def _generate_key(self, data_hash: str, forecast_type: str) -> str:
+        """Generate cache key based on data hash and target"""
+        return f"{forecast_type}_{data_hash}"
     
     def _is_expired(self, timestamp: datetime) -> bool:
         """Check if cache entry is expired"""
         return datetime.now() - timestamp > timedelta(hours=self.max_age_hours)
     
-    def get(self, data_hash: str, forecast_type: str, days: int) -> Optional[Dict]:
-        """Get cached forecast result"""
-        key = self._generate_key(data_hash, forecast_type, days)
-        entry = self.cache.get(key)
-        
-        if entry and not self._is_expired(entry['timestamp']):
-            logger.info(f"Cache hit for {key}")
-            return entry['data']
-        
-        if entry:
-            # Remove expired entry
-            del self.cache[key]
+    def get(self, data_hash: str, forecast_type: str,
+            refresh: Optional[Callable[[], Any]] = None) -> Optional[Dict]:
+        """
+        Get cached model entry
+        
+        Args:
+            data_hash: Hash of the dataset the model was trained on
+            forecast_type: Target column
+            refresh: Rebuilds and re-caches the entry. When given, an expired
+                entry is returned as-is and `refresh` runs in the background;
+                otherwise the expired entry is dropped.
+        """
+        key = self._generate_key(data_hash, forecast_type)
+        start_refresh = False
+        
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            if self._is_expired(entry['timestamp']):
+                if refresh is None:
+                    self._remove(key)
+                    self.misses += 1
+                    return None
+                self.stale_hits += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    start_refresh = True
+            else:
+                self.hits += 1
+            
+            entry['hits'] += 1
+            self.cache.move_to_end(key)
+            data = entry['data']
+        
+        if start_refresh:
+            logger.info(f"Serving stale forecast for {key} while refreshing")
+            threading.Thread(
+                target=self._run_refresh, args=(key, refresh), daemon=True
+            ).start()
+        
+        return data
+    
+    def _run_refresh(self, key: str, refresh: Callable[[], Any]):
+        """Run a background refresh, allowing another one once it finishes"""
+        try:
+            refresh()
+        except Exception as e:
+            logger.error(f"Background refresh failed for {key}: {str(e)}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+    
+    def set(self, data_hash: str, forecast_type: str, data: Dict,
+            timestamp: Optional[datetime] = None):
+        """
+        Cache fitted model entry, evicting least recently used entries if needed
+        
+        Args:
+            timestamp: When the entry was built, if not now (entries adopted
+                from another worker keep its age so they expire together)
+        """
+        key = self._generate_key(data_hash, forecast_type)
+        size = estimate_size(data)
+        
+        with self._lock:
+            previous = self.cache.get(key)
+            refresh_count = 0
+            if previous is not None:
+                refresh_count = previous['refresh_count'] + 1
+                self.refreshes += 1
+                self._remove(key)
+            
+            self.cache[key] = {
+                'data': data,
+                'timestamp': timestamp or datetime.now(),
+                'size_bytes': size,
+                'hits': 0,
+                'refresh_count': refresh_count
+            }
+            self.total_bytes += size
+            self._evict(keep=key)
         
-        return None
+        logger.info(f"Cached forecast model for {key}")
+        memory_budget.check()
     
-    def set(self, data_hash: str, forecast_type: str, days: int, data: Dict):
-        """Cache forecast result"""
-        key = self._generate_key(data_hash, forecast_type, days)
-        self.cache[key] = {
-            'data': data,
-            'timestamp': datetime.now()
-        }
-        logger.info(f"Cached forecast result for {key}")
+    def replace_data(self, data_hash: str, forecast_type: str, data: Dict) -> bool:
+        """
+        Swap the data of a cached entry, keeping its age and counters
+        
+        Entries are shared between request threads, so a changed entry is
+        stored as a new dict rather than mutated in place.
+        
+        Returns:
+            Whether the entry was still cached
+        """
+        key = self._generate_key(data_hash, forecast_type)
+        size = estimate_size(data)
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                return False
+            self.total_bytes += size - entry['size_bytes']
+            entry['data'] = data
+            entry['size_bytes'] = size
+            self._evict(keep=key)
+        memory_budget.check()
+        return True
+    
+    def _remove(self, key: str):
+        """Drop an entry and release its accounted size (lock must be held)"""
+        entry = self.cache.pop(key)
+        self.total_bytes -= entry['size_bytes']
+    
+    def _evict(self, keep: str):
+        """Evict least recently used entries until both bounds hold (lock must be held)"""
+        while (
+            len(self.cache) > self.max_entries or self.total_bytes > self.max_memory_bytes
+        ) and len(self.cache) > 1:
+            oldest = next(iter(self.cache))
+            if oldest == keep:
+                break
+            self._remove(oldest)
+            self.evictions += 1
+            logger.info(f"Evicted forecast model {oldest}")
+    
+    def evict_lru(self) -> int:
+        """Evict the least recently used entry, returning its size in bytes (0 if empty)"""
+        with self._lock:
+            if not self.cache:
+                return 0
+            oldest = next(iter(self.cache))
+            size = self.cache[oldest]['size_bytes']
+            self._remove(oldest)
+            self.evictions += 1
+        logger.info(f"Evicted forecast model {oldest} to stay within the memory budget")
+        return size
+    
+    def cached_at(self, data_hash: str, forecast_type: str) -> Optional[datetime]:
+        """When the cached entry for a dataset and target was built, or None if not cached"""
+        key = self._generate_key(data_hash, forecast_type)
+        with self._lock:
+            entry = self.cache.get(key)
+            return entry['timestamp'] if entry is not None else None
+    
+    def get_latest(self, forecast_type: str) -> Optional[Dict]:
+        """
+        Get the most recently cached model entry for a target, whatever its data hash
+        
+        Only entries fitted in this process qualify; adopted ones hold no model.
+        """
+        with self._lock:
+            entries = [
+                entry for entry in self.cache.values()
+                if entry['data'].get('target_column') == forecast_type
+                and entry['data'].get('model') is not None
+            ]
+        if not entries:
+            return None
+        return max(entries, key=lambda entry: entry['timestamp'])['data']
+    
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self.cache.clear()
+            self.total_bytes = 0
+    
+    def status(self) -> Dict[str, Any]:
+        """Snapshot of cache counters and per-entry ages, sizes and refresh counts"""
+        now = datetime.now()
+        with self._lock:
+            entries = [
+                {
+                    'key': key,
+                    'age_seconds': round((now - entry['timestamp']).total_seconds(), 1),
+                    'size_bytes': entry['size_bytes'],
+                    'hits': entry['hits'],
+                    'refresh_count': entry['refresh_count'],
+                    'stale': self._is_expired(entry['timestamp']),
+                    'refreshing': key in self._refreshing,
+                    'fit_mode': entry['data'].get('fit_mode'),
+                    'shared': entry['data'].get('model') is None
+                }
+                for key, entry in self.cache.items()
+            ]
+            return {
+                'cached_entries': len(self.cache),
+                'cache_keys': list(self.cache.keys()),
+                'max_age_hours': self.max_age_hours,
+                'max_entries': self.max_entries,
+                'max_memory_bytes': self.max_memory_bytes,
+                'total_bytes': self.total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'stale_hits': self.stale_hits,
+                'evictions': self.evictions,
+                'refreshes': self.refreshes,
+                'entries': entries,
+                'shared': result_cache.status()
+            }
 
 # Global cache instance
 forecast_cache = ForecastCache()
 
+# Fitted models are the most expensive entries to rebuild, so they go last
+memory_budget.register('forecast', forecast_cache.evict_lru, priority=90)
+
+# Horizon produced whenever a model is trained; shorter requests are slices of it
+DEFAULT_CACHED_HORIZON = 365
+
+# Models are refreshed incrementally when only trailing days were appended;
+# a from-scratch fit still happens once this interval has elapsed
+FULL_RETRAIN_INTERVAL_HOURS = 24 * 7
+
+# Targets available to the multi-target forecast, keyed by response name
+FORECAST_TARGETS = {
+    'revenue': 'Revenue_INR',
+    'occupancy': 'Occupancy_Rate',
+    'adr': 'ADR_INR',
+    'revpar': 'RevPAR_INR',
+    'cancellations': 'Cancellation_Count'
+}
+
+# Daily value per target as an additive component or ratio KPI of
+# utils.metrics, so forecasts use the same numbers as the KPIs and dashboard;
+# any other column is averaged
+TARGET_METRICS = {
+    'Revenue_INR': 'revenue',
+    'Cancellation_Count': 'cancellations',
+    'Occupancy_Rate': 'occupancy',
+    'ADR_INR': 'adr',
+    'RevPAR_INR': 'revpar'
+}
+
+# Date features used by the Linear Regression fallback, in training order
+LINEAR_FEATURE_COLUMNS = ['days_since_start', 'day_of_year', 'day_of_week', 'month', 'year']
+
 def get_data_hash(df: pd.DataFrame) -> str:
     """Generate hash of dataframe for caching"""
-    data_str = df.to_string()
-    return hashlib.md5(data_str.encode()).hexdigest()
+    return data_fingerprint(df)
 
-def preprocess_data_for_forecast(df: pd.DataFrame, target_column: str) -> pd.DataFrame:
+def preprocess_daily_targets(df: pd.DataFrame, target_columns: List[str]) -> pd.DataFrame:
     """
-    Preprocess data for forecasting
+    Build the daily aggregate matrix for several forecast targets in one groupby
     
     Args:
         df: Input dataframe
-        target_column: Column to forecast (e.g., 'Revenue_INR', 'Occupancy_Rate')
+        target_columns: Columns to forecast (e.g., 'Revenue_INR', 'Occupancy_Rate')
     
     Returns:
-        Preprocessed dataframe with date and target columns
+        Dataframe with a Date column and one aggregated column per target
     """
     try:
-        # Make a copy to avoid modifying original data
-        data = df.copy()
-        
-        # Ensure Date column is datetime
-        if not pd.api.types.is_datetime64_any_dtype(data['Date']):
-            data['Date'] = pd.to_datetime(data['Date'])
-        
-        # Aggregate by date (sum for revenue, mean for occupancy)
-        if target_column == 'Revenue_INR':
-            daily_data = data.groupby('Date')[target_column].sum().reset_index()
-        else:
-            daily_data = data.groupby('Date')[target_column].mean().reset_index()
-        
-        # Sort by date
-        daily_data = daily_data.sort_values('Date')
+        dates = df['Date']
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(dates)
+        dates = dates.rename('Date')
+        
+        # Sum the additive components per date, then derive ratios from the sums
+        components = sum_components(df, by=dates)
+        daily_data = pd.DataFrame(index=components.index)
+        other_columns = []
+        for column in target_columns:
+            metric = TARGET_METRICS.get(column)
+            if metric is None:
+                other_columns.append(column)
+            elif metric in RATIO_METRICS:
+                daily_data[column] = compute_metric(components, metric)
+            else:
+                daily_data[column] = components[metric]
+        if other_columns:
+            daily_data = daily_data.join(df[other_columns].groupby(dates).mean())
+        daily_data = daily_data[target_columns].sort_index().reset_index()
         
         # Handle missing values
-        daily_data[target_column] = daily_data[target_column].fillna(daily_data[target_column].median())
+        daily_data[target_columns] = daily_data[target_columns].fillna(
+            daily_data[target_columns].median()
+        )
         
         # Remove any remaining NaN values
         daily_data = daily_data.dropna()
@@ -114,24 +385,41 @@ def preprocess_data_for_forecast(df: pd.DataFrame, target_column: str) -> pd.Dat
         if len(daily_data) < 30:
             raise ValueError(f"Insufficient data points: {len(daily_data)}. Need at least 30 days of data.")
         
-        logger.info(f"Preprocessed data: {len(daily_data)} daily records for {target_column}")
+        logger.info(f"Preprocessed data: {len(daily_data)} daily records for {', '.join(target_columns)}")
         return daily_data
         
     except Exception as e:
-        logger.error(f"Error preprocessing data for {target_column}: {str(e)}")
+        logger.error(f"Error preprocessing data for {', '.join(target_columns)}: {str(e)}")
         raise ValueError(f"Data preprocessing failed: {str(e)}")
 
-def train_prophet_model(data: pd.DataFrame, target_column: str) -> Tuple[Prophet, Dict[str, float]]:
+def preprocess_data_for_forecast(df: pd.DataFrame, target_column: str) -> pd.DataFrame:
+    """
+    Preprocess data for forecasting
+    
+    Args:
+        df: Input dataframe
+        target_column: Column to forecast (e.g., 'Revenue_INR', 'Occupancy_Rate')
+    
+    Returns:
+        Preprocessed dataframe with date and target columns
+    """
+    return preprocess_daily_targets(df, [target_column])
+
+def train_prophet_model(data: pd.DataFrame, target_column: str,
+                        init: Optional[Dict[str, Any]] = None) -> Tuple['Prophet', Dict[str, float]]:
     """
     Train Facebook Prophet model
     
     Args:
         data: Preprocessed daily data with Date and target columns
         target_column: Target column name
+        init: Optional fitted parameters of a previous model to warm-start from
     
     Returns:
         Tuple of (trained_model, metrics)
     """
+    from sklearn.metrics import mean_absolute_error, r2_score
+    
     try:
         # Prepare data for Prophet (requires 'ds' and 'y' columns)
         prophet_data = pd.DataFrame({
@@ -140,7 +428,7 @@ def train_prophet_model(data: pd.DataFrame, target_column: str) -> Tuple[Prophet
         })
         
         # Initialize Prophet model with reasonable parameters
-        model = Prophet(
+        model = _get_prophet()(
             daily_seasonality=True,
             weekly_seasonality=True,
             yearly_seasonality=True,
@@ -150,11 +438,21 @@ def train_prophet_model(data: pd.DataFrame, target_column: str) -> Tuple[Prophet
         )
         
         # Train the model
-        logger.info(f"Training Prophet model for {target_column}")
-        model.fit(prophet_data)
-        
-        # Calculate model metrics on training data
-        forecast = model.predict(prophet_data)
+        if init is not None:
+            logger.info(f"Warm-starting Prophet model for {target_column}")
+            model.fit(prophet_data, init=init)
+        else:
+            logger.info(f"Training Prophet model for {target_column}")
+            model.fit(prophet_data)
+        
+        # Calculate model metrics on training data (point forecast only, the
+        # uncertainty simulation is not needed for MAE/R²)
+        uncertainty_samples = model.uncertainty_samples
+        model.uncertainty_samples = 0
+        try:
+            forecast = model.predict(prophet_data[['ds']])
+        finally:
+            model.uncertainty_samples = uncertainty_samples
         mae = mean_absolute_error(prophet_data['y'], forecast['yhat'])
         r2 = r2_score(prophet_data['y'], forecast['yhat'])
         
@@ -171,7 +469,16 @@ def train_prophet_model(data: pd.DataFrame, target_column: str) -> Tuple[Prophet
         logger.error(f"Error training Prophet model: {str(e)}")
         raise
 
-def train_linear_regression_model(data: pd.DataFrame, target_column: str) -> Tuple[LinearRegression, StandardScaler, Dict[str, float]]:
+def get_prophet_warm_start_params(model: 'Prophet') -> Dict[str, Any]:
+    """Extract fitted Prophet parameters in the form accepted by `fit(init=...)`"""
+    params = {}
+    for name in ['k', 'm', 'sigma_obs']:
+        params[name] = model.params[name][0][0]
+    for name in ['delta', 'beta']:
+        params[name] = model.params[name][0]
+    return params
+
+def train_linear_regression_model(data: pd.DataFrame, target_column: str) -> Tuple['LinearRegression', 'StandardScaler', Dict[str, float]]:
     """
     Train Linear Regression model as fallback
     
@@ -182,6 +489,10 @@ def train_linear_regression_model(data: pd.DataFrame, target_column: str) -> Tup
     Returns:
         Tuple of (trained_model, scaler, metrics)
     """
+    from sklearn.linear_model import LinearRegression
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.metrics import mean_absolute_error, r2_score
+    
     try:
         # Create features from date
         data_lr = data.copy()
@@ -194,9 +505,7 @@ def train_linear_regression_model(data: pd.DataFrame, target_column: str) -> Tup
         min_date = data_lr['Date'].min()
         data_lr['days_since_start'] = (data_lr['Date'] - min_date).dt.days
         
-        # Feature columns
-        feature_columns = ['days_since_start', 'day_of_year', 'day_of_week', 'month', 'year']
-        X = data_lr[feature_columns]
+        X = data_lr[LINEAR_FEATURE_COLUMNS]
         y = data_lr[target_column]
         
         # Scale features
@@ -225,7 +534,30 @@ def train_linear_regression_model(data: pd.DataFrame, target_column: str) -> Tup
         logger.error(f"Error training Linear Regression model: {str(e)}")
         raise
 
-def generate_forecast_prophet(model: Prophet, last_date: datetime, 
+def format_forecast_records(dates: pd.DatetimeIndex, predicted: np.ndarray,
+                            lower: np.ndarray, upper: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    Build forecast records from whole arrays
+    
+    Predictions and lower bounds are clipped to be non-negative in one
+    vectorized pass; rows are only materialised at the final conversion.
+    """
+    date_strings = dates.strftime('%Y-%m-%d').tolist()
+    predicted_values = np.clip(predicted, 0, None).astype(float).tolist()
+    lower_bounds = np.clip(lower, 0, None).astype(float).tolist()
+    upper_bounds = np.asarray(upper, dtype=float).tolist()
+    
+    return [
+        {
+            'date': day,
+            'predicted_value': value,
+            'lower_bound': low,
+            'upper_bound': high
+        }
+        for day, value, low, high in zip(date_strings, predicted_values, lower_bounds, upper_bounds)
+    ]
+
+def generate_forecast_prophet(model: 'Prophet', last_date: datetime, 
                             days_ahead: int = 30) -> List[Dict[str, Any]]:
     """Generate forecast using Prophet model"""
     try:
@@ -241,23 +573,18 @@ def generate_forecast_prophet(model: Prophet, last_date: datetime,
         # Generate forecast
         forecast = model.predict(future_df)
         
-        # Format results
-        results = []
-        for _, row in forecast.iterrows():
-            results.append({
-                'date': row['ds'].strftime('%Y-%m-%d'),
-                'predicted_value': float(max(0, row['yhat'])),  # Ensure non-negative
-                'lower_bound': float(max(0, row['yhat_lower'])),
-                'upper_bound': float(row['yhat_upper'])
-            })
-        
-        return results
+        return format_forecast_records(
+            pd.DatetimeIndex(forecast['ds']),
+            forecast['yhat'].to_numpy(),
+            forecast['yhat_lower'].to_numpy(),
+            forecast['yhat_upper'].to_numpy()
+        )
         
     except Exception as e:
         logger.error(f"Error generating Prophet forecast: {str(e)}")
         raise
 
-def generate_forecast_linear_regression(model: LinearRegression, scaler: StandardScaler,
+def generate_forecast_linear_regression(model: 'LinearRegression', scaler: 'StandardScaler',
                                       last_date: datetime, last_year: int,
                                       days_ahead: int = 30) -> List[Dict[str, Any]]:
     """Generate forecast using Linear Regression model"""
@@ -272,45 +599,264 @@ def generate_forecast_linear_regression(model: LinearRegression, scaler: Standar
         # Calculate days since start (assuming data started from a reference point)
         base_days = (last_date - pd.Timestamp(f'{last_year-1}-01-01')).days
         
-        # Create features for future dates
-        future_features = []
-        for i, future_date in enumerate(future_dates):
-            features = [
-                base_days + i + 1,  # days_since_start
-                future_date.dayofyear,  # day_of_year
-                future_date.dayofweek,  # day_of_week
-                future_date.month,  # month
-                future_date.year  # year
-            ]
-            future_features.append(features)
-        
-        future_X = np.array(future_features)
+        # Create features for all future dates at once
+        future_X = pd.DataFrame({
+            'days_since_start': np.arange(base_days + 1, base_days + days_ahead + 1),
+            'day_of_year': future_dates.dayofyear,
+            'day_of_week': future_dates.dayofweek,
+            'month': future_dates.month,
+            'year': future_dates.year
+        }, columns=LINEAR_FEATURE_COLUMNS)
         future_X_scaled = scaler.transform(future_X)
         
         # Generate predictions
         predictions = model.predict(future_X_scaled)
         
-        # Format results
-        results = []
-        for i, (future_date, pred) in enumerate(zip(future_dates, predictions)):
-            results.append({
-                'date': future_date.strftime('%Y-%m-%d'),
-                'predicted_value': float(max(0, pred)),  # Ensure non-negative
-                'lower_bound': float(max(0, pred * 0.9)),  # Simple confidence interval
-                'upper_bound': float(pred * 1.1)
-            })
-        
-        return results
+        # Simple confidence interval
+        return format_forecast_records(
+            future_dates, predictions, predictions * 0.9, predictions * 1.1
+        )
         
     except Exception as e:
         logger.error(f"Error generating Linear Regression forecast: {str(e)}")
         raise
 
+def _predict_from_model(model_entry: Dict[str, Any], days_ahead: int) -> List[Dict[str, Any]]:
+    """Predict `days_ahead` days past the training data from a stored model entry"""
+    if model_entry['model_kind'] == 'prophet':
+        return generate_forecast_prophet(
+            model_entry['model'], model_entry['last_date'], days_ahead
+        )
+    return generate_forecast_linear_regression(
+        model_entry['model'], model_entry['scaler'], model_entry['last_date'],
+        model_entry['last_date'].year, days_ahead
+    )
+
+def is_trailing_extension(history: pd.DataFrame, processed_data: pd.DataFrame,
+                          target_column: str) -> bool:
+    """Check whether `processed_data` is `history` with only new trailing days appended"""
+    history_length = len(history)
+    if len(processed_data) <= history_length:
+        return False
+    
+    head = processed_data.iloc[:history_length]
+    return (
+        np.array_equal(head['Date'].values, history['Date'].values)
+        and np.allclose(head[target_column].values, history[target_column].values)
+    )
+
+def is_full_retrain_due(model_entry: Dict[str, Any]) -> bool:
+    """Check whether the scheduled from-scratch retrain interval has elapsed"""
+    age = datetime.now() - model_entry['full_fit_at']
+    return age > timedelta(hours=FULL_RETRAIN_INTERVAL_HOURS)
+
+def fit_forecast_model(processed_data: pd.DataFrame, target_column: str,
+                       horizon: int = DEFAULT_CACHED_HORIZON,
+                       previous_entry: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Train a forecast model and predict its initial horizon
+    
+    Args:
+        processed_data: Preprocessed daily data with Date and target columns
+        target_column: Target column name
+        horizon: Number of days to forecast up front
+        previous_entry: Model entry fitted on a prefix of `processed_data`;
+            when given, Prophet is warm-started from its parameters
+    
+    Returns:
+        Model entry holding the fitted model, its metrics and the forecast
+    """
+    last_date = processed_data['Date'].max()
+    model_entry = {
+        'target_column': target_column,
+        'last_date': last_date,
+        'training_data_points': len(processed_data),
+        'history': processed_data[['Date', target_column]],
+        'scaler': None
+    }
+    
+    init = None
+    if previous_entry and previous_entry['model_kind'] == 'prophet':
+        init = get_prophet_warm_start_params(previous_entry['model'])
+    
+    if is_prophet_available():
+        try:
+            # Try Prophet first; only a warm start counts as incremental
+            fit_mode = 'incremental' if init is not None else 'full'
+            with FORECAST_TRAINING_DURATION.time(model='prophet', mode=fit_mode):
+                model, metrics = train_prophet_model(processed_data, target_column, init=init)
+            model_entry.update(
+                model_kind='prophet', model=model, metrics=metrics, fit_mode=fit_mode,
+                full_fit_at=previous_entry['full_fit_at'] if init is not None else datetime.now()
+            )
+            model_entry['forecast'] = _predict_from_model(model_entry, horizon)
+            model_entry['horizon'] = horizon
+            logger.info(f"Successfully trained Prophet model for {target_column}")
+            return model_entry
+            
+        except Exception as prophet_error:
+            logger.warning(f"Prophet failed: {prophet_error}. Falling back to Linear Regression")
+    
+    # Use Linear Regression directly or as fallback
+    with FORECAST_TRAINING_DURATION.time(model='linear', mode='full'):
+        model, scaler, metrics = train_linear_regression_model(processed_data, target_column)
+    model_entry.update(model_kind='linear', model=model, scaler=scaler, metrics=metrics,
+                       fit_mode='full', full_fit_at=datetime.now())
+    model_entry['forecast'] = _predict_from_model(model_entry, horizon)
+    model_entry['horizon'] = horizon
+    return model_entry
+
+def _fit_model_entry(processed_data: pd.DataFrame, data_hash: str, target_column: str,
+                     days_ahead: int, use_cache: bool) -> Dict[str, Any]:
+    """Fit (or warm-start) a model for one target and cache the entry"""
+    if len(processed_data) == 0:
+        raise ValueError("No data available for forecasting")
+    
+    previous_entry = forecast_cache.get_latest(target_column) if use_cache else None
+    if previous_entry and (
+        is_full_retrain_due(previous_entry)
+        or not is_trailing_extension(previous_entry['history'], processed_data, target_column)
+    ):
+        previous_entry = None
+    
+    model_entry = fit_forecast_model(
+        processed_data, target_column, max(days_ahead, DEFAULT_CACHED_HORIZON),
+        previous_entry=previous_entry
+    )
+    model_entry['generated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    # Cache the fitted model
+    if use_cache:
+        forecast_cache.set(data_hash, target_column, model_entry)
+    
+    return model_entry
+
+# Model entry fields other workers need to serve forecasts; the fitted model
+# and its training history stay in the process that fitted them
+SHARED_ENTRY_FIELDS = [
+    'target_column', 'last_date', 'training_data_points', 'fit_mode', 'full_fit_at',
+    'model_kind', 'metrics', 'forecast', 'horizon', 'generated_at'
+]
+
+def _shared_key(data_hash: str, target_column: str) -> str:
+    return f"{target_column}:{data_hash}"
+
+def _adopt_shared_entry(shared: Optional[Dict[str, Any]], data_hash: str, target_column: str,
+                        days_ahead: int) -> Optional[Dict[str, Any]]:
+    """
+    Cache a model entry fitted by another worker as a local, model-less entry
+    
+    Returns:
+        The local entry, or None if there is no shared entry, its forecast
+        is shorter than `days_ahead` (it cannot be extended without the model),
+        or it is no newer than the local entry (a refresh of a stale entry
+        must not adopt the same stale result again)
+    """
+    if shared is None or shared['horizon'] < days_ahead:
+        return None
+    local_cached_at = forecast_cache.cached_at(data_hash, target_column)
+    if local_cached_at is not None and shared['cached_at'] <= local_cached_at:
+        return None
+    model_entry = {**shared, 'model': None, 'scaler': None, 'history': None}
+    forecast_cache.set(data_hash, target_column, model_entry, timestamp=shared['cached_at'])
+    return model_entry
+
+def _fit_shared_model_entry(processed_data: pd.DataFrame, data_hash: str, target_column: str,
+                            days_ahead: int, use_cache: bool) -> Dict[str, Any]:
+    """
+    Fit a model entry unless another worker fits it first
+    
+    The fit runs under the shared result cache's cross-process lock, so
+    concurrent misses in several workers train the model once; the others
+    adopt the published result.
+    """
+    if not use_cache:
+        return _fit_model_entry(processed_data, data_hash, target_column, days_ahead, False)
+    
+    fitted = {}
+    
+    def compute() -> Dict[str, Any]:
+        fitted['entry'] = _fit_model_entry(processed_data, data_hash, target_column, days_ahead, True)
+        shared = {field: fitted['entry'][field] for field in SHARED_ENTRY_FIELDS}
+        shared['cached_at'] = datetime.now()
+        return shared
+    
+    key = _shared_key(data_hash, target_column)
+    ttl = forecast_cache.max_age_hours * 3600
+    shared = result_cache.get_or_compute('forecast', key, compute, ttl=ttl)
+    if 'entry' in fitted:
+        return fitted['entry']
+    adopted = _adopt_shared_entry(shared, data_hash, target_column, days_ahead)
+    if adopted is not None:
+        return adopted
+    
+    # The shared entry is too short or as stale as ours: fit and publish a new one
+    result_cache.set('forecast', key, compute(), ttl)
+    return fitted['entry']
+
+def _lookup_shared_entry(data_hash: str, target_column: str, days_ahead: int) -> Optional[Dict[str, Any]]:
+    """Model entry already published by another worker, adopted locally"""
+    shared = result_cache.get('forecast', _shared_key(data_hash, target_column))
+    return _adopt_shared_entry(shared, data_hash, target_column, days_ahead)
+
+def _refit_callback(raw_data: pd.DataFrame, data_hash: str,
+                    target_column: str) -> Callable[[], Dict[str, Any]]:
+    """Build the background refresh that refits one target on the data it was cached for"""
+    def refresh() -> Dict[str, Any]:
+        processed_data = preprocess_data_for_forecast(raw_data, target_column)
+        return _fit_shared_model_entry(processed_data, data_hash, target_column, DEFAULT_CACHED_HORIZON, True)
+    return refresh
+
+def _ensure_horizon(model_entry: Dict[str, Any], data_hash: str, days_ahead: int) -> Optional[Dict[str, Any]]:
+    """
+    Model entry whose forecast covers `days_ahead`
+    
+    A cached entry with a shorter horizon is predicted further from its model
+    into a new entry that replaces it in the cache; the shared entry itself is
+    never modified, so concurrent readers always see a consistent one.
+    
+    Returns:
+        The entry covering `days_ahead`, or None when it would need extending
+        but holds no model (adopted from another worker) and must be refitted
+    """
+    if model_entry['horizon'] >= days_ahead:
+        return model_entry
+    if model_entry['model'] is None:
+        return None
+    logger.info(f"Extending cached {model_entry['target_column']} forecast to {days_ahead} days")
+    extended = {**model_entry, 'forecast': _predict_from_model(model_entry, days_ahead), 'horizon': days_ahead}
+    forecast_cache.replace_data(data_hash, model_entry['target_column'], extended)
+    return extended
+
+def _build_forecast_result(model_entry: Dict[str, Any], days_ahead: int) -> Dict[str, Any]:
+    """Slice a model entry's stored forecast into the API response shape"""
+    forecast_results = model_entry['forecast'][:days_ahead]
+    
+    return {
+        'forecast': forecast_results,
+        'metadata': {
+            'target_column': model_entry['target_column'],
+            'model_metrics': model_entry['metrics'],
+            'training_data_points': model_entry['training_data_points'],
+            'forecast_period_days': days_ahead,
+            'last_historical_date': model_entry['last_date'].strftime('%Y-%m-%d'),
+            'forecast_start_date': forecast_results[0]['date'] if forecast_results else None,
+            'forecast_end_date': forecast_results[-1]['date'] if forecast_results else None,
+            'generated_at': model_entry['generated_at']
+        }
+    }
+
 def generate_forecast(target_column: str, days_ahead: int = 30, 
                      use_cache: bool = True) -> Dict[str, Any]:
     """
     Main function to generate forecast for either revenue or occupancy
     
+    A model is trained once per dataset and target. Horizons up to the cached
+    one are slices of the stored forecast; longer horizons are predicted
+    further from the stored model without refitting. When the dataset only
+    gained trailing days since the last fit, the new model is warm-started
+    from the previous one until a full retrain is due.
+    
     Args:
         target_column: 'Revenue_INR' or 'Occupancy_Rate'
         days_ahead: Number of days to forecast
@@ -320,77 +866,106 @@ def generate_forecast(target_column: str, days_ahead: int = 30,
         Dictionary with forecast results and metadata
     """
     try:
-        # Load and preprocess data
-        raw_data = load_data()
-        data_hash = get_data_hash(raw_data)
+        # Data of the current epoch; its fingerprint is the data hash
+        epoch = current_epoch()
+        raw_data, data_hash = epoch.data, epoch.fingerprint
+        
+        model_entry = forecast_cache.get(
+            data_hash, target_column, refresh=_refit_callback(raw_data, data_hash, target_column)
+        ) if use_cache else None
+        if model_entry is not None:
+            model_entry = _ensure_horizon(model_entry, data_hash, days_ahead)
+        if model_entry is None and use_cache:
+            model_entry = _lookup_shared_entry(data_hash, target_column, days_ahead)
+        
+        if model_entry is None:
+            processed_data = preprocess_data_for_forecast(raw_data, target_column)
+            model_entry = _fit_shared_model_entry(processed_data, data_hash, target_column, days_ahead, use_cache)
+        
+        result = _build_forecast_result(model_entry, days_ahead)
+        logger.info("Successfully generated %d-day forecast for %s", days_ahead, target_column,
+                    extra={"event": "forecast_served"})
+        return result
         
-        # Check cache first
+    except Exception as e:
+        logger.error(f"Error generating forecast for {target_column}: {str(e)}")
+        raise ValueError(f"Forecast generation failed: {str(e)}")
+
+def generate_multi_forecast(days_ahead: int = 30, targets: Optional[List[str]] = None,
+                            use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Generate aligned forecasts for several targets in one pass
+    
+    The daily aggregate matrix for every uncached target is built with a
+    single groupby, and the missing models are fitted concurrently.
+    
+    Args:
+        days_ahead: Number of days to forecast
+        targets: Keys of FORECAST_TARGETS to include (all when omitted)
+        use_cache: Whether to use cached results
+    
+    Returns:
+        Dictionary with one forecast result per target and shared metadata
+    """
+    try:
+        epoch = current_epoch()
+        raw_data, data_hash = epoch.data, epoch.fingerprint
+        target_columns = {name: FORECAST_TARGETS[name] for name in (targets or FORECAST_TARGETS)}
+        
+        model_entries = {
+            name: forecast_cache.get(
+                data_hash, column, refresh=_refit_callback(raw_data, data_hash, column)
+            ) if use_cache else None
+            for name, column in target_columns.items()
+        }
         if use_cache:
-            cached_result = forecast_cache.get(data_hash, target_column, days_ahead)
-            if cached_result:
-                return cached_result
-        
-        # Preprocess data
-        processed_data = preprocess_data_for_forecast(raw_data, target_column)
-        
-        if len(processed_data) == 0:
-            raise ValueError("No data available for forecasting")
-        
-        last_date = processed_data['Date'].max()
-        last_year = last_date.year
-        
-        # Choose and train model base
-        forecast_results = None
-        model_metrics = None
-        
-        if PROPHET_AVAILABLE:
-            try:
-                # Try Prophet first
-                model, metrics = train_prophet_model(processed_data, target_column)
-                forecast_results = generate_forecast_prophet(model, last_date, days_ahead)
-                model_metrics = metrics
-                logger.info(f"Successfully generated Prophet forecast for {target_column}")
-                
-            except Exception as prophet_error:
-                logger.warning(f"Prophet failed: {prophet_error}. Falling back to Linear Regression")
-                # Fall back to Linear Regression
-                model, scaler, metrics = train_linear_regression_model(processed_data, target_column)
-                forecast_results = generate_forecast_linear_regression(
-                    model, scaler, last_date, last_year, days_ahead
-                )
-                model_metrics = metrics
-        else:
-            # Use Linear Regression directly
-            model, scaler, metrics = train_linear_regression_model(processed_data, target_column)
-            forecast_results = generate_forecast_linear_regression(
-                model, scaler, last_date, last_year, days_ahead
-            )
-            model_metrics = metrics
-        
-        # Prepare final result
+            for name, entry in model_entries.items():
+                if entry is not None:
+                    entry = _ensure_horizon(entry, data_hash, days_ahead)
+                if entry is None:
+                    entry = _lookup_shared_entry(data_hash, target_columns[name], days_ahead)
+                model_entries[name] = entry
+        missing = [name for name, entry in model_entries.items() if entry is None]
+        
+        if missing:
+            missing_columns = [target_columns[name] for name in missing]
+            daily_data = preprocess_daily_targets(raw_data, missing_columns)
+            
+            with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+                futures = {
+                    name: executor.submit(
+                        _fit_shared_model_entry, daily_data[['Date', target_columns[name]]],
+                        data_hash, target_columns[name], days_ahead, use_cache
+                    )
+                    for name in missing
+                }
+                for name, future in futures.items():
+                    model_entries[name] = future.result()
+        
+        forecasts = {}
+        for name, model_entry in model_entries.items():
+            forecasts[name] = _build_forecast_result(model_entry, days_ahead)
+        
+        first = next(iter(forecasts.values()))['metadata']
         result = {
-            'forecast': forecast_results,
+            'forecasts': forecasts,
             'metadata': {
-                'target_column': target_column,
-                'model_metrics': model_metrics,
-                'training_data_points': len(processed_data),
+                'targets': list(forecasts.keys()),
                 'forecast_period_days': days_ahead,
-                'last_historical_date': last_date.strftime('%Y-%m-%d'),
-                'forecast_start_date': forecast_results[0]['date'] if forecast_results else None,
-                'forecast_end_date': forecast_results[-1]['date'] if forecast_results else None,
+                'last_historical_date': first['last_historical_date'],
+                'forecast_start_date': first['forecast_start_date'],
+                'forecast_end_date': first['forecast_end_date'],
+                'models_trained': sum(model_entries[name]['model'] is not None for name in missing),
                 'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             }
         }
         
-        # Cache the result
-        if use_cache:
-            forecast_cache.set(data_hash, target_column, days_ahead, result)
-        
-        logger.info(f"Successfully generated {days_ahead}-day forecast for {target_column}")
+        logger.info("Successfully generated %d-day forecasts for %s", days_ahead, ', '.join(forecasts),
+                    extra={"event": "multi_forecast_served"})
         return result
         
     except Exception as e:
-        logger.error(f"Error generating forecast for {target_column}: {str(e)}")
+        logger.error(f"Error generating multi-target forecast: {str(e)}")
         raise ValueError(f"Forecast generation failed: {str(e)}")
 
 def get_revenue_forecast(days_ahead: int = 30) -> Dict[str, Any]:
@@ -414,17 +989,29 @@ def validate_forecast_parameters(days_ahead: Optional[int]) -> int:
     
     return days_ahead
 
+def validate_forecast_targets(targets: Optional[str]) -> List[str]:
+    """Validate and normalize a comma-separated list of forecast targets"""
+    if not targets:
+        return list(FORECAST_TARGETS)
+    
+    names = [name.strip().lower() for name in targets.split(',') if name.strip()]
+    unknown = [name for name in names if name not in FORECAST_TARGETS]
+    if unknown:
+        raise ValueError(
+            f"Unknown forecast targets: {', '.join(unknown)}. "
+            f"Available: {', '.join(FORECAST_TARGETS)}"
+        )
+    
+    # Preserve request order, drop duplicates
+    return list(dict.fromkeys(names))
+
 def clear_forecast_cache():
-    """Clear all cached forecasts (for testing or manual refresh)"""
-    global forecast_cache
-    forecast_cache.cache.clear()
+    """Clear all cached forecasts, including those shared with other workers"""
+    forecast_cache.clear()
+    result_cache.clear('forecast')
     logger.info("Forecast cache cleared")
 
 # For debugging and monitoring
 def get_cache_status() -> Dict[str, Any]:
     """Get current cache status"""
-    return {
-        'cached_entries': len(forecast_cache.cache),
-        'cache_keys': list(forecast_cache.cache.keys()),
-        'max_age_hours': forecast_cache.max_age_hours
-    }
\ No newline at end of file
+    return forecast_cache.status()
\ No newline at end of file
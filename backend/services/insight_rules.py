@@ -0,0 +1,244 @@
+"""
+Declarative insight rules evaluated against the shared insight aggregates.
+
+A rule names a metric, a dimension, a comparison and a threshold, plus a
+message template. Rules are evaluated in bulk: each (dimension, metric)
+series is derived once from the precomputed aggregates and every rule that
+uses it is a vectorized comparison, so no rule scans the full table.
+
+Rules live in a JSON file and are reloaded automatically when it changes:
+
+    {"rules": [{
+        "id": "high_channel_cancellations",
+        "metric": "cancellation_rate",
+        "dimension": "Booking_Channel",
+        "comparison": ">",
+        "threshold": 30,
+        "message": "{group} cancellation rate is {value:.1f}%, above the {threshold:.0f}% target."
+    }]}
+
+Optional rule keys: "groups" (only these group labels), "enabled" (default true).
+The bundled rules file only holds disabled examples, so by default the
+insights are exactly those of the built-in analyzers.
+"""
+
+import hashlib
+import json
+import logging
+import operator
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from utils.data_loader import format_year_month
+from utils.metrics import compute_metric
+
+logger = logging.getLogger(__name__)
+
+RULES_PATH = "data/insight_rules.json"
+
+COMPARISONS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+# Rule metrics derived from the additive aggregate components; rates are percentages
+RULE_METRICS = {
+    'revenue': lambda agg: agg['revenue'],
+    'revenue_share': lambda agg: agg['revenue'] / agg['revenue'].sum() * 100,
+    'avg_daily_revenue': lambda agg: compute_metric(agg, 'avg_daily_revenue'),
+    'rooms_sold': lambda agg: agg['rooms_sold'],
+    'cancellations': lambda agg: agg['cancellations'],
+    'cancellation_rate': lambda agg: compute_metric(agg, 'cancellation_rate') * 100,
+    'adr': lambda agg: compute_metric(agg, 'adr'),
+    'revpar': lambda agg: compute_metric(agg, 'revpar'),
+    'occupancy': lambda agg: compute_metric(agg, 'occupancy') * 100,
+}
+
+# Dimensions a rule may group by; 'overall' evaluates the whole selection
+RULE_DIMENSIONS = ['overall', 'Booking_Channel', 'Market_Segment', 'Month', 'Year_Month', 'Day_Of_Week']
+
+_MONTH_NAMES = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+                'August', 'September', 'October', 'November', 'December']
+_DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+_GROUP_LABELS = {
+    'overall': lambda key: 'All',
+    'Month': lambda key: _MONTH_NAMES[int(key) - 1],
+    'Year_Month': format_year_month,
+    'Day_Of_Week': lambda key: _DAY_NAMES[int(key)],
+}
+
+def validate_rule(rule: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate one rule definition and fill in defaults
+
+    Raises:
+        ValueError: If the rule is missing fields or references unknown names
+    """
+    missing = [key for key in ('id', 'metric', 'dimension', 'comparison', 'threshold', 'message')
+               if key not in rule]
+    if missing:
+        raise ValueError(f"Rule {rule.get('id', '?')} is missing: {', '.join(missing)}")
+    if rule['metric'] not in RULE_METRICS:
+        raise ValueError(f"Rule {rule['id']}: unknown metric '{rule['metric']}'. "
+                         f"Available: {', '.join(RULE_METRICS)}")
+    if rule['dimension'] not in RULE_DIMENSIONS:
+        raise ValueError(f"Rule {rule['id']}: unknown dimension '{rule['dimension']}'. "
+                         f"Available: {', '.join(RULE_DIMENSIONS)}")
+    if rule['comparison'] not in COMPARISONS:
+        raise ValueError(f"Rule {rule['id']}: unknown comparison '{rule['comparison']}'. "
+                         f"Available: {', '.join(COMPARISONS)}")
+    try:
+        threshold = float(rule['threshold'])
+    except (TypeError, ValueError):
+        raise ValueError(f"Rule {rule['id']}: threshold must be a number")
+
+    # Render once against dummy values so template typos fail at load time
+    try:
+        rule['message'].format(group='x', value=0.0, threshold=0.0,
+                               metric=rule['metric'], dimension=rule['dimension'])
+    except (KeyError, IndexError, ValueError) as e:
+        raise ValueError(f"Rule {rule['id']}: invalid message template ({e})")
+
+    groups = rule.get('groups')
+    return {
+        **rule,
+        'threshold': threshold,
+        'groups': [str(group) for group in groups] if groups else None,
+        'enabled': bool(rule.get('enabled', True)),
+    }
+
+def _group_labels(dimension: str, index: pd.Index) -> List[str]:
+    """Human-readable labels for a dimension's group keys"""
+    label = _GROUP_LABELS.get(dimension, str)
+    return [label(key) for key in index]
+
+def evaluate_rules(rules: List[Dict[str, Any]], aggregates: Dict[str, Any]) -> List[str]:
+    """
+    Evaluate validated rules against build_aggregates output
+
+    Args:
+        rules: Rules as returned by validate_rule
+        aggregates: Shared insight aggregates for the current selection
+
+    Returns:
+        One message per (rule, matching group), in rule order
+    """
+    series_cache: Dict[tuple, Any] = {}
+    insights = []
+
+    for rule in rules:
+        if not rule['enabled']:
+            continue
+
+        key = (rule['dimension'], rule['metric'])
+        if key not in series_cache:
+            table = aggregates[rule['dimension']]
+            if rule['dimension'] == 'overall':
+                table = table.to_frame().T
+            values = RULE_METRICS[rule['metric']](table)
+            series_cache[key] = (values.to_numpy(dtype=float), _group_labels(rule['dimension'], table.index))
+        values, labels = series_cache[key]
+
+        matches = COMPARISONS[rule['comparison']](values, rule['threshold'])
+        for position in matches.nonzero()[0]:
+            if rule['groups'] and labels[position] not in rule['groups']:
+                continue
+            insights.append(rule['message'].format(
+                group=labels[position],
+                value=values[position],
+                threshold=rule['threshold'],
+                metric=rule['metric'],
+                dimension=rule['dimension'],
+            ))
+
+    return insights
+
+class RuleSet:
+    """Insight rules loaded from a JSON file, reloaded when the file changes"""
+
+    def __init__(self, path: str = RULES_PATH):
+        self.path = path
+        self.rules: List[Dict[str, Any]] = []
+        self.version = 0
+        self.digest = ""
+        self.errors: List[str] = []
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _current_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def refresh(self) -> bool:
+        """
+        Reload the rules if the file changed since the last load
+
+        A file that fails to parse or validate is reported in `errors` and
+        the previously loaded rules stay active.
+
+        Returns:
+            True if a new rule set was loaded
+        """
+        mtime = self._current_mtime()
+        if mtime == self._mtime:
+            return False
+
+        with self._lock:
+            if mtime == self._mtime:
+                return False
+            self._mtime = mtime
+
+            if mtime is None:
+                rules, errors = [], []
+            else:
+                try:
+                    with open(self.path, encoding='utf-8') as f:
+                        raw = json.load(f)
+                    rules, errors = [], []
+                    for rule in raw.get('rules', []):
+                        try:
+                            rules.append(validate_rule(rule))
+                        except ValueError as e:
+                            errors.append(str(e))
+                except (OSError, ValueError, AttributeError) as e:
+                    logger.error(f"Failed to load insight rules from {self.path}: {str(e)}")
+                    self.errors = [f"Failed to load {self.path}: {str(e)}"]
+                    return False
+
+            for error in errors:
+                logger.warning(f"Skipping insight rule: {error}")
+            self.rules = rules
+            self.errors = errors
+            self.version += 1
+            # Same rules give the same digest in every process, unlike version
+            self.digest = hashlib.sha1(json.dumps(rules, sort_keys=True, default=str).encode()).hexdigest()[:16]
+            logger.info(f"Loaded {len(rules)} insight rules from {self.path} (version {self.version})")
+            return True
+
+    def evaluate(self, aggregates: Dict[str, Any]) -> List[str]:
+        """Evaluate the current rules against a set of aggregates"""
+        return evaluate_rules(self.rules, aggregates)
+
+    def status(self) -> Dict[str, Any]:
+        """Snapshot of the loaded rules"""
+        self.refresh()
+        return {
+            'path': self.path,
+            'version': self.version,
+            'digest': self.digest,
+            'rules': len(self.rules),
+            'enabled_rules': sum(rule['enabled'] for rule in self.rules),
+            'errors': self.errors,
+        }
+
+rule_set = RuleSet()
@@ -6,79 +6,183 @@ Generates automated insights using pandas aggregation and statistical analysis
 import pandas as pd
 import numpy as np
 import logging
+import threading
+import time
 from datetime import datetime
-from typing import List, Dict, Any
-from utils.data_loader import load_data
+from typing import List, Dict, Any, Optional, Tuple, Callable
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from utils.data_loader import format_year_month, apply_filters, normalize_filters
+from utils.dataset_epoch import DatasetEpoch, current_epoch, dataset_epochs
+from utils.memory import estimate_size, memory_budget
+from utils.metrics import metric_components, compute_metric
+from utils.result_cache import result_cache
+from services.anomaly_service import (
+    DEFAULT_LOOKBACK_DAYS, DEFAULT_WINDOW_DAYS, daily_components, describe_anomaly, score_anomalies
+)
+from services.insight_rules import rule_set
 
 logger = logging.getLogger(__name__)
 
+# Dimensions every analyzer reads from, grouped once per dataset version
+AGGREGATE_DIMENSIONS = ['Booking_Channel', 'Market_Segment', 'Month', 'Year_Month', 'Day_Of_Week']
+
+# Per-analyzer time budget unless one is given at registration
+DEFAULT_ANALYZER_BUDGET_SECONDS = 2.0
+
+# Longest an analyzer may wait for a free pool thread before it is skipped;
+# its time budget only starts once it runs
+ANALYZER_QUEUE_TIMEOUT_SECONDS = 10.0
+
+# Registered analyzers in output order: name -> {'func', 'budget_seconds'}
+ANALYZERS: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+_analyzer_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='insight-analyzer')
+
+def register_analyzer(name: str, func: Callable[['InsightService'], List[str]],
+                      budget_seconds: float = DEFAULT_ANALYZER_BUDGET_SECONDS):
+    """
+    Register an insight analyzer
+    
+    Args:
+        name: Unique analyzer name, reported in the response metadata
+        func: Callable taking an InsightService and returning insight strings
+        budget_seconds: Time after which the analyzer's result is skipped
+    """
+    ANALYZERS[name] = {'func': func, 'budget_seconds': budget_seconds}
+
+def analyzer(name: str, budget_seconds: float = DEFAULT_ANALYZER_BUDGET_SECONDS):
+    """Decorator form of register_analyzer for InsightService methods"""
+    def decorator(func):
+        register_analyzer(name, func, budget_seconds)
+        return func
+    return decorator
+
+def build_aggregates(data: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Compute the shared grouped aggregates used by all insight analyzers
+    
+    Each dimension gets one groupby over the additive metric components
+    (see utils.metrics), so KPIs are derived with compute_metric without
+    touching the full table again. 'daily' holds the per hotel-day
+    components of the anomaly scan window, so the anomalies analyzer only
+    scores a hotels × days matrix whatever the number of rows.
+    
+    Returns:
+        Dict with one DataFrame per dimension, 'daily' and an 'overall' Series
+    """
+    components = metric_components(data)
+    
+    aggregates = {
+        dimension: components.groupby(data[dimension], observed=True, sort=True).sum()
+        for dimension in AGGREGATE_DIMENSIONS
+    }
+    
+    overall = components.sum()
+    overall['occupancy_min'] = data['Occupancy_Rate'].min()
+    overall['occupancy_max'] = data['Occupancy_Rate'].max()
+    aggregates['overall'] = overall
+    aggregates['daily'] = daily_components(data, days=DEFAULT_WINDOW_DAYS + DEFAULT_LOOKBACK_DAYS)
+    return aggregates
+
 class InsightService:
     """Service for generating automated business insights"""
     
-    def __init__(self):
-        self.data = None
-        self._load_data()
+    def __init__(self, data: Optional[pd.DataFrame] = None):
+        self.data = current_epoch().data if data is None else data
+        self._aggregates = None
+        self._aggregates_lock = threading.Lock()
     
-    def _load_data(self):
-        """Load and cache hotel data"""
-        try:
-            self.data = load_data()
-            logger.info(f"Loaded {len(self.data)} records for insights analysis")
-        except Exception as e:
-            logger.error(f"Error loading data for insights: {str(e)}")
-            raise
+    @property
+    def aggregates(self) -> Dict[str, Any]:
+        """Shared grouped aggregates for the current data, built on first use"""
+        if self._aggregates is None:
+            with self._aggregates_lock:
+                if self._aggregates is None:
+                    self._aggregates = build_aggregates(self.data)
+        return self._aggregates
     
     def generate_all_insights(self) -> List[str]:
         """Generate comprehensive business insights"""
-        insights = []
+        return self.run_analyzers()[0]
+    
+    def run_analyzers(self) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """
+        Run every registered analyzer concurrently within its time budget
         
+        Returns:
+            Tuple of (insights in registration order, per-analyzer run info)
+        """
         try:
-            # 1. Booking channel with highest cancellation rate
-            insights.extend(self._analyze_cancellation_rates())
-            
-            # 2. Market segment revenue contribution
-            insights.extend(self._analyze_market_segments())
-            
-            # 3. Monthly revenue patterns
-            insights.extend(self._analyze_monthly_revenue())
-            
-            # 4. Channel ADR analysis
-            insights.extend(self._analyze_channel_adr())
-            
-            # 5. Revenue growth analysis
-            insights.extend(self._analyze_revenue_growth())
-            
-            # 6. Occupancy performance insights
-            insights.extend(self._analyze_occupancy_performance())
-            
-            # 7. RevPAR insights
-            insights.extend(self._analyze_revpar_performance())
-            
-            # 8. Seasonal trends
-            insights.extend(self._analyze_seasonal_trends())
-            
-            logger.info(f"Generated {len(insights)} business insights")
-            return insights
+            # Build the shared aggregates once, before the analyzers race for them
+            aggregates_cached = self._aggregates is not None
+            _ = self.aggregates
+            
+            submitted = time.perf_counter()
+            clocks = {name: _StartClock() for name in ANALYZERS}
+            futures = {
+                name: _analyzer_pool.submit(_timed_call, spec['func'], self, clocks[name])
+                for name, spec in ANALYZERS.items()
+            }
+            queue_deadline = submitted + ANALYZER_QUEUE_TIMEOUT_SECONDS
+            
+            insights, runs = [], []
+            for name, future in futures.items():
+                budget = ANALYZERS[name]['budget_seconds']
+                clock = clocks[name]
+                run = {
+                    'name': name,
+                    'budget_ms': round(budget * 1000, 1),
+                    'aggregates_cached': aggregates_cached,
+                    'cache': 'miss'
+                }
+                # The pool is shared by concurrent requests, so an analyzer may
+                # queue; its budget starts when a thread picks it up
+                if not clock.wait(max(queue_deadline - time.perf_counter(), 0)) and future.cancel():
+                    logger.warning(f"Insight analyzer {name} found no free thread within "
+                                   f"{ANALYZER_QUEUE_TIMEOUT_SECONDS:.0f}s, skipped")
+                    run.update(status='skipped', duration_ms=None, insights=0,
+                               queued_ms=round((time.perf_counter() - submitted) * 1000, 2))
+                    runs.append(run)
+                    continue
+                
+                # Not cancellable means it is running and marks its clock right away
+                clock.wait(None)
+                run['queued_ms'] = round((clock.started_at - submitted) * 1000, 2)
+                remaining = budget - (time.perf_counter() - clock.started_at)
+                try:
+                    result, duration = future.result(timeout=max(remaining, 0))
+                    run.update(status='ok', duration_ms=round(duration * 1000, 2), insights=len(result))
+                    insights.extend(result)
+                except FutureTimeoutError:
+                    # A running analyzer cannot be cancelled; it finishes in the background
+                    logger.warning(f"Insight analyzer {name} exceeded its {budget:.1f}s budget, skipped")
+                    run.update(status='skipped', duration_ms=round(budget * 1000, 2), insights=0)
+                except Exception as e:
+                    logger.error(f"Insight analyzer {name} failed: {str(e)}")
+                    run.update(status='error', duration_ms=None, insights=0)
+                runs.append(run)
+            
+            logger.info("Generated %d business insights", len(insights), extra={"event": "insights_generated"})
+            return insights, runs
             
         except Exception as e:
             logger.error(f"Error generating insights: {str(e)}")
-            return [f"Unable to generate insights: {str(e)}"]
+            return [f"Unable to generate insights: {str(e)}"], []
     
+    @analyzer('cancellation_rates')
     def _analyze_cancellation_rates(self) -> List[str]:
         """Analyze cancellation rates by booking channel"""
         insights = []
         
         try:
-            # Calculate total bookings and cancellations by channel
-            channel_stats = self.data.groupby('Booking_Channel').agg({
-                'Rooms_Sold': 'sum',
-                'Cancellation_Count': 'sum'
-            }).reset_index()
+            # Total bookings and cancellations by channel
+            channel_aggregates = self.aggregates['Booking_Channel']
+            channel_stats = channel_aggregates[['rooms_sold', 'cancellations']].reset_index()
             
             # Calculate cancellation rates
-            channel_stats['total_bookings'] = channel_stats['Rooms_Sold'] + channel_stats['Cancellation_Count']
             channel_stats['cancellation_rate'] = (
-                channel_stats['Cancellation_Count'] / channel_stats['total_bookings'] * 100
+                compute_metric(channel_aggregates, 'cancellation_rate').to_numpy() * 100
             ).round(2)
             
             # Find highest and lowest cancellation rates
@@ -109,13 +213,14 @@ class InsightService:
             
         return insights
     
+    @analyzer('market_segments')
     def _analyze_market_segments(self) -> List[str]:
         """Analyze revenue contribution by market segment"""
         insights = []
         
         try:
-            # Calculate revenue by market segment
-            segment_revenue = self.data.groupby('Market_Segment')['Revenue_INR'].sum().sort_values(ascending=False)
+            # Revenue by market segment
+            segment_revenue = self.aggregates['Market_Segment']['revenue'].sort_values(ascending=False)
             total_revenue = segment_revenue.sum()
             
             # Calculate percentages
@@ -155,14 +260,14 @@ class InsightService:
             
         return insights
     
+    @analyzer('monthly_revenue')
     def _analyze_monthly_revenue(self) -> List[str]:
         """Analyze monthly revenue patterns"""
         insights = []
         
         try:
-            # Extract month from date and calculate monthly revenue
-            self.data['Month'] = pd.to_datetime(self.data['Date']).dt.month
-            monthly_revenue = self.data.groupby('Month')['Revenue_INR'].sum()
+            # Monthly revenue
+            monthly_revenue = self.aggregates['Month']['revenue']
             
             # Find highest and lowest revenue months
             highest_month = monthly_revenue.idxmax()
@@ -209,15 +314,15 @@ class InsightService:
             
         return insights
     
+    @analyzer('channel_adr')
     def _analyze_channel_adr(self) -> List[str]:
         """Analyze Average Daily Rate by booking channel"""
         insights = []
         
         try:
-            # Calculate weighted average ADR by channel
-            channel_adr = self.data.groupby('Booking_Channel').apply(
-                lambda x: (x['ADR_INR'] * x['Rooms_Sold']).sum() / x['Rooms_Sold'].sum()
-            ).round(2)
+            # Rooms-weighted average ADR by channel
+            channel_stats = self.aggregates['Booking_Channel']
+            channel_adr = compute_metric(channel_stats, 'adr').round(2)
             
             # Find highest and lowest ADR channels
             highest_adr_channel = channel_adr.idxmax()
@@ -233,7 +338,8 @@ class InsightService:
             )
             
             # Compare with overall average
-            overall_adr = (self.data['ADR_INR'] * self.data['Rooms_Sold']).sum() / self.data['Rooms_Sold'].sum()
+            overall = self.aggregates['overall']
+            overall_adr = compute_metric(overall, 'adr')
             
             above_avg_channels = channel_adr[channel_adr > overall_adr]
             if len(above_avg_channels) > 0:
@@ -247,14 +353,15 @@ class InsightService:
             
         return insights
     
+    @analyzer('revenue_growth')
     def _analyze_revenue_growth(self) -> List[str]:
         """Analyze month-over-month revenue growth"""
         insights = []
         
         try:
-            # Create year-month column and calculate monthly totals
-            self.data['YearMonth'] = pd.to_datetime(self.data['Date']).dt.to_period('M')
-            monthly_totals = self.data.groupby('YearMonth')['Revenue_INR'].sum().sort_index()
+            # Monthly totals by year-month ordinal
+            monthly_totals = self.aggregates['Year_Month']['revenue'].copy()
+            monthly_totals.index = monthly_totals.index.map(format_year_month)
             
             if len(monthly_totals) < 2:
                 return ["Insufficient data for revenue growth analysis."]
@@ -289,14 +396,16 @@ class InsightService:
             
         return insights
     
+    @analyzer('occupancy_performance')
     def _analyze_occupancy_performance(self) -> List[str]:
         """Analyze occupancy rate patterns"""
         insights = []
         
         try:
-            avg_occupancy = self.data['Occupancy_Rate'].mean() * 100
-            max_occupancy = self.data['Occupancy_Rate'].max() * 100
-            min_occupancy = self.data['Occupancy_Rate'].min() * 100
+            overall = self.aggregates['overall']
+            avg_occupancy = compute_metric(overall, 'occupancy') * 100
+            max_occupancy = overall['occupancy_max'] * 100
+            min_occupancy = overall['occupancy_min'] * 100
             
             insights.append(
                 f"Average occupancy rate is {avg_occupancy:.1f}% with a range from "
@@ -304,7 +413,8 @@ class InsightService:
             )
             
             # Occupancy by market segment
-            segment_occupancy = self.data.groupby('Market_Segment')['Occupancy_Rate'].mean() * 100
+            segment_stats = self.aggregates['Market_Segment']
+            segment_occupancy = compute_metric(segment_stats, 'occupancy') * 100
             highest_occ_segment = segment_occupancy.idxmax()
             lowest_occ_segment = segment_occupancy.idxmin()
             
@@ -318,15 +428,18 @@ class InsightService:
             
         return insights
     
+    @analyzer('revpar_performance')
     def _analyze_revpar_performance(self) -> List[str]:
         """Analyze Revenue Per Available Room patterns"""
         insights = []
         
         try:
-            avg_revpar = self.data['RevPAR_INR'].mean()
+            overall = self.aggregates['overall']
+            avg_revpar = compute_metric(overall, 'revpar')
             
             # RevPAR by channel
-            channel_revpar = self.data.groupby('Booking_Channel')['RevPAR_INR'].mean().round(2)
+            channel_stats = self.aggregates['Booking_Channel']
+            channel_revpar = compute_metric(channel_stats, 'revpar').round(2)
             top_revpar_channel = channel_revpar.idxmax()
             
             insights.append(
@@ -339,20 +452,18 @@ class InsightService:
             
         return insights
     
+    @analyzer('seasonal_trends')
     def _analyze_seasonal_trends(self) -> List[str]:
         """Analyze seasonal booking and revenue trends"""
         insights = []
         
         try:
-            # Day of week analysis
-            self.data['DayOfWeek'] = pd.to_datetime(self.data['Date']).dt.day_name()
-            
-            dow_revenue = self.data.groupby('DayOfWeek')['Revenue_INR'].mean()
-            dow_occupancy = self.data.groupby('DayOfWeek')['Occupancy_Rate'].mean() * 100
-            
-            # Define weekday order
+            # Day of week analysis (Day_Of_Week is Monday=0 … Sunday=6)
             day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-            dow_revenue = dow_revenue.reindex([d for d in day_order if d in dow_revenue.index])
+            
+            dow_stats = self.aggregates['Day_Of_Week']
+            dow_revenue = compute_metric(dow_stats, 'avg_daily_revenue')
+            dow_revenue.index = [day_order[day] for day in dow_revenue.index]
             
             best_revenue_day = dow_revenue.idxmax()
             worst_revenue_day = dow_revenue.idxmin()
@@ -381,13 +492,250 @@ class InsightService:
             
         return insights
 
-# Global instance
-insight_service = InsightService()
+    @analyzer('anomalies')
+    def _analyze_anomalies(self) -> List[str]:
+        """Flag the strongest recent per-hotel anomalies across key metrics"""
+        insights = []
+        
+        try:
+            for anomaly in score_anomalies(self.aggregates['daily'], top_n=3):
+                insights.append(describe_anomaly(anomaly))
+            
+        except Exception as e:
+            logger.error(f"Error analyzing anomalies: {str(e)}")
+            
+        return insights
+
+    @analyzer('custom_rules')
+    def _analyze_custom_rules(self) -> List[str]:
+        """Evaluate the declarative rules from the rules file"""
+        insights = []
+        
+        try:
+            insights = rule_set.evaluate(self.aggregates)
+            
+        except Exception as e:
+            logger.error(f"Error evaluating insight rules: {str(e)}")
+            
+        return insights
+
+class _StartClock:
+    """When a submitted analyzer actually started running on a pool thread"""
+    
+    def __init__(self):
+        self.started_at: Optional[float] = None
+        self._started = threading.Event()
+    
+    def mark(self):
+        self.started_at = time.perf_counter()
+        self._started.set()
+    
+    def wait(self, timeout: Optional[float]) -> bool:
+        """Wait for the analyzer to start, returning whether it has"""
+        return self._started.wait(timeout)
+
+def _timed_call(func: Callable[['InsightService'], List[str]],
+                service: 'InsightService', clock: _StartClock) -> Tuple[List[str], float]:
+    """Run one analyzer, returning its insights and wall time in seconds"""
+    clock.mark()
+    result = func(service)
+    return result, time.perf_counter() - clock.started_at
+
+class InsightCache:
+    """Thread-safe LRU cache of insight reports keyed by dataset version and filters"""
+    
+    def __init__(self, max_entries: int = 256):
+        self.cache = OrderedDict()
+        self.max_entries = max_entries
+        self.sizes: Dict[Tuple, int] = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """Get a cached report, marking it most recently used"""
+        with self._lock:
+            report = self.cache.get(key)
+            if report is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return report
+    
+    def set(self, key: Tuple, report: Dict[str, Any]):
+        """Cache a report, evicting the least recently used beyond max_entries"""
+        size = estimate_size(report)
+        with self._lock:
+            self.total_bytes += size - self.sizes.get(key, 0)
+            self.sizes[key] = size
+            self.cache[key] = report
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.max_entries:
+                self._pop_oldest()
+        memory_budget.check()
+    
+    def _pop_oldest(self) -> int:
+        """Drop the least recently used report, returning its size (lock must be held)"""
+        oldest, _ = self.cache.popitem(last=False)
+        size = self.sizes.pop(oldest)
+        self.total_bytes -= size
+        self.evictions += 1
+        return size
+    
+    def evict_lru(self) -> int:
+        """Evict the least recently used report, returning its size in bytes (0 if empty)"""
+        with self._lock:
+            return self._pop_oldest() if self.cache else 0
+    
+    def clear(self):
+        """Drop all cached reports"""
+        with self._lock:
+            self.cache.clear()
+            self.sizes.clear()
+            self.total_bytes = 0
+    
+    def status(self) -> Dict[str, Any]:
+        """Snapshot of cache counters"""
+        with self._lock:
+            return {
+                'cached_entries': len(self.cache),
+                'max_entries': self.max_entries,
+                'total_bytes': self.total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
 
-def get_insights() -> List[str]:
+insight_cache = InsightCache()
+
+# Reports are cheap to recompute from the shared aggregates, so they go first
+memory_budget.register('insights', insight_cache.evict_lru, priority=10)
+
+def _build_epoch_service(data: pd.DataFrame) -> InsightService:
+    """InsightService of a new dataset epoch, with its aggregates built before the swap"""
+    service = InsightService(data)
+    service.aggregates
+    logger.info(f"Built insight aggregates for {len(data)} records")
+    return service
+
+def _on_epoch_swap(epoch: DatasetEpoch):
+    """Reports are keyed by epoch number, so the old epoch's are unreachable now"""
+    insight_cache.clear()
+
+dataset_epochs.register('insights', build=_build_epoch_service, on_swap=_on_epoch_swap)
+
+def get_insight_service(epoch: Optional[DatasetEpoch] = None) -> InsightService:
+    """Get the InsightService of an epoch (the current one by default), loading data on first use"""
+    return (epoch or current_epoch()).derive('insights', _build_epoch_service)
+
+def dataset_version() -> int:
+    """Number of the current dataset epoch (0 before the first load)"""
+    epoch = dataset_epochs.peek()
+    return epoch.number if epoch is not None else 0
+
+def _data_period(data: pd.DataFrame) -> Optional[str]:
+    """Date span of a selection as 'YYYY-MM-DD to YYYY-MM-DD'"""
+    if data is None or data.empty:
+        return None
+    min_date = data['Date'].min().strftime('%Y-%m-%d')
+    max_date = data['Date'].max().strftime('%Y-%m-%d')
+    return f"{min_date} to {max_date}"
+
+def get_insight_report(filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Get insights and the analysed data period for an optional filter set
+    
+    Reports are cached by dataset epoch, rules version and normalized
+    filters, so each distinct dashboard view is computed once per dataset
+    epoch and recomputed when the rules file changes. Behind the in-process
+    cache, the shared result cache (keyed by dataset and rules content) lets
+    one worker compute a report for all of them. Incomplete reports (an
+    analyzer skipped or failed) are cached nowhere, so a momentary overload
+    does not pin a partial report until the dataset changes.
+    """
+    epoch = current_epoch()
+    service = get_insight_service(epoch)
+    data = service.data
+    rule_set.refresh()
+    normalized = normalize_filters(filters)
+    key = (epoch.number, rule_set.version, normalized)
+    
+    report = insight_cache.get(key)
+    if report is not None:
+        return _as_cache_hit(report)
+    
+    computed = False
+    
+    def compute() -> Dict[str, Any]:
+        nonlocal computed
+        computed = True
+        return _build_report(service, data, filters)
+    
+    report = result_cache.get_or_compute(
+        'insights', f"{epoch.fingerprint}:{rule_set.digest}:{normalized!r}", compute,
+        cacheable=_is_complete
+    )
+    if _is_complete(report):
+        insight_cache.set(key, report)
+    return report if computed else _as_cache_hit(report, 'shared')
+
+def _is_complete(report: Dict[str, Any]) -> bool:
+    """Whether every analyzer of a report ran to completion"""
+    return report['metadata'].get('complete', True)
+
+def _build_report(service: 'InsightService', data: pd.DataFrame,
+                  filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Run the analyzers over the (filtered) dataset"""
+    if filters:
+        data = apply_filters(data, filters)
+        analyzer = InsightService(data)
+    else:
+        analyzer = service
+    
+    started = time.perf_counter()
+    if data.empty:
+        insights, runs = ["No data available for the selected filters."], []
+        complete = True
+    else:
+        insights, runs = analyzer.run_analyzers()
+        # No runs at all means run_analyzers itself failed
+        complete = bool(runs) and all(run['status'] == 'ok' for run in runs)
+    
+    return {
+        'insights': insights,
+        'data_period': _data_period(data),
+        'metadata': {
+            'cache': 'miss',
+            'total_ms': round((time.perf_counter() - started) * 1000, 2),
+            'analyzers': runs,
+            'complete': complete
+        }
+    }
+
+def _as_cache_hit(report: Dict[str, Any], source: str = 'hit') -> Dict[str, Any]:
+    """Copy of a cached report with its metadata marked as served from cache"""
+    metadata = report['metadata']
+    return {
+        **report,
+        'metadata': {
+            **metadata,
+            'cache': source,
+            'analyzers': [{**run, 'cache': source} for run in metadata['analyzers']]
+        }
+    }
+
+def get_insights(filters: Optional[Dict[str, Any]] = None) -> List[str]:
     """Get all business insights"""
-    return insight_service.generate_all_insights()
+    return get_insight_report(filters)['insights']
 
-def refresh_insights():
-    """Refresh insights data (useful after data updates)"""
-    insight_service._load_data()
\ No newline at end of file
+def refresh_insights(wait: bool = True) -> Dict[str, Any]:
+    """
+    Refresh the dataset (and with it the insights) after data updates
+    
+    Args:
+        wait: Block until the new epoch is built and swapped in
+    """
+    return dataset_epochs.refresh(wait=wait)
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""
+Memory accounting for the loaded datasets, derived structures and caches
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from services import forecast_service, insight_service
+from utils.dataset_epoch import dataset_epochs
+from utils.memory import (
+    estimate_size, frame_memory, memory_budget, peak_rss_bytes, process_rss_bytes
+)
+from utils.result_cache import result_cache
+from utils.shared_dataset import is_shared
+
+logger = logging.getLogger(__name__)
+
+
+def get_memory_report(enforce: bool = False) -> Dict[str, Any]:
+    """
+    Deep memory usage of every dataset and cache, and of the whole process
+
+    Args:
+        enforce: Run the memory budget check first (evicting caches if over)
+
+    Returns:
+        Per-dataset column and category dictionary sizes (and whether the
+        columns are mapped from the shared dataset files), per-cache entry
+        counts and bytes, process RSS and the memory budget status. The
+        shared result cache lives in a file outside the process, so its
+        bytes are reported but not counted against RSS.
+    """
+    try:
+        enforcement: Optional[Dict[str, Any]] = memory_budget.check(force=True) if enforce else None
+
+        # Only the current epoch; never load data for a report
+        epoch = dataset_epochs.peek()
+        datasets = {}
+        service = None
+        if epoch is not None:
+            datasets['current'] = {
+                'epoch': epoch.number, **frame_memory(epoch.data), 'shared': is_shared(epoch.data)
+            }
+            service = epoch.derived.get('insights')
+        aggregates = service._aggregates if service is not None else None
+        forecast = forecast_service.forecast_cache
+        insights = insight_service.insight_cache
+        caches = {
+            'forecast': {
+                'entries': len(forecast.cache),
+                'max_entries': forecast.max_entries,
+                'bytes': forecast.total_bytes,
+                'max_bytes': forecast.max_memory_bytes,
+            },
+            'insights': {
+                'entries': len(insights.cache),
+                'max_entries': insights.max_entries,
+                'bytes': insights.total_bytes,
+            },
+            'insight_aggregates': {
+                'entries': 0 if aggregates is None else len(aggregates),
+                'bytes': 0 if aggregates is None else estimate_size(aggregates),
+            },
+            'results': _result_cache_usage(),
+        }
+
+        dataset_bytes = sum(entry.get('total_bytes', 0) for entry in datasets.values())
+        cache_bytes = sum(entry['bytes'] for entry in caches.values() if not entry.get('shared'))
+        rss = process_rss_bytes()
+        return {
+            'process': {
+                'rss_bytes': rss,
+                'peak_rss_bytes': peak_rss_bytes(),
+                'accounted_bytes': dataset_bytes + cache_bytes,
+                'unaccounted_bytes': rss - dataset_bytes - cache_bytes if rss is not None else None,
+            },
+            'datasets': datasets,
+            'caches': caches,
+            'budget': memory_budget.status(),
+            'enforcement': enforcement,
+        }
+    except Exception as e:
+        logger.error(f"Error building memory report: {str(e)}")
+        raise
+
+
+def _result_cache_usage() -> Dict[str, Any]:
+    """Entries and bytes of the shared result cache, in total and per namespace"""
+    status = result_cache.status()
+    namespaces = status.get('namespaces') or {}
+    return {
+        'shared': True,
+        'backend': status['backend'],
+        'entries': sum(usage['entries'] for usage in namespaces.values()),
+        'bytes': sum(usage['bytes'] for usage in namespaces.values()),
+        'max_bytes': status.get('max_bytes'),
+        'namespaces': namespaces,
+    }
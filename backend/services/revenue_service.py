@@ -1,19 +1,24 @@
-from functools import lru_cache
 from typing import Dict, List, Any, Optional
 import logging
 import pandas as pd
-from utils.data_loader import load_data, apply_filters, get_filter_metadata
+from utils.data_loader import apply_filters, get_filter_metadata
+from utils.dataset_epoch import current_epoch
+from utils.metrics import sum_components, compute_metric
+from utils.timing import stage
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Cache the loaded data to avoid repeated CSV reads
-@lru_cache(maxsize=1)
-def get_cached_data():
-    """Load and cache dataset with error handling"""
+def get_cached_data() -> pd.DataFrame:
+    """
+    Dataset of the current epoch, loaded on first use
+    
+    Call once per request and keep the frame: a refresh may swap in a new
+    epoch at any time (see utils.dataset_epoch).
+    """
     try:
-        return load_data()
+        return current_epoch().data
     except Exception as e:
         logger.error(f"Failed to load data: {e}")
         raise
@@ -40,12 +45,13 @@ def get_kpis(filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
                 "metadata": get_filter_metadata(df, original_count)
             }
         
+        totals = sum_components(df)
         result = {
-            "total_revenue": round(df["Revenue_INR"].sum(), 2),
-            "avg_occupancy": round(df["Occupancy_Rate"].mean(), 3),
-            "avg_adr": round(df["ADR_INR"].mean(), 2),
-            "avg_revpar": round(df["RevPAR_INR"].mean(), 2),
-            "total_cancellations": int(df["Cancellation_Count"].sum()),
+            "total_revenue": round(totals["revenue"], 2),
+            "avg_occupancy": round(compute_metric(totals, "occupancy"), 3),
+            "avg_adr": round(compute_metric(totals, "adr"), 2),
+            "avg_revpar": round(compute_metric(totals, "revpar"), 2),
+            "total_cancellations": int(totals["cancellations"]),
             "filters_applied": filters or {},
             "metadata": get_filter_metadata(df, original_count)
         }
@@ -74,9 +80,10 @@ def get_revenue_trend(filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any
                 "metadata": get_filter_metadata(df, original_count)
             }
         
-        grouped = df.groupby("Date")["Revenue_INR"].sum().reset_index()
-        # Convert datetime to string for JSON serialization
-        grouped["Date"] = grouped["Date"].dt.strftime("%Y-%m-%d")
+        with stage("aggregate"):
+            grouped = df.groupby("Date")["Revenue_INR"].sum().reset_index()
+            # Convert datetime to string for JSON serialization
+            grouped["Date"] = grouped["Date"].dt.strftime("%Y-%m-%d")
         
         return {
             "data": grouped.to_dict(orient="records"),
@@ -106,8 +113,11 @@ def get_occupancy_trend(filters: Optional[Dict[str, Any]] = None) -> Dict[str, A
                 "metadata": get_filter_metadata(df, original_count)
             }
         
-        grouped = df.groupby("Date")["Occupancy_Rate"].mean().reset_index()
-        grouped["Date"] = grouped["Date"].dt.strftime("%Y-%m-%d")
+        components = sum_components(df, by="Date")
+        grouped = pd.DataFrame({
+            "Date": components.index.strftime("%Y-%m-%d"),
+            "Occupancy_Rate": compute_metric(components, "occupancy").to_numpy()
+        })
         
         return {
             "data": grouped.to_dict(orient="records"),
@@ -138,13 +148,15 @@ def get_revenue_by_hotel(filters: Optional[Dict[str, Any]] = None) -> Dict[str,
             }
         
         # Enhanced aggregation with more metrics
-        grouped = df.groupby("Hotel_ID").agg({
-            "Revenue_INR": "sum",
-            "Occupancy_Rate": "mean", 
-            "ADR_INR": "mean",
-            "RevPAR_INR": "mean",
-            "Cancellation_Count": "sum"
-        }).reset_index()
+        components = sum_components(df, by="Hotel_ID")
+        grouped = pd.DataFrame({
+            "Hotel_ID": components.index.astype(str),
+            "Revenue_INR": components["revenue"].to_numpy(),
+            "Occupancy_Rate": compute_metric(components, "occupancy").to_numpy(),
+            "ADR_INR": compute_metric(components, "adr").to_numpy(),
+            "RevPAR_INR": compute_metric(components, "revpar").to_numpy(),
+            "Cancellation_Count": components["cancellations"].to_numpy()
+        })
         
         # Add hotel names and performance metrics
         grouped["Hotel_Name"] = grouped["Hotel_ID"].apply(lambda x: f"Hotel {x}")
@@ -191,17 +203,17 @@ def get_revenue_by_channel(filters: Optional[Dict[str, Any]] = None) -> Dict[str
             }
         
         # Enhanced aggregation with more metrics
-        grouped = df.groupby("Booking_Channel").agg({
-            "Revenue_INR": "sum",
-            "Occupancy_Rate": "mean",
-            "ADR_INR": "mean", 
-            "RevPAR_INR": "mean",
-            "Cancellation_Count": "sum",
-            "Hotel_ID": "nunique"  # Count unique hotels per channel
-        }).reset_index()
-        
-        # Rename for clarity
-        grouped.rename(columns={"Hotel_ID": "Hotel_Count"}, inplace=True)
+        components = sum_components(df, by="Booking_Channel")
+        grouped = pd.DataFrame({
+            "Booking_Channel": components.index.astype(str),
+            "Revenue_INR": components["revenue"].to_numpy(),
+            "Occupancy_Rate": compute_metric(components, "occupancy").to_numpy(),
+            "ADR_INR": compute_metric(components, "adr").to_numpy(),
+            "RevPAR_INR": compute_metric(components, "revpar").to_numpy(),
+            "Cancellation_Count": components["cancellations"].to_numpy(),
+            # Count unique hotels per channel
+            "Hotel_Count": df.groupby("Booking_Channel", observed=True, sort=True)["Hotel_ID"].nunique().to_numpy()
+        })
         
         # Calculate channel efficiency score
         if len(grouped) > 0:
@@ -255,7 +267,8 @@ def get_market_segment_share(filters: Optional[Dict[str, Any]] = None) -> Dict[s
                 "metadata": get_filter_metadata(df, original_count)
             }
         
-        grouped = df.groupby("Market_Segment")["Revenue_INR"].sum().reset_index()
+        with stage("aggregate"):
+            grouped = df.groupby("Market_Segment")["Revenue_INR"].sum().reset_index()
         
         return {
             "data": grouped.to_dict(orient="records"),
@@ -315,11 +328,12 @@ def get_cancellations_by_channel(filters: Optional[Dict[str, Any]] = None) -> Di
                 "metadata": get_filter_metadata(df, original_count)
             }
         
-        result = (
-            df.groupby("Booking_Channel", as_index=False)
-            .agg({"Cancellation_Count": "sum"})
-            .sort_values("Cancellation_Count", ascending=False)
-        )
+        with stage("aggregate"):
+            result = (
+                df.groupby("Booking_Channel", as_index=False, observed=True, sort=True)
+                .agg({"Cancellation_Count": "sum"})
+                .sort_values("Cancellation_Count", ascending=False)
+            )
         
         return {
             "data": result.to_dict(orient="records"),
@@ -1,15 +1,24 @@
 import pandas as pd
 import numpy as np
+import hashlib
+import inspect
 import logging
 import os
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import date
+from functools import lru_cache, partial
+
+from utils import shared_dataset
+from utils.timing import timed
 
 logger = logging.getLogger(__name__)
 
 DATA_PATH = "data/intelligent_hotel_revenue_.csv"
 
+# Calendar keys derived from Date once per load and shared by all services
+CALENDAR_COLUMNS = ["Month", "Year_Month", "Day_Of_Week", "Is_Weekend"]
+
 def validate_data(df: pd.DataFrame) -> pd.DataFrame:
     """Validate and clean the hotel revenue data"""
     required_columns = [
@@ -42,65 +51,100 @@ def validate_data(df: pd.DataFrame) -> pd.DataFrame:
     
     return df
 
+def add_calendar_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add compact calendar keys derived from the Date column
+    
+    - Month: 1-12 (int8)
+    - Year_Month: year * 12 + month - 1, a sortable month ordinal (int32)
+    - Day_Of_Week: Monday=0 … Sunday=6 (int8)
+    - Is_Weekend: Saturday or Sunday (bool)
+    """
+    dates = df["Date"].dt
+    month = dates.month.astype("int8")
+    df["Month"] = month
+    df["Year_Month"] = (dates.year * 12 + month - 1).astype("int32")
+    df["Day_Of_Week"] = dates.dayofweek.astype("int8")
+    df["Is_Weekend"] = df["Day_Of_Week"] >= 5
+    return df
+
+def data_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of a dataframe, identical in every process that loaded the same data"""
+    row_hashes = pd.util.hash_pandas_object(df, index=True).values
+    return hashlib.md5(row_hashes.tobytes()).hexdigest()
+
+def format_year_month(ordinal: int) -> str:
+    """Format a Year_Month ordinal as YYYY-MM"""
+    year, month_index = divmod(int(ordinal), 12)
+    return f"{year}-{month_index + 1:02d}"
+
 def generate_sample_data() -> pd.DataFrame:
     """Generate sample hotel revenue data for testing when main data file is not available"""
-    import numpy as np
     from datetime import datetime, timedelta
+    from utils.synthetic_data import generate_hotel_data
     
     logger.info("Generating sample data for testing")
     
-    # Generate sample data for last 30 days
-    start_date = datetime.now() - timedelta(days=30)
-    dates = [start_date + timedelta(days=i) for i in range(30)]
-    
-    hotels = ['H101', 'H102', 'H103', 'H104', 'H105']
-    channels = ['Direct', 'OTA', 'Travel Agent', 'Corporate']
-    segments = ['Business', 'Leisure', 'Group']
-    
-    sample_data = []
-    
-    for date in dates:
-        for hotel in hotels:
-            # Generate realistic hotel data
-            rooms_available = np.random.randint(80, 200)
-            occupancy_rate = np.random.uniform(0.4, 0.95)
-            rooms_sold = int(rooms_available * occupancy_rate)
-            adr = np.random.uniform(3500, 6000)  # INR
-            revenue = rooms_sold * adr
-            revpar = revenue / rooms_available
-            cancellations = np.random.randint(0, int(rooms_sold * 0.1))
-            
-            sample_data.append({
-                'Date': date.strftime('%d-%m-%Y'),
-                'Hotel_ID': hotel,
-                'Rooms_Available': rooms_available,
-                'Rooms_Sold': rooms_sold,
-                'Occupancy_Rate': round(occupancy_rate, 3),
-                'ADR_INR': round(adr, 2),
-                'RevPAR_INR': round(revpar, 2),
-                'Revenue_INR': round(revenue, 2),
-                'Cancellation_Count': cancellations,
-                'Market_Segment': np.random.choice(segments),
-                'Booking_Channel': np.random.choice(channels)
-            })
-    
-    df = pd.DataFrame(sample_data)
-    df['Date'] = pd.to_datetime(df['Date'], format='%d-%m-%Y')
-    return df
+    # Sample data for the last 30 days across 5 hotels
+    start_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+    return generate_hotel_data(hotels=5, start_date=start_date, days=30)
+
+def load_data(isolated: bool = False) -> pd.DataFrame:
+    """
+    Load and process hotel revenue data with error handling
+    
+    The CSV is parsed once per file version and shared read-only by all
+    worker processes (see utils.shared_dataset); with SHARED_DATASET=0, or
+    if publishing fails, each call parses a private copy.
+    
+    Args:
+        isolated: Parse a not yet published file in a child process. read_csv
+            holds the GIL for seconds on large files, which would stall every
+            request thread while a background refresh runs.
+    """
+    # Check if file exists
+    if not os.path.exists(DATA_PATH):
+        logger.warning(f"Data file not found: {DATA_PATH}. Using sample data instead.")
+        return add_calendar_features(generate_sample_data())
+    
+    if shared_dataset.SHARED_DATASET_ENABLED:
+        loader = partial(_load_csv, DATA_PATH)
+        try:
+            if isolated:
+                shared_dataset.publish_isolated(DATA_PATH, loader, loader_schema())
+            return shared_dataset.load_shared(DATA_PATH, loader, loader_schema())
+        except (OSError, TypeError) as e:
+            logger.warning(f"Shared dataset unavailable ({str(e)}), loading a private copy")
+    return _load_csv(DATA_PATH)
 
-def load_data() -> pd.DataFrame:
-    """Load and process hotel revenue data with error handling"""
+@lru_cache(maxsize=1)
+def loader_schema() -> str:
+    """
+    Version of the code that builds the loaded columns
+    
+    Part of the shared dataset key, so a change to parsing, validation or
+    the derived columns never attaches a dataset published by older code.
+    """
+    source = "".join(inspect.getsource(func) for func in (_load_csv, validate_data, add_calendar_features))
+    return hashlib.sha1(f"{source}|{CALENDAR_COLUMNS}".encode()).hexdigest()[:12]
+
+def source_version() -> str:
+    """
+    Version key of the data file and the code loading it
+    
+    Raises:
+        OSError: If the data file does not exist
+    """
+    return shared_dataset.source_key(DATA_PATH, loader_schema())
+
+def _load_csv(path: str) -> pd.DataFrame:
+    """Parse, validate and enrich a hotel revenue CSV"""
     try:
-        # Check if file exists
-        if not os.path.exists(DATA_PATH):
-            logger.warning(f"Data file not found: {DATA_PATH}. Using sample data instead.")
-            return generate_sample_data()
-        
-        logger.info(f"Loading data from {DATA_PATH}")
+        logger.info(f"Loading data from {path}")
         
         # Load CSV with optimized settings
         df = pd.read_csv(
-            DATA_PATH,
+            path,
             dtype={
                 "Hotel_ID": "category",
                 "Market_Segment": "category", 
@@ -118,6 +162,7 @@ def load_data() -> pd.DataFrame:
         
         # Validate and clean data
         df = validate_data(df)
+        df = add_calendar_features(df)
         
         logger.info(f"Successfully loaded {len(df)} rows of data")
         return df
@@ -126,6 +171,7 @@ def load_data() -> pd.DataFrame:
         logger.error(f"Error loading data: {str(e)}")
         raise
 
+@timed("filter")
 def apply_filters(df: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFrame:
     """Apply dynamic filters to dataframe"""
     filtered_df = df.copy()
@@ -153,13 +199,60 @@ def apply_filters(df: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFrame:
             segments = [seg.strip() for seg in str(filters['market_segment']).split(',')]
             filtered_df = filtered_df[filtered_df['Market_Segment'].isin(segments)]
         
-        logger.info(f"Applied filters: {filters}, Resulting records: {len(filtered_df)}")
+        logger.info("Applied filters: %s, resulting records: %d", filters, len(filtered_df),
+                    extra={"event": "filters_applied"})
         return filtered_df
         
     except Exception as e:
         logger.error(f"Error applying filters: {str(e)}")
         raise ValueError(f"Invalid filter parameters: {str(e)}")
 
+# Filters that accept comma-separated lists of values
+MULTI_VALUE_FILTERS = ("hotel_id", "booking_channel", "market_segment")
+
+# Filters that take a date (a date object or a YYYY-MM-DD string)
+DATE_FILTERS = ("start_date", "end_date")
+
+def normalize_filters(filters: Optional[Dict[str, Any]]) -> Tuple:
+    """
+    Canonical, hashable form of a filter dict for use in cache keys
+    
+    Raises:
+        ValueError: If a filter is unknown, a date does not parse, or
+            end_date is before start_date
+    """
+    if not filters:
+        return ()
+    
+    unknown = [key for key in filters if key not in MULTI_VALUE_FILTERS + DATE_FILTERS]
+    if unknown:
+        raise ValueError(f"Unknown filters: {', '.join(sorted(unknown))}")
+    
+    dates = {}
+    for key in DATE_FILTERS:
+        if filters.get(key):
+            try:
+                dates[key] = pd.Timestamp(filters[key])
+            except (TypeError, ValueError):
+                raise ValueError(f"{key} must be a date (YYYY-MM-DD), got {filters[key]!r}")
+    if len(dates) == 2 and dates["end_date"] < dates["start_date"]:
+        raise ValueError("end_date must not be before start_date")
+    
+    normalized = []
+    for key in sorted(filters):
+        value = filters[key]
+        if value is None or value == "":
+            continue
+        if key in MULTI_VALUE_FILTERS:
+            value = tuple(sorted({item.strip() for item in str(value).split(",") if item.strip()}))
+        elif hasattr(value, "isoformat"):
+            value = value.isoformat()
+        else:
+            value = str(value)
+        normalized.append((key, value))
+    return tuple(normalized)
+
+@timed("metadata")
 def get_filter_metadata(df: pd.DataFrame, original_count: int) -> Dict[str, Any]:
     """Generate metadata about applied filters"""
     if df.empty:
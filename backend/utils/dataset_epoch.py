@@ -0,0 +1,281 @@
+"""
+Immutable dataset epochs, swapped atomically on refresh.
+
+An epoch bundles the dataset with everything derived from it: its content
+fingerprint and the structures services register builders for (the
+insight aggregates, for example). A refresh builds the next epoch on a
+background thread, loading and validating the data and running every
+builder, and only then swaps it in with a single reference assignment.
+Requests never wait on a refresh: each one reads current_epoch() once and
+keeps working on that epoch, so a request in flight during a swap finishes
+on the old data while new requests see the new one. Caches keyed by the
+epoch number or fingerprint are invalidated by the swap itself; swap
+listeners drop the entries that became unreachable.
+
+Each worker process holds its own epochs. Besides explicit refreshes,
+current_epoch() notices (at most every DATASET_WATCH_INTERVAL seconds, one
+stat call) when the data file changed and has stayed unchanged for a full
+interval, and then refreshes in the background, so every worker picks up a
+new file without a request per worker.
+
+The first epoch is loaded in-process unless several workers share the
+dataset (WEB_CONCURRENCY > 1, as set for uvicorn or gunicorn workers); later
+builds parse a new file in a child process (see data_loader.load_data), so
+a refresh never stalls the request threads of a serving worker.
+
+Environment variables:
+    DATASET_WATCH_INTERVAL=5   seconds between data file checks (0 disables)
+    WEB_CONCURRENCY=1          worker processes sharing the dataset
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from utils import data_loader, shared_dataset
+
+logger = logging.getLogger(__name__)
+
+DATASET_WATCH_INTERVAL = float(os.getenv("DATASET_WATCH_INTERVAL", "5"))
+WORKER_COUNT = int(os.getenv("WEB_CONCURRENCY") or "1")
+
+
+@dataclass(frozen=True)
+class DatasetEpoch:
+    """One loaded version of the dataset and the structures derived from it"""
+
+    number: int
+    data: pd.DataFrame
+    fingerprint: str
+    source_version: Optional[str]
+    loaded_at: datetime
+    load_seconds: float
+    derived: Dict[str, Any] = field(default_factory=dict)
+    _derive_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def derive(self, name: str, build: Callable[[pd.DataFrame], Any]) -> Any:
+        """Structure derived from this epoch's data, built once on first use"""
+        value = self.derived.get(name)
+        if value is None:
+            with self._derive_lock:
+                value = self.derived.get(name)
+                if value is None:
+                    value = build(self.data)
+                    self.derived[name] = value
+        return value
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'number': self.number,
+            'rows': len(self.data),
+            'fingerprint': self.fingerprint,
+            'source_version': self.source_version,
+            'loaded_at': self.loaded_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'age_seconds': round((datetime.now() - self.loaded_at).total_seconds(), 1),
+            'load_seconds': round(self.load_seconds, 3),
+            'shared_memory': shared_dataset.is_shared(self.data),
+            'derived': sorted(self.derived),
+        }
+
+
+def _source_version() -> Optional[str]:
+    """Version key of the data file, or None when it is missing"""
+    try:
+        return data_loader.source_version()
+    except OSError:
+        return None
+
+
+def validate_epoch_data(df: pd.DataFrame):
+    """
+    Reject a dataset that must not replace the current one
+
+    Raises:
+        ValueError: If the dataset is empty or lacks a derived column
+    """
+    if df.empty:
+        raise ValueError("Refreshed dataset has no rows")
+    missing = [column for column in ["Date", "Hotel_ID", "Revenue_INR", *data_loader.CALENDAR_COLUMNS]
+               if column not in df.columns]
+    if missing:
+        raise ValueError(f"Refreshed dataset is missing columns: {', '.join(missing)}")
+
+
+class EpochManager:
+    """Holds the current epoch and builds, validates and swaps in the next"""
+
+    def __init__(self):
+        self._current: Optional[DatasetEpoch] = None
+        self._builders: Dict[str, Callable[[pd.DataFrame], Any]] = {}
+        self._listeners: List[Callable[[DatasetEpoch], None]] = []
+        self._initial_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._next_check = 0.0
+        self._pending_version: Optional[str] = None
+        self.refreshes = {'swapped': 0, 'unchanged': 0, 'failed': 0}
+        self.last_refresh: Optional[Dict[str, Any]] = None
+
+    def register(self, name: str, build: Optional[Callable[[pd.DataFrame], Any]] = None,
+                 on_swap: Optional[Callable[[DatasetEpoch], None]] = None):
+        """
+        Hook a service into epoch refreshes
+
+        Args:
+            name: Key of the derived structure in DatasetEpoch.derived
+            build: Builds the structure from a new epoch's data before it is
+                swapped in
+            on_swap: Called with the new epoch right after a swap
+        """
+        if build is not None:
+            self._builders[name] = build
+        if on_swap is not None:
+            self._listeners.append(on_swap)
+
+    def current(self) -> DatasetEpoch:
+        """The current epoch; the first call loads it, later calls never block"""
+        epoch = self._current
+        if epoch is None:
+            with self._initial_lock:
+                if self._current is None:
+                    # Nothing is served yet, so only other workers gain from a child process
+                    self._swap(self._build(isolated=WORKER_COUNT > 1))
+                epoch = self._current
+        elif DATASET_WATCH_INTERVAL > 0:
+            self._watch(epoch)
+        return epoch
+
+    def peek(self) -> Optional[DatasetEpoch]:
+        """The current epoch, or None before the first load (never loads)"""
+        return self._current
+
+    def _watch(self, epoch: DatasetEpoch):
+        """Start a background refresh once the data file changed and settled"""
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + DATASET_WATCH_INTERVAL
+        version = _source_version()
+        if version is None or version == epoch.source_version:
+            self._pending_version = None
+            return
+        # A file still being written changes between checks; wait until it settles
+        if version != self._pending_version:
+            self._pending_version = version
+            return
+        self._pending_version = None
+        logger.info(f"Data file changed ({epoch.source_version} -> {version}), refreshing dataset")
+        self.refresh()
+
+    def _build(self, isolated: bool = True) -> DatasetEpoch:
+        """Load, validate and derive the next epoch (not yet visible)"""
+        started = time.perf_counter()
+        source_version = _source_version()
+        data = data_loader.load_data(isolated=isolated)
+        validate_epoch_data(data)
+        epoch = DatasetEpoch(
+            number=0,
+            data=data,
+            fingerprint=data_loader.data_fingerprint(data),
+            source_version=source_version,
+            loaded_at=datetime.now(),
+            load_seconds=0.0,
+        )
+        for name, build in self._builders.items():
+            epoch.derive(name, build)
+        return replace(epoch, load_seconds=time.perf_counter() - started)
+
+    def _swap(self, epoch: DatasetEpoch):
+        """Make `epoch` current and notify the listeners"""
+        previous = self._current
+        epoch = replace(epoch, number=(previous.number if previous else 0) + 1)
+        self._current = epoch
+        logger.info(f"Dataset epoch {epoch.number} active: {len(epoch.data)} rows, "
+                    f"built in {epoch.load_seconds:.2f}s")
+        for listener in self._listeners:
+            try:
+                listener(epoch)
+            except Exception as e:
+                logger.error(f"Epoch swap listener failed: {str(e)}")
+
+    def refresh(self, wait: bool = False) -> Dict[str, Any]:
+        """
+        Build the next epoch in the background and swap it in
+
+        Only one refresh runs at a time; asking again while one runs joins it.
+        A dataset identical to the current one is not swapped.
+
+        Args:
+            wait: Block until the refresh finished (for scripts and tests)
+
+        Returns:
+            'started' or 'running' with the current epoch, or with wait the
+            outcome: 'swapped', 'unchanged' or 'failed'
+        """
+        with self._refresh_lock:
+            thread = self._refresh_thread
+            running = thread is not None and thread.is_alive()
+            if not running:
+                thread = threading.Thread(target=self._run_refresh, name="dataset-refresh", daemon=True)
+                self._refresh_thread = thread
+                thread.start()
+        if wait:
+            thread.join()
+            return self.last_refresh
+        current = self._current
+        return {
+            'status': 'running' if running else 'started',
+            'epoch': current.summary() if current else None,
+        }
+
+    def _run_refresh(self):
+        started = time.perf_counter()
+        result: Dict[str, Any] = {}
+        try:
+            candidate = self._build()
+            with self._initial_lock:
+                current = self._current
+                if current is not None and candidate.fingerprint == current.fingerprint:
+                    # Same data: keep the epoch (and its warm caches)
+                    result['status'] = 'unchanged'
+                else:
+                    self._swap(candidate)
+                    result['status'] = 'swapped'
+        except Exception as e:
+            logger.error(f"Dataset refresh failed, keeping epoch "
+                         f"{self._current.number if self._current else None}: {str(e)}")
+            result.update(status='failed', error=str(e))
+        self.refreshes[result['status']] += 1
+        current = self._current
+        result.update(
+            seconds=round(time.perf_counter() - started, 3),
+            finished_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            epoch=current.summary() if current else None,
+        )
+        self.last_refresh = result
+
+    def status(self) -> Dict[str, Any]:
+        """Current epoch, refresh counters and the outcome of the last refresh"""
+        current = self._current
+        thread = self._refresh_thread
+        return {
+            'epoch': current.summary() if current else None,
+            'refreshing': thread is not None and thread.is_alive(),
+            'refreshes': dict(self.refreshes),
+            'last_refresh': self.last_refresh,
+            'watch_interval_seconds': DATASET_WATCH_INTERVAL,
+        }
+
+
+dataset_epochs = EpochManager()
+
+
+def current_epoch() -> DatasetEpoch:
+    """The current dataset epoch (loaded on first use)"""
+    return dataset_epochs.current()
@@ -0,0 +1,91 @@
+"""
+Cross-process exclusive lock on a lock file
+
+Used where several worker processes must agree on who builds a shared
+artifact (the shared dataset, shared cache entries). Uses flock on POSIX
+and msvcrt.locking on Windows; the lock is released when the holder closes
+the file or exits, so a crashed worker never leaves it stuck.
+
+    with FileLock("/tmp/dataset.lock", timeout=30):
+        ...
+"""
+
+import os
+import time
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class LockTimeout(TimeoutError):
+    """Raised when a FileLock could not be acquired in time"""
+
+
+class FileLock:
+    """Exclusive lock held on an open lock file"""
+
+    def __init__(self, path: str, timeout: Optional[float] = None, poll_interval: float = 0.05):
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._fd: Optional[int] = None
+
+    def _try_lock(self, fd: int) -> bool:
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """
+        Take the lock
+
+        Args:
+            blocking: Wait (up to `timeout`) instead of returning at once
+
+        Raises:
+            LockTimeout: If a blocking acquire timed out
+        """
+        if self._fd is not None:
+            raise RuntimeError(f"Lock {self.path} is already held by this object")
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while not self._try_lock(fd):
+            if not blocking or (deadline is not None and time.monotonic() >= deadline):
+                os.close(fd)
+                if blocking:
+                    raise LockTimeout(f"Timed out after {self.timeout}s waiting for {self.path}")
+                return False
+            time.sleep(self.poll_interval)
+        self._fd = fd
+        return True
+
+    def release(self):
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
@@ -0,0 +1,172 @@
+"""
+Application logging: queue-based output, sampled hot-path events and
+optional JSON lines.
+
+Request threads only build the log record and put it on an in-memory
+queue; a QueueListener thread formats it and writes it out, so slow log
+I/O never blocks a request.
+
+Hot-path events are records that carry an `event` name, logged with lazy
+%-style arguments:
+
+    logger.info("Applied filters: %s, resulting records: %d",
+                filters, len(df), extra={"event": "filters_applied"})
+
+Below WARNING they are sampled per logger, and dropped records are never
+formatted. Emitted records carry `sample_rate`, so counts can be scaled
+back up. Records without an event, and all warnings and errors, are
+always logged. Only tag records logged on every request; one-off records
+(data loads, cache refreshes) must stay untagged or they are mostly lost.
+
+Environment variables:
+    LOG_LEVEL=INFO                                 root log level
+    LOG_FORMAT=json                                JSON lines instead of plain text
+    LOG_SAMPLE_RATE=0.01                           default rate for hot-path events
+    LOG_SAMPLE_RATES=utils.data_loader=0.1,...     per-logger rates (prefix match)
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+DEFAULT_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.01"))
+
+# Attributes every LogRecord has; anything else came in through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """Parse 'logger=rate,logger=rate' into a dict"""
+    rates = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, rate = item.partition("=")
+        try:
+            rates[name.strip()] = float(rate)
+        except ValueError:
+            raise ValueError(f"Invalid log sample rate '{item}'. Use logger=rate")
+    return rates
+
+
+class HotPathSampler(logging.Filter):
+    """Keep a fraction of sub-WARNING records that carry an `event`"""
+
+    def __init__(self, default_rate: float = DEFAULT_SAMPLE_RATE,
+                 rates: Optional[Dict[str, float]] = None):
+        super().__init__()
+        self.default_rate = default_rate
+        self.rates = rates or {}
+        self._resolved: Dict[str, float] = {}
+
+    def rate_for(self, name: str) -> float:
+        """Sample rate of a logger: the longest matching prefix, else the default"""
+        rate = self._resolved.get(name)
+        if rate is None:
+            matches = [prefix for prefix in self.rates if name == prefix or name.startswith(prefix + ".")]
+            rate = self.rates[max(matches, key=len)] if matches else self.default_rate
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not hasattr(record, "event"):
+            return True
+        rate = self.rate_for(record.name)
+        if rate >= 1:
+            return True
+        if rate <= 0 or random.random() >= rate:
+            return False
+        record.sample_rate = rate
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including `extra` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread
+
+    The stock handler formats every record before enqueueing it. Records
+    stay in this process, so only the message is resolved here (the
+    arguments may change after the call returns); timestamps, JSON and
+    tracebacks are rendered by the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def configure_logging(level: Optional[str] = None, log_format: Optional[str] = None,
+                      sample_rates: Optional[str] = None):
+    """
+    Route all logging through a background queue listener
+
+    Safe to call more than once; later calls replace the previous setup.
+
+    Args:
+        level: Root log level name (default LOG_LEVEL or INFO)
+        log_format: 'json' or 'text' (default LOG_FORMAT or text)
+        sample_rates: Per-logger hot-path sample rates (default LOG_SAMPLE_RATES)
+    """
+    global _listener
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    log_format = log_format or os.getenv("LOG_FORMAT", "text")
+    rates = parse_sample_rates(sample_rates if sample_rates is not None else os.getenv("LOG_SAMPLE_RATES", ""))
+
+    output = logging.StreamHandler()
+    if log_format == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter("%(levelname)s:%(name)s:%(message)s"))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = _DeferredQueueHandler(log_queue)
+    handler.addFilter(HotPathSampler(DEFAULT_SAMPLE_RATE, rates))
+
+    if _listener is not None:
+        _listener.stop()
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
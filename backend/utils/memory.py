@@ -0,0 +1,241 @@
+"""
+Memory estimation helpers used to bound in-process caches, plus a process
+memory budget that evicts registered caches before the worker runs out of
+memory.
+
+Set MEMORY_BUDGET_MB to enable the budget. Caches register a reclaimer
+(evict one entry, return the bytes released) with a priority; when the
+process RSS exceeds the budget, reclaimers run cheapest-first until the
+estimated excess, down to MEMORY_BUDGET_TARGET of the budget, is released.
+"""
+
+import ctypes
+import ctypes.util
+import gc
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MEMORY_BUDGET_MB = float(os.getenv("MEMORY_BUDGET_MB", "0")) or None
+
+# Fraction of the budget to shrink back to once it is exceeded
+MEMORY_BUDGET_TARGET = 0.9
+
+# Minimum seconds between two RSS checks triggered by cache writes
+MEMORY_CHECK_INTERVAL = 1.0
+
+
+def estimate_size(obj: Any, _seen: Optional[Set[int]] = None) -> int:
+    """
+    Estimate the deep memory footprint of an object in bytes
+
+    DataFrames, Series and NumPy arrays report their buffer sizes; containers
+    and plain objects are walked recursively. Shared objects are counted once.
+    """
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True, index=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _seen) for item in obj)
+    elif hasattr(obj, '__dict__') and not isinstance(obj, type):
+        size += estimate_size(vars(obj), _seen)
+    return size
+
+
+def frame_memory(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Deep memory usage of a DataFrame, per column
+
+    Categorical columns are split into their codes and their category
+    dictionary, which is what string-heavy columns cost once categorized.
+    """
+    usage = df.memory_usage(deep=True, index=True)
+    columns = {}
+    categories = {}
+    for column in df.columns:
+        columns[column] = {'dtype': str(df[column].dtype), 'bytes': int(usage[column])}
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            values = df[column].cat
+            categories[column] = {
+                'categories': len(values.categories),
+                'dictionary_bytes': int(values.categories.memory_usage(deep=True)),
+                'codes_bytes': int(values.codes.nbytes),
+            }
+    return {
+        'rows': len(df),
+        'total_bytes': int(usage.sum()),
+        'index_bytes': int(usage['Index']),
+        'columns': columns,
+        'categories': categories,
+    }
+
+
+def process_rss_bytes() -> Optional[int]:
+    """Current resident set size of this process (None where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process (None where `resource` is unavailable, e.g. Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _release_free_memory():
+    """Collect garbage and return freed heap pages to the OS where glibc allows it"""
+    gc.collect()
+    libc_name = ctypes.util.find_library('c')
+    if libc_name and sys.platform.startswith('linux'):
+        try:
+            ctypes.CDLL(libc_name).malloc_trim(0)
+        except (OSError, AttributeError):
+            pass
+
+
+class MemoryBudget:
+    """Process RSS budget enforced by evicting registered caches"""
+
+    def __init__(self, limit_mb: Optional[float] = MEMORY_BUDGET_MB,
+                 target: float = MEMORY_BUDGET_TARGET,
+                 check_interval: float = MEMORY_CHECK_INTERVAL):
+        self.limit_bytes = int(limit_mb * 1024 * 1024) if limit_mb else None
+        self.target = target
+        self.check_interval = check_interval
+        self.checks = 0
+        self.enforcements = 0
+        self.evicted_entries = 0
+        self.released_bytes = 0
+        self.last_enforced_at: Optional[float] = None
+        self._reclaimers: List[tuple] = []
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    def configure(self, limit_mb: Optional[float]):
+        """Change the budget; None or 0 disables it"""
+        self.limit_bytes = int(limit_mb * 1024 * 1024) if limit_mb else None
+
+    def register(self, name: str, reclaim: Callable[[], int], priority: int = 50):
+        """
+        Register a cache to shrink when over budget
+
+        Args:
+            name: Cache name for logs and status
+            reclaim: Evicts the least valuable entry and returns the bytes it
+                held, or 0 when there is nothing left to evict
+            priority: Lower runs first; use it for caches cheapest to rebuild
+        """
+        self._reclaimers = sorted(
+            [entry for entry in self._reclaimers if entry[1] != name] + [(priority, name, reclaim)],
+            key=lambda entry: entry[0]
+        )
+
+    def check(self, force: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Evict caches if the process is over budget
+
+        Cheap when the budget is off or was checked recently, so caches can
+        call it after every write.
+
+        Returns:
+            Summary of the enforcement, or None when nothing was evicted
+        """
+        if self.limit_bytes is None:
+            return None
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval:
+            return None
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            self._last_check = now
+            self.checks += 1
+            rss = process_rss_bytes()
+            if rss is None or rss <= self.limit_bytes:
+                return None
+            return self._enforce(rss)
+        finally:
+            self._lock.release()
+
+    def _enforce(self, rss: int) -> Dict[str, Any]:
+        """Evict until the estimated excess is released (lock must be held)"""
+        excess = rss - int(self.limit_bytes * self.target)
+        released = 0
+        evicted: Dict[str, int] = {}
+        for _, name, reclaim in self._reclaimers:
+            while released < excess:
+                try:
+                    freed = reclaim()
+                except Exception as e:
+                    logger.error(f"Memory reclaimer {name} failed: {str(e)}")
+                    break
+                if not freed:
+                    break
+                released += freed
+                evicted[name] = evicted.get(name, 0) + 1
+            if released >= excess:
+                break
+
+        _release_free_memory()
+        rss_after = process_rss_bytes()
+        self.enforcements += 1
+        self.evicted_entries += sum(evicted.values())
+        self.released_bytes += released
+        self.last_enforced_at = time.time()
+
+        summary = {
+            'rss_before_bytes': rss,
+            'rss_after_bytes': rss_after,
+            'released_bytes': released,
+            'evicted': evicted,
+        }
+        if released < excess:
+            logger.warning(f"Memory budget exceeded and caches are exhausted: RSS {rss / 2**20:.0f} MB, "
+                           f"budget {self.limit_bytes / 2**20:.0f} MB, released {released / 2**20:.1f} MB")
+        else:
+            logger.warning(f"Memory budget exceeded (RSS {rss / 2**20:.0f} MB > "
+                           f"{self.limit_bytes / 2**20:.0f} MB); evicted {evicted}")
+        return summary
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'limit_bytes': self.limit_bytes,
+            'target_fraction': self.target,
+            'checks': self.checks,
+            'enforcements': self.enforcements,
+            'evicted_entries': self.evicted_entries,
+            'released_bytes': self.released_bytes,
+            'last_enforced_at': self.last_enforced_at,
+            'reclaimers': [name for _, name, _ in self._reclaimers],
+        }
+
+
+memory_budget = MemoryBudget()
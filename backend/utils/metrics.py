@@ -0,0 +1,108 @@
+"""
+Metric kernels: hotel KPIs defined as ratios of additive components.
+
+Every KPI is numerator / denominator over components that can simply be
+summed (revenue, rooms sold, rooms available, cancellations, ...). Any
+grouping, time rollup or cached cube therefore only needs component sums:
+ratios are computed last, so partial aggregates stay mergeable and a
+rollup of rollups gives the same answer as a rollup of raw rows.
+
+    components = sum_components(df, by="Booking_Channel")
+    metrics = add_metrics(components)   # adds adr, revpar, occupancy, ...
+"""
+
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from utils.timing import timed
+
+# Additive component -> source column
+COMPONENT_COLUMNS = {
+    "revenue": "Revenue_INR",
+    "rooms_sold": "Rooms_Sold",
+    "rooms_available": "Rooms_Available",
+    "cancellations": "Cancellation_Count",
+}
+
+# Components derived from the source columns, plus a row count for plain means
+COMPONENTS = list(COMPONENT_COLUMNS) + ["gross_bookings", "rows"]
+
+# KPI -> (numerator component, denominator component)
+RATIO_METRICS = {
+    "adr": ("revenue", "rooms_sold"),                           # Σrevenue / Σsold
+    "revpar": ("revenue", "rooms_available"),                   # Σrevenue / Σavailable
+    "occupancy": ("rooms_sold", "rooms_available"),             # Σsold / Σavailable, 0-1
+    "cancellation_rate": ("cancellations", "gross_bookings"),   # Σcancelled / Σbooked, 0-1
+    "avg_daily_revenue": ("revenue", "rows"),
+}
+
+GroupKeys = Union[str, List[str], pd.Series, np.ndarray]
+
+
+def metric_components(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-row additive components, aligned with df's index."""
+    components = pd.DataFrame(
+        {name: df[column] for name, column in COMPONENT_COLUMNS.items()},
+        index=df.index,
+    )
+    components["gross_bookings"] = components["rooms_sold"] + components["cancellations"]
+    components["rows"] = 1
+    return components
+
+
+@timed("aggregate")
+def sum_components(
+    df: pd.DataFrame,
+    by: Optional[GroupKeys] = None,
+) -> Union[pd.DataFrame, pd.Series]:
+    """
+    Sum the additive components, optionally per group
+
+    Args:
+        df: Hotel revenue rows
+        by: Column name(s) of df, or aligned key arrays/Series, to group by
+
+    Returns:
+        A Series of totals when by is None, else a DataFrame indexed by group
+    """
+    components = metric_components(df)
+    if by is None:
+        return components.sum()
+    if isinstance(by, str):
+        keys = df[by]
+    elif isinstance(by, list) and all(isinstance(key, str) for key in by):
+        keys = [df[key] for key in by]
+    else:
+        keys = by
+    return components.groupby(keys, observed=True, sort=True).sum()
+
+
+def ratio(numerator, denominator):
+    """Element-wise numerator / denominator, NaN where the denominator is 0."""
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.where(denominator != 0, numerator / denominator, np.nan)
+    return result if result.ndim else float(result)
+
+
+def compute_metric(components: Union[pd.DataFrame, pd.Series], metric: str):
+    """One KPI from summed components (a Series per group, or a scalar for totals)."""
+    numerator, denominator = RATIO_METRICS[metric]
+    values = ratio(components[numerator], components[denominator])
+    if isinstance(components, pd.DataFrame):
+        return pd.Series(values, index=components.index, name=metric)
+    return values
+
+
+def add_metrics(
+    components: Union[pd.DataFrame, pd.Series],
+    metrics: Optional[Iterable[str]] = None,
+) -> Union[pd.DataFrame, pd.Series]:
+    """Copy of summed components with KPI columns (or entries) appended."""
+    result = components.copy()
+    for metric in metrics or RATIO_METRICS:
+        result[metric] = compute_metric(components, metric)
+    return result
@@ -0,0 +1,240 @@
+"""
+On-demand request profiling with cProfile.
+
+A request is profiled when it carries the admin header (X-Profile set to
+ADMIN_TOKEN) or is picked by the sampling rate. The profile is kept
+in a bounded in-memory store and its id is returned in the X-Profile-Id
+response header, so it can be fetched later from the admin endpoints as a
+top-N function table.
+
+cProfile is deterministic and traces the whole event-loop thread, so only
+one request is profiled at a time (others are served normally) and
+coroutines of concurrent requests that run meanwhile show up in the
+profile too.
+
+Switches (environment variables, or configure_profiling at runtime):
+    ADMIN_TOKEN=secret           enable the X-Profile header and the admin endpoints
+                                 (which expect the token in X-Admin-Token);
+                                 PROFILE_ADMIN_TOKEN is read if it is unset
+    PROFILE_SAMPLE_RATE=0.01     profile this fraction of requests
+    PROFILE_MAX_STORED=20        profiles kept for retrieval
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = "x-profile-id"
+
+# Guards every admin endpoint, not only profiling; the old name still works
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN") or os.getenv("PROFILE_ADMIN_TOKEN") or None
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_MAX_STORED = int(os.getenv("PROFILE_MAX_STORED", "20"))
+
+SORT_KEYS = {
+    "cumulative": "cumulative_seconds",
+    "tottime": "own_seconds",
+    "calls": "calls",
+}
+
+
+def _function_table(stats: pstats.Stats, sort: str, limit: int) -> List[Dict[str, Any]]:
+    """Top-N functions of a profile as JSON-friendly rows"""
+    rows = []
+    for (filename, line, name), (primitive_calls, calls, own, cumulative, _) in stats.stats.items():
+        rows.append({
+            "function": name,
+            "location": f"{filename}:{line}",
+            "calls": calls,
+            "primitive_calls": primitive_calls,
+            "own_seconds": round(own, 6),
+            "cumulative_seconds": round(cumulative, 6),
+        })
+    rows.sort(key=lambda row: row[SORT_KEYS[sort]], reverse=True)
+    return rows[:limit]
+
+
+class ProfileStore:
+    """Most recent request profiles, oldest dropped beyond max_entries"""
+
+    def __init__(self, max_entries: int = PROFILE_MAX_STORED):
+        self.max_entries = max_entries
+        self.profiles: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile_id: str, summary: Dict[str, Any], stats: pstats.Stats):
+        with self._lock:
+            self.profiles[profile_id] = {"id": profile_id, **summary, "stats": stats}
+            while len(self.profiles) > self.max_entries:
+                self.profiles.popitem(last=False)
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Summaries of the stored profiles, newest first"""
+        with self._lock:
+            entries = list(self.profiles.values())
+        return [
+            {key: value for key, value in entry.items() if key != "stats"}
+            for entry in reversed(entries)
+        ]
+
+    def get(self, profile_id: str, sort: str = "cumulative", limit: int = 40,
+            text: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        One stored profile
+
+        Args:
+            profile_id: Id from the X-Profile-Id header or list()
+            sort: 'cumulative', 'tottime' or 'calls'
+            limit: Number of functions in the table
+            text: Also include the pstats text report
+
+        Raises:
+            ValueError: If sort is not supported
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unsupported sort: {sort}. Use one of: {', '.join(SORT_KEYS)}")
+        with self._lock:
+            entry = self.profiles.get(profile_id)
+        if entry is None:
+            return None
+
+        stats = entry["stats"]
+        result = {key: value for key, value in entry.items() if key != "stats"}
+        result["functions"] = _function_table(stats, sort, limit)
+        if text:
+            stream = io.StringIO()
+            pstats.Stats(stream=stream).add(stats).sort_stats(sort).print_stats(limit)
+            result["report"] = stream.getvalue()
+        return result
+
+    def clear(self):
+        with self._lock:
+            self.profiles.clear()
+
+
+profile_store = ProfileStore()
+
+# cProfile traces a whole thread, so requests are profiled one at a time
+_profiling = threading.Lock()
+
+
+def configure_profiling(admin_token: Optional[str] = "", sample_rate: Optional[float] = None):
+    """
+    Change the profiling switches at runtime
+
+    Args:
+        admin_token: Token expected in the X-Profile header; None disables it
+        sample_rate: Fraction of requests to profile (0 disables sampling)
+    """
+    global ADMIN_TOKEN, PROFILE_SAMPLE_RATE
+    if admin_token != "":
+        ADMIN_TOKEN = admin_token
+    if sample_rate is not None:
+        PROFILE_SAMPLE_RATE = sample_rate
+
+
+def is_admin(token: Optional[str]) -> bool:
+    """Whether a token grants access to profiling and the other admin endpoints"""
+    return ADMIN_TOKEN is not None and token == ADMIN_TOKEN
+
+
+def profiling_status() -> Dict[str, Any]:
+    return {
+        "admin_header_enabled": ADMIN_TOKEN is not None,
+        "sample_rate": PROFILE_SAMPLE_RATE,
+        "stored_profiles": len(profile_store.profiles),
+        "max_stored": profile_store.max_entries,
+    }
+
+
+def _trigger(scope) -> Optional[str]:
+    """Why a request should be profiled, or None"""
+    if ADMIN_TOKEN is not None:
+        for name, value in scope.get("headers", []):
+            if name == PROFILE_HEADER.encode("latin-1"):
+                if value.decode("latin-1") == ADMIN_TOKEN:
+                    return "header"
+                break
+    if PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE:
+        return "sample"
+    return None
+
+
+class RequestProfilerMiddleware:
+    """
+    ASGI middleware running selected requests under cProfile
+
+    Unselected requests cost one header scan (only when the admin token is
+    set) and one random draw (only when sampling is on).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or (ADMIN_TOKEN is None and not PROFILE_SAMPLE_RATE):
+            await self.app(scope, receive, send)
+            return
+
+        trigger = _trigger(scope)
+        if trigger is None or not _profiling.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex[:12]
+        status = 500
+
+        async def send_with_profile_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_ID_HEADER.encode("latin-1"), profile_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send_with_profile_id)
+            finally:
+                profiler.disable()
+        finally:
+            _profiling.release()
+            duration_ms = (time.perf_counter() - start) * 1000
+            self._store(profile_id, profiler, scope, trigger, status, duration_ms)
+
+    @staticmethod
+    def _store(profile_id: str, profiler: cProfile.Profile, scope, trigger: str,
+               status: int, duration_ms: float):
+        try:
+            stats = pstats.Stats(profiler)
+            summary = {
+                "method": scope.get("method", ""),
+                "path": scope.get("path", ""),
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "status": status,
+                "trigger": trigger,
+                "duration_ms": round(duration_ms, 2),
+                "total_calls": stats.total_calls,
+                "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            profile_store.add(profile_id, summary, stats)
+            logger.info(f"Profiled {summary['method']} {summary['path']} ({trigger}, "
+                        f"{duration_ms:.1f}ms) as {profile_id}")
+        except Exception as e:
+            logger.error(f"Failed to store request profile: {str(e)}")
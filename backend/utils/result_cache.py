@@ -0,0 +1,338 @@
+"""
+Result cache shared by all worker processes on a host.
+
+The in-process caches (ForecastCache, InsightCache) stay the first level;
+this is the second level behind them, so a result computed by one worker
+is reused by the others instead of being recomputed N times.
+
+Backends:
+    sqlite   one SQLite file (WAL mode) under SHARED_DATA_DIR, default
+    none     no sharing; every miss is computed by the process that sees it
+
+Values are pickled with the highest protocol, which decodes far faster
+than JSON for the nested dicts and lists stored here. The file is written
+and read only by this service, so it is as trusted as the code itself.
+Keys are prefixed with a code version (a hash of the backend's sources),
+so results pickled by different code are never read, whether the file
+outlived a restart or workers of two releases share it during a rollout.
+
+get_or_compute() is single-flight across processes: on a miss it takes a
+file lock striped by key, checks again, and only then computes, so while
+one worker fits a model the others wait for it and reuse its result. If
+the lock cannot be had in time, or the store fails, the caller computes
+the value itself; the cache never fails a request.
+
+Environment variables:
+    RESULT_CACHE_BACKEND=sqlite|none
+    RESULT_CACHE_PATH=/path/results.sqlite3   (default: SHARED_DATA_DIR/results.sqlite3)
+    RESULT_CACHE_MAX_MB=256                   oldest entries are dropped beyond this
+    RESULT_CACHE_VERSION=<release>            code version (default: hash of the sources)
+"""
+
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from utils.file_lock import FileLock, LockTimeout
+from utils.shared_dataset import SHARED_DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+RESULT_CACHE_BACKEND = os.getenv("RESULT_CACHE_BACKEND", "sqlite")
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH") or os.path.join(SHARED_DATA_DIR, "results.sqlite3")
+RESULT_CACHE_MAX_MB = float(os.getenv("RESULT_CACHE_MAX_MB", "256"))
+
+# Packages whose sources make up the code version
+VERSIONED_PACKAGES = ("models", "services", "utils")
+
+
+def code_version() -> str:
+    """Hash of the backend's Python sources; changes with any code change"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    digest = hashlib.sha1()
+    for package in VERSIONED_PACKAGES:
+        directory = os.path.join(root, package)
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".py"):
+                digest.update(name.encode())
+                with open(os.path.join(directory, name), "rb") as f:
+                    digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+RESULT_CACHE_VERSION = os.getenv("RESULT_CACHE_VERSION") or code_version()
+
+# Longest a worker waits for another one to finish computing an entry
+COMPUTE_LOCK_TIMEOUT = 120.0
+
+# Lock files are striped by key hash so their number stays bounded
+LOCK_STRIPES = 256
+
+
+class ResultCache(ABC):
+    """
+    Cache interface shared by the backends
+
+    Subclasses implement get, set, clear and optionally _lock;
+    get_or_compute and the counters are common.
+    """
+
+    backend = "base"
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.computed = 0
+        self.waited = 0
+        self.lock_timeouts = 0
+        self.errors = 0
+        self._counter_lock = threading.Lock()
+
+    def _count(self, name: str):
+        with self._counter_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    @abstractmethod
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Cached value, or None on a miss"""
+
+    @abstractmethod
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a value (ttl in seconds, None for no expiry)"""
+
+    @abstractmethod
+    def clear(self, namespace: Optional[str] = None):
+        """Drop the entries of one namespace, or all of them"""
+
+    def _lock(self, namespace: str, key: str) -> Optional[FileLock]:
+        """Cross-process lock for computing one entry (None when not shared)"""
+        return None
+
+    def get_or_compute(self, namespace: str, key: str, compute: Callable[[], Any],
+                       ttl: Optional[float] = None,
+                       cacheable: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Cached value, computed by exactly one process on a miss
+
+        Args:
+            namespace: Kind of result ('forecast', 'insights', ...)
+            key: Identity of the result within the namespace
+            compute: Builds the value; must return something picklable
+            ttl: Seconds the value stays valid (None for no expiry)
+            cacheable: Whether a computed value may be stored (None stores
+                every value); values it rejects are returned but not shared
+
+        Returns:
+            The cached or freshly computed value
+        """
+        value = self.get(namespace, key)
+        if value is not None:
+            return value
+
+        def compute_and_store() -> Any:
+            value = compute()
+            if cacheable is None or cacheable(value):
+                self.set(namespace, key, value, ttl)
+            self._count("computed")
+            return value
+
+        lock = self._lock(namespace, key)
+        if lock is None:
+            return compute_and_store()
+
+        started = time.perf_counter()
+        try:
+            lock.acquire()
+        except (LockTimeout, OSError) as e:
+            # Never fail the request over the cache; compute without the lock
+            logger.warning(f"Result cache lock for {namespace}:{key} unavailable ({str(e)}), computing anyway")
+            self._count("lock_timeouts")
+            return compute_and_store()
+
+        try:
+            # Another process may have computed it while we waited
+            value = self.get(namespace, key)
+            if value is not None:
+                self._count("waited")
+                logger.info(f"Reused {namespace}:{key} computed by another worker after "
+                            f"{(time.perf_counter() - started) * 1000:.0f}ms")
+                return value
+            return compute_and_store()
+        finally:
+            lock.release()
+
+    def status(self) -> Dict[str, Any]:
+        """Counters of this process"""
+        return {
+            'backend': self.backend,
+            'hits': self.hits,
+            'misses': self.misses,
+            'computed': self.computed,
+            'waited': self.waited,
+            'lock_timeouts': self.lock_timeouts,
+            'errors': self.errors,
+        }
+
+
+class NullResultCache(ResultCache):
+    """Stores nothing; every get_or_compute computes"""
+
+    backend = "none"
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        self._count("misses")
+        return None
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        pass
+
+    def clear(self, namespace: Optional[str] = None):
+        pass
+
+
+class SQLiteResultCache(ResultCache):
+    """Pickled results in one SQLite file shared by all processes"""
+
+    backend = "sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS results (
+            namespace TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            expires_at REAL,
+            PRIMARY KEY (namespace, key)
+        )
+    """
+
+    def __init__(self, path: str = RESULT_CACHE_PATH, max_mb: float = RESULT_CACHE_MAX_MB,
+                 version: str = RESULT_CACHE_VERSION):
+        super().__init__()
+        self.path = path
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.version = version
+        self.lock_dir = f"{path}.locks"
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connection of the calling thread, reopened after a fork"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(self.SCHEMA)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _stored_key(self, key: str) -> str:
+        """Key as stored: entries of other code versions never match"""
+        return f"{self.version}:{key}"
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        try:
+            row = self._connection().execute(
+                "SELECT value FROM results WHERE namespace = ? AND key = ? "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, self._stored_key(key), time.time()),
+            ).fetchone()
+            if row is None:
+                self._count("misses")
+                return None
+            value = pickle.loads(row[0])
+        except (sqlite3.Error, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            logger.warning(f"Result cache read failed for {namespace}:{key}: {str(e)}")
+            self._count("errors")
+            return None
+        self._count("hits")
+        return value
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        now = time.time()
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            connection = self._connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (namespace, self._stored_key(key), blob, len(blob), now, now + ttl if ttl else None),
+            )
+            self._trim(connection, now)
+        except (sqlite3.Error, pickle.PicklingError, TypeError, AttributeError) as e:
+            logger.warning(f"Result cache write failed for {namespace}:{key}: {str(e)}")
+            self._count("errors")
+
+    def _trim(self, connection: sqlite3.Connection, now: float):
+        """Drop expired entries, then the oldest ones while over max_bytes"""
+        connection.execute("DELETE FROM results WHERE expires_at <= ?", (now,))
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        released = 0
+        oldest = connection.execute("SELECT namespace, key, size FROM results ORDER BY created_at")
+        doomed = []
+        for namespace, key, size in oldest:
+            doomed.append((namespace, key))
+            released += size
+            if released >= excess:
+                break
+        connection.executemany("DELETE FROM results WHERE namespace = ? AND key = ?", doomed)
+        logger.info(f"Result cache trimmed {len(doomed)} entries ({released} bytes)")
+
+    def clear(self, namespace: Optional[str] = None):
+        try:
+            if namespace is None:
+                self._connection().execute("DELETE FROM results")
+            else:
+                self._connection().execute("DELETE FROM results WHERE namespace = ?", (namespace,))
+        except sqlite3.Error as e:
+            logger.warning(f"Result cache clear failed: {str(e)}")
+            self._count("errors")
+
+    def _lock(self, namespace: str, key: str) -> Optional[FileLock]:
+        stripe = int(hashlib.sha1(f"{namespace}:{key}".encode()).hexdigest(), 16) % LOCK_STRIPES
+        return FileLock(os.path.join(self.lock_dir, f"{stripe:03d}.lock"), timeout=COMPUTE_LOCK_TIMEOUT)
+
+    def status(self) -> Dict[str, Any]:
+        """Counters of this process plus the shared store's contents"""
+        status = super().status()
+        status.update(path=self.path, max_bytes=self.max_bytes, version=self.version)
+        try:
+            rows = self._connection().execute(
+                "SELECT namespace, COUNT(*), SUM(size) FROM results GROUP BY namespace"
+            ).fetchall()
+            status['namespaces'] = {
+                namespace: {'entries': entries, 'bytes': size} for namespace, entries, size in rows
+            }
+        except sqlite3.Error as e:
+            status['namespaces'] = None
+            status['error'] = str(e)
+        return status
+
+
+def create_result_cache(backend: str = RESULT_CACHE_BACKEND, path: str = RESULT_CACHE_PATH) -> ResultCache:
+    """
+    Build a result cache backend
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if backend == "sqlite":
+        return SQLiteResultCache(path)
+    if backend == "none":
+        return NullResultCache()
+    raise ValueError(f"Unknown result cache backend: {backend}. Use sqlite or none")
+
+
+result_cache = create_result_cache()
+
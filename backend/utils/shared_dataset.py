@@ -0,0 +1,249 @@
+"""
+Dataset shared by all worker processes through memory-mapped column files.
+
+The first worker to load a given CSV publishes its columns once as .npy
+files (categoricals as int codes plus a category list in the manifest).
+Every worker then attaches to those files with np.load(mmap_mode='r') and
+wraps them in a DataFrame without copying, so the column data lives in the
+OS page cache once however many workers (and services within a worker)
+use it. The attached arrays are read-only; code that needs to modify data
+must work on a copy, as apply_filters already does.
+
+A published dataset is keyed by the source file's path, size and mtime
+plus the caller's schema version (a hash of the code deriving the
+columns), so editing the CSV or that code publishes a new one; older ones
+are removed once superseded (workers still attached keep their mapping
+until they reload).
+
+Environment variables:
+    SHARED_DATASET=0                 load a private copy per process instead
+    SHARED_DATA_DIR=/dev/shm/hotel   where published datasets live
+                                     (default: <tmp>/hotel_revenue_shared)
+"""
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+from utils.file_lock import FileLock
+
+logger = logging.getLogger(__name__)
+
+SHARED_DATASET_ENABLED = os.getenv("SHARED_DATASET", "1") != "0"
+SHARED_DATA_DIR = os.getenv("SHARED_DATA_DIR") or os.path.join(tempfile.gettempdir(), "hotel_revenue_shared")
+PUBLISH_LOCK_TIMEOUT = 300.0
+
+# Bump when the on-disk layout changes so old publications are not attached
+FORMAT_VERSION = 1
+
+MANIFEST = "manifest.json"
+
+
+def source_key(path: str, schema: str = "") -> str:
+    """
+    Key of a source file version: changes when the file is replaced or edited,
+    or when `schema` (the version of the code building the columns) changes
+    """
+    stat = os.stat(path)
+    fingerprint = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}|{FORMAT_VERSION}|{schema}"
+    return hashlib.sha1(fingerprint.encode()).hexdigest()[:16]
+
+
+def _save(directory: str, name: str, values: np.ndarray) -> str:
+    filename = f"{name}.npy"
+    np.save(os.path.join(directory, filename), np.ascontiguousarray(values), allow_pickle=False)
+    return filename
+
+
+def publish(df: pd.DataFrame, directory: str, source: str):
+    """
+    Write a DataFrame as memory-mappable column files
+
+    Written to a temporary sibling directory and renamed into place, so
+    readers never see a partial dataset.
+
+    Args:
+        df: Frame with numeric, bool, datetime64 or categorical columns
+        directory: Final location of the published dataset
+        source: Path of the source file, recorded for pruning
+
+    Raises:
+        TypeError: If a column has a dtype that cannot be memory-mapped
+    """
+    staging = f"{directory}.tmp-{uuid.uuid4().hex[:8]}"
+    os.makedirs(staging)
+    try:
+        columns = []
+        for position, name in enumerate(df.columns):
+            series = df[name]
+            entry: Dict[str, Any] = {"name": name}
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                categories = series.cat.categories
+                entry.update(
+                    kind="categorical",
+                    file=_save(staging, f"col{position}", series.cat.codes.to_numpy()),
+                    categories=categories.tolist(),
+                    categories_dtype=str(categories.dtype),
+                    ordered=bool(series.cat.ordered),
+                )
+            else:
+                values = series.to_numpy()
+                if values.dtype.hasobject:
+                    raise TypeError(f"Column {name} has dtype {series.dtype}, which cannot be shared")
+                entry.update(kind="array", file=_save(staging, f"col{position}", values))
+            columns.append(entry)
+
+        index = None
+        if not (isinstance(df.index, pd.RangeIndex) and df.index.start == 0 and df.index.step == 1):
+            index = _save(staging, "index", df.index.to_numpy())
+
+        manifest = {
+            "format": FORMAT_VERSION,
+            "source": os.path.abspath(source),
+            "rows": len(df),
+            "index": index,
+            "columns": columns,
+        }
+        with open(os.path.join(staging, MANIFEST), "w") as f:
+            json.dump(manifest, f)
+        os.rename(staging, directory)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+def attach(directory: str) -> pd.DataFrame:
+    """
+    Zero-copy, read-only DataFrame over a published dataset
+
+    Args:
+        directory: Location passed to publish()
+    """
+    with open(os.path.join(directory, MANIFEST)) as f:
+        manifest = json.load(f)
+
+    def mapped(filename: str) -> np.ndarray:
+        return np.load(os.path.join(directory, filename), mmap_mode="r", allow_pickle=False)
+
+    data = {}
+    for entry in manifest["columns"]:
+        values = mapped(entry["file"])
+        if entry["kind"] == "categorical":
+            categories = pd.Index(entry["categories"], dtype=entry["categories_dtype"])
+            data[entry["name"]] = pd.Categorical.from_codes(
+                values, dtype=pd.CategoricalDtype(categories, ordered=entry["ordered"])
+            )
+        else:
+            data[entry["name"]] = values
+
+    index = pd.Index(mapped(manifest["index"]), copy=False) if manifest["index"] else None
+    # copy=False keeps one block per column pointing straight at the mapping
+    return pd.DataFrame(data, index=index, copy=False)
+
+
+def _prune(source: str, keep: str):
+    """Remove publications of the same source other than `keep`"""
+    source = os.path.abspath(source)
+    for name in os.listdir(SHARED_DATA_DIR):
+        path = os.path.join(SHARED_DATA_DIR, name)
+        if name == keep or not os.path.isdir(path) or ".tmp-" in name:
+            continue
+        try:
+            with open(os.path.join(path, MANIFEST)) as f:
+                if json.load(f).get("source") != source:
+                    continue
+        except (OSError, ValueError):
+            continue
+        # Workers still mapping these files keep them alive on POSIX;
+        # on Windows mapped files cannot be removed and are retried next time
+        shutil.rmtree(path, ignore_errors=True)
+        if not os.path.exists(path):
+            logger.info(f"Removed superseded shared dataset {name}")
+
+
+def load_shared(source: str, loader: Callable[[], pd.DataFrame], schema: str = "") -> pd.DataFrame:
+    """
+    Attach to the shared copy of a dataset, publishing it first if needed
+
+    Only one process runs `loader` for a given source version; the others
+    wait on a file lock and attach to its result.
+
+    Args:
+        source: Path of the file the dataset is loaded from
+        loader: Builds the DataFrame from `source`
+        schema: Version of the code in `loader` (see source_key)
+
+    Returns:
+        Read-only DataFrame backed by the shared files
+    """
+    key = source_key(source, schema)
+    directory = os.path.join(SHARED_DATA_DIR, key)
+    if not os.path.exists(os.path.join(directory, MANIFEST)):
+        with FileLock(f"{directory}.lock", timeout=PUBLISH_LOCK_TIMEOUT):
+            if not os.path.exists(os.path.join(directory, MANIFEST)):
+                publish(loader(), directory, source)
+                logger.info(f"Published shared dataset {key} for {source} in {SHARED_DATA_DIR}")
+                _prune(source, key)
+    return attach(directory)
+
+
+def _publish_only(source: str, loader: Callable[[], pd.DataFrame], schema: str):
+    """Child process entry point: publish without sending the frame back"""
+    load_shared(source, loader, schema)
+
+
+def publish_isolated(source: str, loader: Callable[[], pd.DataFrame], schema: str = ""):
+    """
+    Publish a dataset from a separate process, if it is not published yet
+
+    Parsing then never competes for this process's GIL. When no child
+    process can be started, this returns without publishing and the caller's
+    load_shared() parses in-process instead.
+
+    Args:
+        source: Path of the file the dataset is loaded from
+        loader: Picklable callable building the DataFrame from `source`
+        schema: Version of the code in `loader` (see source_key)
+
+    Raises:
+        Whatever `loader` raised in the child (e.g. ValueError for bad data)
+    """
+    if os.path.exists(os.path.join(SHARED_DATA_DIR, source_key(source, schema), MANIFEST)):
+        return
+    # A spawned child re-imports __main__, which fails for code read from stdin or -c
+    main_file = getattr(sys.modules["__main__"], "__file__", None)
+    if main_file is None or not os.path.exists(main_file):
+        logger.info(f"Publishing {source} in-process: __main__ cannot be re-imported by a child process")
+        return
+    try:
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            pool.submit(_publish_only, source, loader, schema).result()
+    except (BrokenProcessPool, OSError, pickle.PicklingError) as e:
+        logger.warning(f"Could not publish {source} from a child process ({str(e)}), loading in-process")
+
+
+def is_shared(df: pd.DataFrame) -> bool:
+    """Whether a DataFrame's columns are backed by a shared mapping"""
+    for name in df.columns:
+        if isinstance(df[name].dtype, pd.CategoricalDtype):
+            continue
+        base = df[name].to_numpy()
+        while base is not None:
+            if isinstance(base, np.memmap):
+                return True
+            base = base.base
+        return False
+    return False
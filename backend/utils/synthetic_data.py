@@ -0,0 +1,214 @@
+"""
+Vectorized, seeded generator for synthetic hotel revenue data.
+
+Produces the same schema as the bundled CSV (one row per hotel per day)
+with per-hotel capacity and price levels, yearly seasonality, weekend
+effects, a long-run price trend and channel-specific cancellation rates.
+All columns are built as NumPy arrays per block of hotels, so millions of
+rows take seconds; large datasets can be streamed to chunked files.
+
+    df = generate_hotel_data(hotels=300, years=10, seed=7)
+    write_hotel_data("data/synthetic.csv", hotels=3000, years=10)
+"""
+
+import logging
+import os
+from typing import Dict, Iterator, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHANNELS = ("OTA", "Website", "Agent", "Walk-in")
+DEFAULT_SEGMENTS = ("Direct", "Travel Agent", "Corporate", "Online")
+
+# Share of cancellations per booked room, by channel position (cycled)
+DEFAULT_CANCELLATION_RATES = (0.055, 0.045, 0.05, 0.035)
+
+# Hotels generated per block; bounds peak memory to ~block × days rows
+DEFAULT_BLOCK_HOTELS = 256
+
+CSV_DATE_FORMAT = "%d-%m-%Y"
+
+
+def _hotel_ids(start: int, stop: int) -> np.ndarray:
+    """Hotel IDs in the bundled data's style: H101, H102, ..."""
+    return np.char.add("H", np.arange(101 + start, 101 + stop).astype(str))
+
+
+def _generate_block(
+    rng: np.random.Generator,
+    hotels: int,
+    dates: pd.DatetimeIndex,
+    channels: Sequence[str],
+    segments: Sequence[str],
+    annual_growth: float,
+    seasonality: float,
+    weekend_effect: float,
+    cancellation_rates: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """
+    Columns for every (hotel, date) pair of one block, hotel-major
+
+    Hotel_ID, Market_Segment and Booking_Channel are returned as integer
+    codes (hotel codes are local to the block).
+    """
+    days = len(dates)
+
+    # Per-hotel levels, broadcast over days as (hotels, days) matrices
+    capacity = rng.integers(80, 250, size=hotels).astype(np.int32)
+    base_occupancy = rng.uniform(0.6, 0.75, size=hotels)
+    base_adr = rng.uniform(3200, 5200, size=hotels)
+    season_phase = rng.uniform(-0.05, 0.05, size=hotels)
+
+    years_elapsed = (np.arange(days) / 365.25)[None, :]
+    day_of_year = dates.dayofyear.to_numpy()[None, :]
+    season = np.cos(2 * np.pi * (day_of_year / 365.25 - season_phase[:, None]))
+    weekend = (dates.dayofweek.to_numpy() >= 5)[None, :]
+
+    occupancy = (
+        base_occupancy[:, None]
+        + 0.5 * seasonality * season
+        + np.where(weekend, weekend_effect, 0.0)
+        + rng.normal(0.0, 0.06, size=(hotels, days))
+    )
+    rooms_available = np.broadcast_to(capacity[:, None], (hotels, days))
+    rooms_sold = np.rint(np.clip(occupancy, 0.05, 0.95) * rooms_available).astype(np.int32)
+
+    adr = (
+        base_adr[:, None]
+        * (1 + annual_growth) ** years_elapsed
+        * (1 + seasonality * season + np.where(weekend, weekend_effect, 0.0))
+        * rng.lognormal(0.0, 0.12, size=(hotels, days))
+    )
+    adr = np.round(adr, 2)
+    revenue = np.round(rooms_sold * adr, 2)
+
+    channel_codes = rng.integers(0, len(channels), size=(hotels, days))
+    segment_codes = rng.integers(0, len(segments), size=(hotels, days))
+    cancellations = rng.binomial(rooms_sold, cancellation_rates[channel_codes]).astype(np.int32)
+
+    return {
+        "Date": np.tile(dates.to_numpy(), hotels),
+        "Hotel_ID": np.repeat(np.arange(hotels, dtype=np.int32), days),
+        "Rooms_Available": rooms_available.ravel(),
+        "Rooms_Sold": rooms_sold.ravel(),
+        "Occupancy_Rate": np.round(rooms_sold / rooms_available, 3).ravel(),
+        "ADR_INR": adr.ravel(),
+        "RevPAR_INR": np.round(revenue / rooms_available, 2).ravel(),
+        "Revenue_INR": revenue.ravel(),
+        "Cancellation_Count": cancellations.ravel(),
+        "Market_Segment": segment_codes.ravel(),
+        "Booking_Channel": channel_codes.ravel(),
+    }
+
+
+def iter_hotel_data(
+    hotels: int = 3,
+    years: float = 10,
+    start_date: str = "2016-01-01",
+    days: Optional[int] = None,
+    channels: Sequence[str] = DEFAULT_CHANNELS,
+    segments: Sequence[str] = DEFAULT_SEGMENTS,
+    annual_growth: float = 0.03,
+    seasonality: float = 0.12,
+    weekend_effect: float = 0.03,
+    cancellation_rates: Sequence[float] = DEFAULT_CANCELLATION_RATES,
+    seed: Optional[int] = 42,
+    block_hotels: int = DEFAULT_BLOCK_HOTELS,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield synthetic data as DataFrames of up to `block_hotels` hotels each
+
+    Args:
+        hotels: Number of hotels
+        years: Calendar span in years (ignored when days is given)
+        start_date: First date
+        days: Exact number of days
+        channels: Booking channel labels
+        segments: Market segment labels
+        annual_growth: Yearly ADR growth rate
+        seasonality: Relative amplitude of the yearly cycle
+        weekend_effect: Occupancy and ADR uplift on Saturdays and Sundays
+        cancellation_rates: Cancellation probability per room, by channel
+        seed: Random seed; None for a non-reproducible dataset
+        block_hotels: Hotels generated per chunk
+
+    Returns:
+        Iterator of typed DataFrames, hotel-major and date-sorted per hotel
+    """
+    if hotels < 1:
+        raise ValueError("hotels must be at least 1")
+    days = days if days is not None else int(round(years * 365.25))
+    if days < 1:
+        raise ValueError("the date range must cover at least one day")
+
+    dates = pd.date_range(start_date, periods=days, freq="D")
+    rates = np.resize(np.asarray(cancellation_rates, dtype=float), len(channels))
+    channel_type = pd.CategoricalDtype(list(channels))
+    segment_type = pd.CategoricalDtype(list(segments))
+    hotel_type = pd.CategoricalDtype(_hotel_ids(0, hotels))
+
+    # One independent stream per block, so chunks can be generated lazily
+    block_seeds = np.random.SeedSequence(seed).spawn(-(-hotels // block_hotels))
+    for block, block_seed in enumerate(block_seeds):
+        first = block * block_hotels
+        columns = _generate_block(
+            np.random.default_rng(block_seed),
+            min(block_hotels, hotels - first),
+            dates, channels, segments,
+            annual_growth, seasonality, weekend_effect, rates,
+        )
+        columns["Hotel_ID"] = pd.Categorical.from_codes(columns["Hotel_ID"] + first, dtype=hotel_type)
+        columns["Market_Segment"] = pd.Categorical.from_codes(columns["Market_Segment"], dtype=segment_type)
+        columns["Booking_Channel"] = pd.Categorical.from_codes(columns["Booking_Channel"], dtype=channel_type)
+        yield pd.DataFrame(columns)
+
+
+def generate_hotel_data(hotels: int = 3, years: float = 10, **kwargs) -> pd.DataFrame:
+    """
+    Generate a synthetic dataset in memory
+
+    Accepts the same options as iter_hotel_data. Rows are hotel-major, with
+    categorical Hotel_ID, Market_Segment and Booking_Channel columns.
+    """
+    return pd.concat(list(iter_hotel_data(hotels, years, **kwargs)), ignore_index=True)
+
+
+def write_hotel_data(
+    path: Union[str, os.PathLike],
+    hotels: int = 3,
+    years: float = 10,
+    file_format: str = "csv",
+    **kwargs,
+) -> int:
+    """
+    Stream a synthetic dataset to disk one block of hotels at a time
+
+    CSV output is a single file in the bundled data's format (readable by
+    load_data). Parquet output is a directory of part files, which needs
+    pyarrow or fastparquet installed.
+
+    Returns:
+        Number of rows written
+    """
+    if file_format not in ("csv", "parquet"):
+        raise ValueError(f"Unsupported format: {file_format}. Use 'csv' or 'parquet'")
+
+    rows = 0
+    if file_format == "parquet":
+        os.makedirs(path, exist_ok=True)
+    for part, chunk in enumerate(iter_hotel_data(hotels, years, **kwargs)):
+        if file_format == "csv":
+            chunk.to_csv(path, mode="w" if part == 0 else "a", header=part == 0,
+                         index=False, date_format=CSV_DATE_FORMAT)
+        else:
+            try:
+                chunk.to_parquet(os.path.join(path, f"part-{part:05d}.parquet"), index=False)
+            except ImportError as e:
+                raise ImportError(f"Parquet output requires pyarrow or fastparquet: {e}") from e
+        rows += len(chunk)
+
+    logger.info(f"Wrote {rows} synthetic rows to {path}")
+    return rows
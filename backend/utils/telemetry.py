@@ -0,0 +1,233 @@
+"""
+In-process operational metrics in the Prometheus text exposition format.
+
+Counters and histograms are plain dicts keyed by label values, each behind
+its own lock, so recording is a few dict operations; nothing is exported until a
+scraper reads /metrics. Values that already live elsewhere (cache hit
+counters, dataset size) are not duplicated: collectors registered with
+register_collector read them at scrape time.
+
+    REQUESTS = registry.counter("hotel_api_requests_total", "HTTP requests", ["route"])
+    REQUESTS.inc(route="/api/kpis")
+    text = registry.render()
+"""
+
+import bisect
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# Request latency buckets (seconds), from cached lookups to cold forecasts
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Model training buckets (seconds); Prophet fits take seconds
+TRAINING_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0)
+
+# A collector returns (name, type, help, [(labels, value), ...]) families
+Sample = Tuple[Dict[str, str], float]
+Family = Tuple[str, str, str, List[Sample]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        return [(dict(zip(self.labelnames, key)), value) for key, value in items]
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_format_labels(labels)} {_format_value(value)}"
+                  for labels, value in self.samples()]
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._values: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][position] += 1
+            state[1] += value
+            state[2] += 1
+
+    def time(self, **labels) -> "_HistogramTimer":
+        """Context manager observing the duration of a block"""
+        return _HistogramTimer(self, labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(state[0]), state[1], state[2]) for key, state in self._values.items()]
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, counts, total, count in items:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class _HistogramTimer:
+    def __init__(self, histogram: Histogram, labels: Dict[str, str]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class MetricsRegistry:
+    """Registered metrics and scrape-time collectors"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[Family]]):
+        """Add a callable returning metric families to read at scrape time"""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text format"""
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines += metric.render()
+        for collector in list(self._collectors):
+            try:
+                families = list(collector())
+            except Exception as e:
+                logger.error(f"Metrics collector {getattr(collector, '__name__', collector)} failed: {str(e)}")
+                continue
+            for name, metric_type, documentation, samples in families:
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                lines += [f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in samples]
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+REQUESTS_TOTAL = registry.counter(
+    "hotel_api_requests_total", "HTTP requests by route template, method and status",
+    ["method", "route", "status"],
+)
+REQUEST_DURATION = registry.histogram(
+    "hotel_api_request_duration_seconds", "HTTP request latency by route template",
+    ["method", "route"],
+)
+FORECAST_TRAINING_DURATION = registry.histogram(
+    "hotel_forecast_training_seconds", "Forecast model training time by model type and fit mode",
+    ["model", "mode"], buckets=TRAINING_BUCKETS,
+)
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware counting requests and timing them per route template
+
+    Routes are labelled by their path template (e.g. /api/kpis) rather than
+    the raw URL, and unmatched paths share one label, so the number of
+    series stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            route_label = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+            REQUEST_DURATION.observe(time.perf_counter() - start, method=method, route=route_label)
+            REQUESTS_TOTAL.inc(method=method, route=route_label, status=str(status))
@@ -0,0 +1,211 @@
+"""
+Per-request stage timing, reported as Server-Timing response headers.
+
+Code marks its stages with `stage("name")` (or the `timed("name")`
+decorator); TimedRoute adds `endpoint` and `encode` for every route.
+While a request is being served, ServerTimingMiddleware keeps a
+RequestTimings in a context variable and every stage adds its duration to
+it; outside a request the markers are no-ops. Durations of repeated stages
+are summed, and nested stages are reported separately (e.g. `filter` runs
+inside `service`).
+
+Switches (environment variables, or configure_timing at runtime):
+    SERVER_TIMING=0          disable stage collection and the header
+    SLOW_REQUEST_MS=500      log requests slower than this with their breakdown
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+from fastapi.routing import APIRoute
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING", "1") != "0"
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "0")) or None
+
+# Descriptions shown next to each stage in browser dev tools
+STAGE_DESCRIPTIONS = {
+    "service": "service call",
+    "filter": "apply_filters",
+    "aggregate": "groupby / aggregation",
+    "metadata": "get_filter_metadata",
+    "sanitize": "_sanitize_df",
+    "endpoint": "route handler",
+    "encode": "response validation and JSON encoding",
+    "total": "total",
+}
+
+
+class RequestTimings:
+    """Accumulated stage durations (seconds) for one request, in first-seen order"""
+
+    __slots__ = ("stages",)
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def header_value(self) -> str:
+        """Server-Timing header value, e.g. 'filter;desc="apply_filters";dur=1.23'"""
+        parts = []
+        for name, seconds in self.stages.items():
+            description = STAGE_DESCRIPTIONS.get(name)
+            desc = f';desc="{description}"' if description else ""
+            parts.append(f"{name}{desc};dur={seconds * 1000:.2f}")
+        return ", ".join(parts)
+
+    def breakdown(self) -> str:
+        """Compact text breakdown for logs, e.g. 'filter=1.2ms aggregate=3.4ms'"""
+        return " ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in self.stages.items())
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Timings of the request being served, if collection is active"""
+    return _current.get()
+
+
+@contextmanager
+def stage(name: str):
+    """Time a block as a named stage of the current request (no-op outside one)"""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - start)
+
+
+def timed(name: str) -> Callable:
+    """Decorator form of stage() for sync functions"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            timings = _current.get()
+            if timings is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timings.add(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def _timed_endpoint(endpoint: Callable) -> Callable:
+    """Wrap a route endpoint so its own run time is recorded as `endpoint`"""
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            with stage("endpoint"):
+                return await endpoint(*args, **kwargs)
+        return wrapper
+    return timed("endpoint")(endpoint)
+
+
+class TimedRoute(APIRoute):
+    """
+    APIRoute that splits each request into `endpoint` and `encode` stages
+
+    `encode` is everything FastAPI does around the endpoint: parameter
+    parsing, response validation and JSON serialization.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            timings = _current.get()
+            if timings is None:
+                return await handler(request)
+            endpoint_before = timings.stages.get("endpoint", 0.0)
+            start = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                endpoint_time = timings.stages.get("endpoint", 0.0) - endpoint_before
+                timings.add("encode", time.perf_counter() - start - endpoint_time)
+
+        return timed_handler
+
+
+def configure_timing(enabled: Optional[bool] = None, slow_request_ms: Optional[float] = -1):
+    """
+    Change the timing switches at runtime
+
+    Args:
+        enabled: Collect stages and send Server-Timing headers
+        slow_request_ms: Slow request log threshold; None or 0 disables the log
+    """
+    global SERVER_TIMING_ENABLED, SLOW_REQUEST_MS
+    if enabled is not None:
+        SERVER_TIMING_ENABLED = enabled
+    if slow_request_ms != -1:
+        SLOW_REQUEST_MS = slow_request_ms or None
+
+
+def timing_status() -> Dict[str, Any]:
+    return {"server_timing": SERVER_TIMING_ENABLED, "slow_request_ms": SLOW_REQUEST_MS}
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware collecting stage timings for each HTTP request
+
+    Adds a Server-Timing header (stages plus `total`) to the response and
+    logs requests slower than SLOW_REQUEST_MS. Implemented as plain ASGI so
+    the context variable is visible to the endpoint and nothing is buffered.
+    When both switches are off it only forwards the call.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not (SERVER_TIMING_ENABLED or SLOW_REQUEST_MS):
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                timings.add("total", time.perf_counter() - start)
+                if SERVER_TIMING_ENABLED:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", timings.header_value().encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            total_ms = timings.stages.get("total", time.perf_counter() - start) * 1000
+            if SLOW_REQUEST_MS and total_ms > SLOW_REQUEST_MS:
+                path = scope.get("path", "")
+                query = scope.get("query_string", b"").decode("latin-1")
+                logger.warning(
+                    f"Slow request {scope.get('method', '')} {path}{'?' + query if query else ''} "
+                    f"took {total_ms:.1f}ms: {timings.breakdown()}"
+                )